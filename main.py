@@ -1,6 +1,6 @@
 # type: ignore
 
-from people_api import app
+from people_api.app import app
 
 if __name__ == "__main__":
     import uvicorn
@@ -6,8 +6,6 @@ import logging
 import sys
 from .settings import get_settings
 
-from .app import app
-
 settings = get_settings()
 
 logging.basicConfig(
@@ -6,6 +6,7 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .resources import lifespan
 from .routers import all_routers
 from .settings import get_settings
 
@@ -16,6 +17,7 @@ app = FastAPI(
     docs_url="/documentation$@vtW6qodxYLQ",
     redoc_url=None,
     openapi_url="/api/vtW6qodxYLQ/openapi.json",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -12,9 +12,10 @@ from jose import jwt
 from sqlmodel import Session
 
 from people_api.database.models.models import Emails, Registration
-from people_api.dbs import AsyncSessionsTuple, get_async_sessions, get_read_only_session
+from people_api.dbs import AsyncSessionsTuple, get_async_sessions, get_ro_engine
+from people_api.resources import lazy_resource
 from people_api.schemas import InternalToken, UserToken
-from people_api.services import IamService
+from people_api.services import IamService, IdentityCache
 from people_api.settings import get_settings
 
 
@@ -34,8 +35,6 @@ def _ensure_rsa_keys() -> None:
 
 http_bearer = HTTPBearer()
 
-ro_session = next(get_read_only_session())
-
 
 async def verify_firebase_token(
     authorization: HTTPAuthorizationCredentials = Security(http_bearer),
@@ -51,6 +50,11 @@ async def verify_firebase_token(
             decoded_token = internal_token_result["decoded_token"]
             return InternalToken(**decoded_token)
 
+        cached_token = await IdentityCache.get(token)
+        if cached_token is not None:
+            return UserToken(**cached_token)
+        generation = await IdentityCache.current_generation()
+
         decoded_token = auth.verify_id_token(token)
         email = decoded_token.get("email")
         if email:
@@ -77,6 +81,7 @@ async def verify_firebase_token(
         else:
             raise HTTPException(status_code=401, detail="E-mail not found")
 
+        await IdentityCache.set(token, decoded_token, generation)
         return UserToken(**decoded_token)
     except Exception as e:
         logging.info(e)
@@ -111,17 +116,22 @@ def get_registration_id(token_data: UserToken = Depends(verify_firebase_token))
 
 ALGORITHM = "RS256"
 
-_ensure_rsa_keys()
-with open(f"{get_settings().private_internal_token_key}.pem", "rb") as key_file:
-    PRIVATE_SECRET_KEY = key_file.read()
-with open(f"{get_settings().public_internal_token_key}.pem", "rb") as key_file:
-    PUBLIC_SECRET_KEY = key_file.read()
+
+@lazy_resource("internal_token_keys", on_startup=True)
+def get_internal_token_keys() -> tuple[bytes, bytes]:
+    """Return the (private, public) RSA key pair used to sign internal tokens."""
+    _ensure_rsa_keys()
+    with open(f"{get_settings().private_internal_token_key}.pem", "rb") as key_file:
+        private_key = key_file.read()
+    with open(f"{get_settings().public_internal_token_key}.pem", "rb") as key_file:
+        public_key = key_file.read()
+    return private_key, public_key
 
 
 def create_token(
     registration_id: int | None,
     ttl: int = 30,
-    session: Session = ro_session,
+    session: Session | None = None,
 ) -> str:
     """
     Generates a JSON Web Token (JWT) with specified claims and expiration time.
@@ -130,8 +140,8 @@ def create_token(
         registration_id (int | None): The registration ID of the user. If None,
             the token will not be associated with a specific user.
         ttl (int, optional): Time-to-live for the token in seconds. Defaults to 30 seconds.
-        session (Session): Database session dependency for querying
-            user and registration data. Defaults to a read-only session.
+        session (Session | None): Database session for querying user and registration
+            data. When omitted, a read-only session is opened for the lookup.
 
     Returns:
         str: The encoded JWT token.
@@ -166,6 +176,10 @@ def create_token(
     claims["permissions"] = []
 
     if registration_id:
+        if session is None:
+            with Session(get_ro_engine()) as ro_session:
+                return create_token(registration_id, ttl=ttl, session=ro_session)
+
         registration = session.exec(Registration.select_stmt_by_id(registration_id)).first()
 
         if not registration:
@@ -192,7 +206,8 @@ def create_token(
         claims["email"] = email
         claims["permissions"] = permissions
 
-    token = jwt.encode(claims, PRIVATE_SECRET_KEY, algorithm=ALGORITHM)
+    private_key, _ = get_internal_token_keys()
+    token = jwt.encode(claims, private_key, algorithm=ALGORITHM)
 
     return token
 
@@ -211,7 +226,8 @@ def verify_internal_token(jwt_token: str) -> dict:
         ValueError: If the token is invalid or cannot be decoded.
     """
     try:
-        decoded_token = jwt.decode(jwt_token, PUBLIC_SECRET_KEY, algorithms=[ALGORITHM])
+        _, public_key = get_internal_token_keys()
+        decoded_token = jwt.decode(jwt_token, public_key, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         logging.info("Token has expired")
         return {"valid": False, "decoded_token": {}}
@@ -1,10 +1,32 @@
 """Core functions for workspace groups cronjobs."""
 
 import logging
+from dataclasses import dataclass, field
 
-import googleapiclient
+import googleapiclient.discovery
 from googleapiclient.errors import HttpError
 
+# The Directory API accepts up to 1000 calls per batch, but large batches are throttled
+# as a whole; smaller ones keep a single rate-limit error from failing hundreds of changes.
+BATCH_SIZE = 50
+
+
+@dataclass
+class GroupDiff:
+    """Members to add to and remove from a workspace group."""
+
+    to_add: list[str] = field(default_factory=list)
+    to_remove: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of applying a ``GroupDiff``."""
+
+    added: int = 0
+    removed: int = 0
+    failed: int = 0
+
 
 def get_email_list_from_workspace(service, group_key) -> list:
     """
@@ -39,37 +61,71 @@ def get_email_list_from_workspace(service, group_key) -> list:
     return emails
 
 
-def update_workspace_group(
-    db_emails: list,
-    workspace_emails: list,
-    service: googleapiclient.discovery.Resource,
-    group_key: str,
-) -> None:
-    """Update workspace group with active associates and remove inactive ones."""
+def diff_group_members(
+    db_emails: list[str], workspace_emails: list[dict], keep: list[str] | None = None
+) -> GroupDiff:
+    """
+    Compute the changes that make the group match ``db_emails``.
 
+    Addresses are compared case-insensitively, as Google does. Members in ``keep`` (the
+    group managers) are never removed even though they are not in ``db_emails``.
+    """
+    in_workspace = {member["email"].lower() for member in workspace_emails if member.get("email")}
+    wanted: dict[str, str] = {}
     for email in db_emails:
-        if email not in [member.get("email") for member in workspace_emails]:
-            try:
-                service.members().insert(groupKey=group_key, body={"email": email}).execute()
-            except HttpError as error:
-                print(f"HTTPERROR: Failed to add {email}: {error}")
-            except googleapiclient.errors.Error as error:
-                print(f"Failed to add {email}: {error}")
-            except Exception as error:
-                print(f"Failed to add {email}: {error}")
-
-    for associate in workspace_emails:
-        if associate.get("email") not in db_emails:
-            try:
-                service.members().delete(
-                    groupKey=group_key, memberKey=associate.get("email")
-                ).execute()
-            except HttpError as error:
-                print(f"HTTPERROR: Failed to remove {associate.get('email')}: {error}")
-            except googleapiclient.errors.Error as error:
-                print(f"Failed to remove {associate.get('email')}: {error}")
-            except Exception as error:
-                print(f"Failed to remove {associate.get('email')}: {error}")
+        wanted.setdefault(email.lower(), email)
+    protected = {email.lower() for email in keep or []}
+
+    return GroupDiff(
+        to_add=[email for key, email in wanted.items() if key not in in_workspace],
+        to_remove=sorted(
+            member["email"]
+            for member in workspace_emails
+            if member.get("email")
+            and member["email"].lower() not in wanted
+            and member["email"].lower() not in protected
+        ),
+    )
+
+
+def apply_group_diff(
+    service: googleapiclient.discovery.Resource, group_key: str, diff: GroupDiff
+) -> BatchResult:
+    """Apply ``diff`` to the group using batched Directory API requests."""
+    result = BatchResult()
+    # (request, label, counter attribute, status code meaning the change is already done)
+    changes = [
+        (service.members().insert(groupKey=group_key, body={"email": email}), email, "added", 409)
+        for email in diff.to_add
+    ] + [
+        (service.members().delete(groupKey=group_key, memberKey=email), email, "removed", 404)
+        for email in diff.to_remove
+    ]
+
+    for start in range(0, len(changes), BATCH_SIZE):
+        chunk = changes[start : start + BATCH_SIZE]
+
+        def callback(request_id, _response, exception, chunk=chunk):
+            _, email, counter, done_status = chunk[int(request_id)]
+            if exception is None or (
+                isinstance(exception, HttpError) and exception.resp.status == done_status
+            ):
+                setattr(result, counter, getattr(result, counter) + 1)
+                return
+            result.failed += 1
+            action = "add" if counter == "added" else "remove"
+            logging.error("Failed to %s %s in group %s: %s", action, email, group_key, exception)
+
+        batch = service.new_batch_http_request(callback=callback)
+        for i, (request, *_) in enumerate(chunk):
+            batch.add(request, request_id=str(i))
+        try:
+            batch.execute()
+        except (HttpError, googleapiclient.errors.Error, OSError) as error:
+            logging.error("Batch update of group %s failed: %s", group_key, error)
+            result.failed += len(chunk)
+
+    return result
 
 
 def set_group_managers(service, group_key: str, manager_emails: list[str]) -> None:
@@ -2,79 +2,123 @@
 
 # pylint: disable=C0413
 
+import asyncio
 import logging
 import sys
+import time
+from dataclasses import dataclass
 
 import requests
 
 from people_api.cronjobs.workspace_groups.helpers.core import (
+    apply_group_diff,
+    diff_group_members,
     get_email_list_from_workspace,
     set_group_managers,
-    update_workspace_group,
 )
 from people_api.cronjobs.workspace_groups.helpers.get_service import get_service
 from people_api.cronjobs.workspace_groups.helpers.orm_queries import (
-    get_active_adult_emails,
-    get_active_jb_emails,
-    get_inactive_adult_emails,
-    get_inactive_jb_emails,
+    stream_member_emails,
 )
 
 from .settings import get_settings
 
 UPTIME_URL = get_settings().google_workspace_cronjob_uptime_url
 
-
-async def run_update() -> None:
-    """Update workspace groups"""
+# Workspace group for each (active, adult) member classification
+GROUPS: dict[tuple[bool, bool], str] = {
+    (True, True): "02et92p040v7t2i",  # active adults
+    (False, True): "03znysh72dw4xp8",  # inactive adults
+    (True, False): "0279ka653mesfkc",  # active JB
+    (False, False): "00pkwqa10wow8wq",  # inactive JB
+}
+
+
+@dataclass
+class GroupSummary:
+    """What a run changed (or would change, in dry-run) in one group."""
+
+    group_key: str
+    to_add: int
+    to_remove: int
+    failed: int
+    elapsed: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.group_key}: +{self.to_add} -{self.to_remove} "
+            f"failed={self.failed} in {self.elapsed:.1f}s"
+        )
+
+
+def _sync_group(
+    group_key: str, db_emails: list[str], admin_emails: list[str], dry_run: bool
+) -> tuple[int, int, int]:
+    """Diff and update one group; returns (adds, removes, failures)."""
+    # googleapiclient services are not thread-safe, so each group builds its own.
+    service = get_service()
+    workspace_emails = get_email_list_from_workspace(service=service, group_key=group_key)
+    diff = diff_group_members(db_emails, workspace_emails, keep=admin_emails)
+    if dry_run:
+        for email in diff.to_add:
+            logging.info("[DRY-RUN] Would add %s to %s", email, group_key)
+        for email in diff.to_remove:
+            logging.info("[DRY-RUN] Would remove %s from %s", email, group_key)
+        return len(diff.to_add), len(diff.to_remove), 0
+
+    result = apply_group_diff(service, group_key, diff)
+    set_group_managers(service=service, group_key=group_key, manager_emails=admin_emails)
+    return result.added, result.removed, result.failed
+
+
+async def load_group_emails(admin_emails: list[str]) -> dict[str, list[str]]:
+    """Partition the classified member e-mails by workspace group, skipping the managers."""
+    emails: dict[str, list[str]] = {group_key: [] for group_key in GROUPS.values()}
+    async for member_email in stream_member_emails():
+        if member_email.email not in admin_emails:
+            emails[GROUPS[(member_email.active, member_email.adult)]].append(member_email.email)
+    return emails
+
+
+async def update_group(
+    group_key: str, db_emails: list[str], admin_emails: list[str], dry_run: bool = False
+) -> GroupSummary:
+    """Bring one workspace group in line with ``db_emails``."""
+    start = time.perf_counter()
+    logging.info("Updating workspace group: %s", group_key)
+    added, removed, failed = await asyncio.to_thread(
+        _sync_group, group_key, db_emails, admin_emails, dry_run
+    )
+    summary = GroupSummary(group_key, added, removed, failed, time.perf_counter() - start)
+    logging.info("Workspace group %s updated: %s", group_key, summary)
+    return summary
+
+
+async def run_update(dry_run: bool = False, concurrency: int = 2) -> list[GroupSummary]:
+    """
+    Update workspace groups, ``concurrency`` groups at a time.
+
+    With ``dry_run`` the changes are only logged and counted, and no uptime ping is sent.
+    """
     logging.log(logging.INFO, "Workspace groups update script started")
     try:
-        logging.log(logging.INFO, "Returning google service")
-        service = get_service()
-        logging.log(logging.INFO, "Google service returned successfully")
-
-        groups_ids = [
-            "02et92p040v7t2i",
-            "03znysh72dw4xp8",
-            "0279ka653mesfkc",
-            "00pkwqa10wow8wq",
-        ]
-        functions = [
-            get_active_adult_emails,
-            get_inactive_adult_emails,
-            get_active_jb_emails,
-            get_inactive_jb_emails,
-        ]
-
         admin_emails = get_settings().workspace_managers_email_list
+        emails_by_group = await load_group_emails(admin_emails)
+        semaphore = asyncio.Semaphore(concurrency)
 
-        logging.log(logging.INFO, "Updating workspace groups")
-        for ids, f in zip(groups_ids, functions):
-            logging.log(logging.INFO, "Updating workspace group: %s", ids)
-
-            logging.log(logging.INFO, "Getting emails from workspace...")
-            active_associates = get_email_list_from_workspace(service=service, group_key=ids)
-            logging.log(logging.INFO, "Emails retrieved from workspace successfully!")
-
-            logging.log(logging.INFO, "Getting emails from database...")
-            active_on_db = await f()
-            active_emails = [email for _, email in active_on_db if email not in admin_emails]
-            logging.log(logging.INFO, "Emails retrieved from database successfully!")
-
-            logging.log(logging.INFO, "Sending/Removing emails from workspace...")
-            update_workspace_group(
-                db_emails=active_emails,
-                workspace_emails=active_associates,
-                service=service,
-                group_key=ids,
-            )
-            logging.log(logging.INFO, "Workspace group %s updated successfully!", ids)
+        async def bounded(group_key: str, db_emails: list[str]) -> GroupSummary:
+            async with semaphore:
+                return await update_group(group_key, db_emails, admin_emails, dry_run)
 
-            logging.log(logging.INFO, "Setting managers for group %s...", ids)
-            set_group_managers(service=service, group_key=ids, manager_emails=admin_emails)
-            logging.log(logging.INFO, "Managers set for group %s", ids)
+        summaries = await asyncio.gather(
+            *(bounded(group_key, db_emails) for group_key, db_emails in emails_by_group.items())
+        )
 
-        logging.log(logging.INFO, "All workspace groups updated successfully")
+        print("DRY-RUN: no changes applied" if dry_run else "All workspace groups updated")
+        for summary in summaries:
+            print(summary)
+        if dry_run:
+            return summaries
 
         try:
             response = requests.get(UPTIME_URL, timeout=10)
@@ -82,6 +126,7 @@ async def run_update() -> None:
         except Exception as uptime_error:
             print(f"Failed to notify uptime service: {uptime_error}")
             sys.exit(1)
+        return summaries
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -0,0 +1,63 @@
+"""add_phone_suffix_columns
+
+Revision ID: 3f2d8c1a9b47
+Revises: 884c047eea7a
+Create Date: 2026-10-17 09:12:31.402117
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2d8c1a9b47"
+down_revision: str | None = "884c047eea7a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Copied from models.PHONE_SUFFIX_EXPRESSION on purpose: a migration must keep creating the
+# column it was written for, even after the model changes. Changing the expression takes a
+# new migration; tests/test_generated_columns.py checks that the two still match.
+PHONE_SUFFIX_EXPRESSION = r"right(regexp_replace(phone_number, '\D', '', 'g'), 8)"
+
+
+def upgrade() -> None:
+    # Stored generated columns are computed by Postgres on every insert/update,
+    # so existing rows are backfilled here and new rows never need app-side sync.
+    op.add_column(
+        "phones",
+        sa.Column(
+            "phone_suffix",
+            sa.String(length=8),
+            sa.Computed(PHONE_SUFFIX_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(op.f("ix_phones_phone_suffix"), "phones", ["phone_suffix"], unique=False)
+
+    op.add_column(
+        "whatsapp_authorization",
+        sa.Column(
+            "phone_suffix",
+            sa.String(length=8),
+            sa.Computed(PHONE_SUFFIX_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        op.f("ix_whatsapp_authorization_phone_suffix"),
+        "whatsapp_authorization",
+        ["phone_suffix"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_whatsapp_authorization_phone_suffix"), table_name="whatsapp_authorization"
+    )
+    op.drop_column("whatsapp_authorization", "phone_suffix")
+    op.drop_index(op.f("ix_phones_phone_suffix"), table_name="phones")
+    op.drop_column("phones", "phone_suffix")
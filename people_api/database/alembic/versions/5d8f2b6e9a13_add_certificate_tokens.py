@@ -0,0 +1,43 @@
+"""add certificate tokens
+
+Revision ID: 5d8f2b6e9a13
+Revises: e3a9c4b7f215
+Create Date: 2026-10-17 17:20:06.418522
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8f2b6e9a13"
+down_revision: str | None = "e3a9c4b7f215"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "certificate_tokens",
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column("registration_id", sa.Integer(), nullable=False),
+        sa.Column("token", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("display_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("expiration_date", sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["registration_id"], ["registration.registration_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("registration_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("certificate_tokens")
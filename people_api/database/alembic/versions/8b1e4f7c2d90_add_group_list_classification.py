@@ -0,0 +1,55 @@
+"""add_group_list_classification
+
+Revision ID: 8b1e4f7c2d90
+Revises: 3f2d8c1a9b47
+Create Date: 2026-10-17 11:40:08.219354
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b1e4f7c2d90"
+down_revision: str | None = "3f2d8c1a9b47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Copied from models.GROUP_CLASSIFICATION_EXPRESSION on purpose, like the phone_suffix
+# migration: changing the classification takes a new migration, and
+# tests/test_generated_columns.py checks that the two still match.
+GROUP_CLASSIFICATION_EXPRESSION = r"""CASE
+    WHEN group_name ~* '^M[\s.]*JB' THEN 'MJB'
+    WHEN group_name ~* '^R[\s.]*JB' THEN 'RJB'
+    WHEN group_name ~* '^JB' THEN 'JB'
+    WHEN group_name ~* '^OrgMB' THEN 'OrgMB'
+    WHEN group_name ~* '^(MB|Mensa)' THEN 'MB'
+    ELSE 'NotMensa'
+END"""
+
+
+def upgrade() -> None:
+    # Classified by Postgres on every insert/update of group_name, existing rows included.
+    op.add_column(
+        "group_list",
+        sa.Column(
+            "classification",
+            sa.String(length=8),
+            sa.Computed(GROUP_CLASSIFICATION_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    # Serves "groups of these classifications ordered by name" straight from the index.
+    op.create_index(
+        "ix_group_list_classification_group_name",
+        "group_list",
+        ["classification", sa.text('group_name COLLATE "C"')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_list_classification_group_name", table_name="group_list")
+    op.drop_column("group_list", "classification")
@@ -0,0 +1,43 @@
+"""add_legal_rep_phone_suffix
+
+Revision ID: c7d52e9a1f36
+Revises: 8b1e4f7c2d90
+Create Date: 2026-10-17 13:05:47.630218
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d52e9a1f36"
+down_revision: str | None = "8b1e4f7c2d90"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "legal_representatives",
+        sa.Column(
+            "phone_suffix",
+            sa.String(length=8),
+            sa.Computed(r"right(regexp_replace(phone, '\D', '', 'g'), 8)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        op.f("ix_legal_representatives_phone_suffix"),
+        "legal_representatives",
+        ["phone_suffix"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_legal_representatives_phone_suffix"), table_name="legal_representatives"
+    )
+    op.drop_column("legal_representatives", "phone_suffix")
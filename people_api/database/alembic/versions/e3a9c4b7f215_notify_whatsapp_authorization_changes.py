@@ -0,0 +1,83 @@
+"""notify whatsapp authorization changes
+
+Revision ID: e3a9c4b7f215
+Revises: c7d52e9a1f36
+Create Date: 2026-10-17 15:42:18.913204
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9c4b7f215"
+down_revision: str | None = "c7d52e9a1f36"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Tables whose changes may affect any member's status, so they notify an empty payload.
+SHARED_TABLES = ("whatsapp_authorization", "whatsapp_workers")
+# Tables whose row changes only affect the status of the member they belong to.
+MEMBER_TABLES = ("phones", "legal_representatives")
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION public.notify_whatsapp_authorization_changed()
+    RETURNS trigger
+    LANGUAGE plpgsql
+    AS $function$
+    BEGIN
+        PERFORM pg_notify('whatsapp_authorization_changed', '');
+        RETURN NULL;
+    END;
+    $function$
+    """)
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION public.notify_member_whatsapp_authorization_changed()
+    RETURNS trigger
+    LANGUAGE plpgsql
+    AS $function$
+    BEGIN
+        IF (TG_OP IN ('UPDATE', 'DELETE')) THEN
+            PERFORM pg_notify('whatsapp_authorization_changed', OLD.registration_id::text);
+        END IF;
+        IF (TG_OP IN ('INSERT', 'UPDATE')) THEN
+            PERFORM pg_notify('whatsapp_authorization_changed', NEW.registration_id::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $function$
+    """)
+
+    for table in SHARED_TABLES:
+        op.execute(f"""
+        CREATE TRIGGER {table}_notify_authorization_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.{table}
+        FOR EACH STATEMENT EXECUTE FUNCTION public.notify_whatsapp_authorization_changed()
+        """)
+
+    for table in MEMBER_TABLES:
+        op.execute(f"""
+        CREATE TRIGGER {table}_notify_authorization_changed
+        AFTER INSERT OR UPDATE OR DELETE ON public.{table}
+        FOR EACH ROW EXECUTE FUNCTION public.notify_member_whatsapp_authorization_changed()
+        """)
+        # Row triggers do not fire on TRUNCATE, which may affect every member.
+        op.execute(f"""
+        CREATE TRIGGER {table}_notify_authorization_truncated
+        AFTER TRUNCATE ON public.{table}
+        FOR EACH STATEMENT EXECUTE FUNCTION public.notify_whatsapp_authorization_changed()
+        """)
+
+
+def downgrade() -> None:
+    for table in MEMBER_TABLES:
+        for trigger in ("notify_authorization_truncated", "notify_authorization_changed"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_{trigger} ON public.{table}")
+    for table in SHARED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_authorization_changed ON public.{table}")
+    op.execute("DROP FUNCTION IF EXISTS public.notify_member_whatsapp_authorization_changed()")
+    op.execute("DROP FUNCTION IF EXISTS public.notify_whatsapp_authorization_changed()")
@@ -1,47 +1,324 @@
 """Data models for the API"""
 
-from typing import Any
+import csv
+import io
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Literal
 
-from pydantic import BaseModel
-from sqlalchemy import text
-from sqlalchemy.exc import DBAPIError, ProgrammingError, SQLAlchemyError
-from sqlalchemy.orm import Session
+import asyncpg
+from pydantic import BaseModel, Field
+from pydantic_core import to_json, to_jsonable_python
+from sqlalchemy import String, TextClause, bindparam, text
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncResult
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from people_api.endpoints.errors import (
+from people_api.exceptions import (
     DatabaseConnectionError,
     InsufficientPrivilegeError,
     QueryExecutionError,
     QuerySyntaxError,
+    QueryTimeoutError,
+    ResultTooLargeError,
 )
+from people_api.settings import get_settings
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _query_error(error: Exception, sqlstate: str | None) -> QueryExecutionError:
+    """Return the ``QueryExecutionError`` matching the SQLSTATE of a failed query."""
+    if sqlstate in ("42501", "25006"):
+        return InsufficientPrivilegeError(f"Insufficient privilege to execute the query: {error}")
+    if sqlstate == "57014":
+        return QueryTimeoutError(f"Query cancelled by the statement timeout: {error}")
+    if sqlstate is not None and sqlstate.startswith("42"):
+        return QuerySyntaxError(f"Syntax error in SQL query: {error}")
+    if sqlstate is None or sqlstate.startswith("08"):
+        return DatabaseConnectionError(f"Database connection error: {error}")
+    return QueryExecutionError(f"General database error: {error}")
+
+
+@contextmanager
+def _translate_errors() -> Iterator[None]:
+    """
+    Re-raise database errors as the matching ``QueryExecutionError``, by SQLSTATE.
+
+    Results streamed from a server-side cursor raise asyncpg's errors unwrapped, while
+    other statements raise them wrapped in SQLAlchemy's ``DBAPIError``.
+    """
+    try:
+        yield
+
+    except asyncpg.PostgresError as pge:
+        raise _query_error(pge, pge.sqlstate) from pge
+
+    except DBAPIError as dbe:
+        raise _query_error(dbe, getattr(dbe.orig, "sqlstate", None)) from dbe
+
+    except SQLAlchemyError as se:
+        raise QueryExecutionError(f"General database error: {se}") from se
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that keeps what Arrow writes until it is drained into a chunk."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet records the offsets of its row groups, so they must not restart on drain.
+        return self.position
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def _encode_columnar(
+    partitions: AsyncIterator[list[dict[str, Any]]], columns: list[str], file_format: str
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of rows as an Arrow IPC stream or a Parquet file, one chunk per batch.
+
+    The schema is inferred from the first batch, which is encoded before the response
+    starts, and later batches are cast to it. Columns that are entirely NULL in the first
+    batch are typed as strings, JSON values are encoded as JSON text, and decimals are encoded
+    as text, since the scale of an unconstrained NUMERIC varies from row to row. A later
+    batch that still cannot be cast raises ``QueryExecutionError``, leaving the stream
+    without its end marker.
+    """
+    # pyarrow is only needed by columnar exports; load it on first use.
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    sink = _ChunkSink()
+
+    def open_writer(schema):
+        if file_format == "parquet":
+            return pq.ParquetWriter(sink, schema)
+        return pa.ipc.new_stream(sink, schema)
+
+    def schema_field(field):
+        if field.name in stringified:
+            return pa.field(field.name, pa.string())
+        return field
+
+    schema = None
+    writer: Any = None
+    stringified: set[str] = set()
+    async for rows in partitions:
+        for row in rows:
+            for name, value in row.items():
+                if isinstance(value, dict | list):
+                    row[name] = to_json(value).decode()
+                elif isinstance(value, uuid.UUID | Decimal) or (
+                    name in stringified and value is not None
+                ):
+                    row[name] = str(value)
+        try:
+            batch = pa.RecordBatch.from_pylist(rows)
+            if schema is None:
+                stringified = {field.name for field in batch.schema if pa.types.is_null(field.type)}
+                schema = pa.schema([schema_field(field) for field in batch.schema])
+                writer = open_writer(schema)
+            batch = batch.cast(schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            raise QueryExecutionError(
+                f"Rows cannot be encoded with the column types of the first batch: {e}"
+            ) from e
+        writer.write_batch(batch)
+        yield sink.drain()
+
+    if writer is None:
+        writer = open_writer(pa.schema([(name, pa.string()) for name in columns]))
+    writer.close()
+    yield sink.drain()
 
 
 class QueryRequest(BaseModel):
     """Request model for the query input"""
 
     query: str
+    format: Literal["json", "ndjson", "csv", "arrow", "parquet"] = Field(
+        default="json",
+        description="json returns one response body; the other formats stream the rows",
+    )
+    limit: int | None = Field(
+        default=None, ge=1, description="Maximum number of rows, capped by the server"
+    )
+    order_by: str | None = Field(
+        default=None,
+        pattern=r"^[A-Za-z_][A-Za-z0-9_]*$",
+        description="Column of the query results to paginate on, in ascending order",
+    )
+    after: Any = Field(
+        default=None, description="next_cursor of the previous page, when paginating"
+    )
+    timeout_ms: int | None = Field(default=None, ge=1, description="Statement timeout")
 
-    @classmethod
-    async def execute(cls, query: str, session: Session):
-        """Execute the SQL query and return the results"""
-        try:
-            result = session.execute(text(query))
-            rows = result.fetchall()
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in rows]
+    @property
+    def row_limit(self) -> int | None:
+        """
+        Number of rows returned when the request sets ``limit`` or paginates with
+        ``order_by``, bounded by the ``data_query_max_rows`` setting; None otherwise.
+        """
+        max_rows = get_settings().data_query_max_rows
+        if self.limit is None and self.order_by is None:
+            return None
+        return min(self.limit or max_rows, max_rows)
+
+    def statement(self) -> TextClause:
+        """
+        Return the statement to run.
+
+        With ``order_by``, the query is wrapped to return the page of ``row_limit`` rows
+        following ``after``. ``after`` is bound as an untyped literal so Postgres casts it
+        to the column's type, whichever it is.
+        """
+        if self.order_by is None:
+            return text(self.query)
+
+        column = f'q."{self.order_by}"'
+        condition = f" WHERE {column} > :after" if self.after is not None else ""
+        statement = text(
+            f"SELECT * FROM ({self.query.strip().rstrip(';')}) AS q{condition} "
+            f"ORDER BY {column} LIMIT :limit"
+        ).bindparams(limit=self.row_limit or get_settings().data_query_max_rows)
+        if self.after is not None:
+            statement = statement.bindparams(
+                bindparam("after", str(self.after), type_=String, literal_execute=True)
+            )
+        return statement
+
+    async def execute(self, session: AsyncSession) -> AsyncResult:
+        """
+        Start the query on a server-side cursor under the statement timeout.
+
+        Rows are fetched from the cursor ``data_query_batch_size`` at a time as the result
+        is consumed.
+        """
+        settings = get_settings()
+        timeout_ms = min(
+            self.timeout_ms or settings.data_query_timeout_ms, settings.data_query_max_timeout_ms
+        )
+        batch_size = min(
+            settings.data_query_batch_size, self.row_limit or settings.data_query_batch_size
+        )
+        with _translate_errors():
+            await session.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+            return await session.stream(self.statement().execution_options(yield_per=batch_size))
+
+    async def partitions(self, result: AsyncResult) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the batches of rows of ``result``, up to ``row_limit``, as dictionaries."""
+        remaining = self.row_limit
+        with _translate_errors():
+            async for partition in result.mappings().partitions():
+                rows = [dict(row) for row in partition[:remaining]]
+                yield rows
+                if remaining is not None:
+                    remaining -= len(rows)
+                    if remaining <= 0:
+                        break
+        await result.close()
+
+    async def fetch(self, result: AsyncResult) -> list[dict[str, Any]]:
+        """
+        Return the rows of ``result``, up to ``row_limit``.
+
+        A result without a ``row_limit`` is held in memory whole, so one larger than
+        ``data_query_max_rows`` raises ``ResultTooLargeError`` rather than being cut short.
+        """
+        max_rows = get_settings().data_query_max_rows
+        rows: list[dict[str, Any]] = []
+        async for partition in self.partitions(result):
+            rows.extend(partition)
+            if self.row_limit is None and len(rows) > max_rows:
+                await result.close()
+                raise ResultTooLargeError(
+                    f"The query returned more than {max_rows} rows; set limit, paginate "
+                    "with order_by or request a streaming format"
+                )
+        return rows
+
+    def next_cursor(self, rows: list[dict[str, Any]]) -> Any:
+        """Return the ``after`` of the page following ``rows``, or None on the last page."""
+        if self.order_by is None or self.row_limit is None or len(rows) < self.row_limit:
+            return None
+        return to_jsonable_python(rows[-1][self.order_by])
+
+    async def _encode(self, result: AsyncResult) -> AsyncGenerator[bytes, None]:
+        if self.format in ("arrow", "parquet"):
+            async for chunk in _encode_columnar(
+                self.partitions(result), list(result.keys()), self.format
+            ):
+                yield chunk
+            return
+
+        if self.format == "ndjson":
+            async for partition in self.partitions(result):
+                yield b"".join(to_json(row) + b"\n" for row in partition)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(result.keys())
+        async for partition in self.partitions(result):
+            writer.writerows(row.values() for row in partition)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    async def stream(self, result: AsyncResult, session: AsyncSession) -> AsyncIterator[bytes]:
+        """
+        Return the rows of ``result`` encoded in the requested streaming format, one chunk
+        per batch.
 
-        except ProgrammingError as pe:
-            if "must be" in str(pe):
-                raise InsufficientPrivilegeError(
-                    f"Insufficient privilege to execute the query: {str(pe)}"
-                ) from pe
+        The first batch is fetched before returning: Postgres reports most errors, such as
+        missing privileges, when the query starts running, and they can no longer change the
+        status of a response that has started streaming.
 
-            raise QuerySyntaxError(f"Syntax error in SQL query: {str(pe)}") from pe
+        The returned stream takes over ``session``, which ``result`` runs on, and closes it
+        once the last chunk is sent or the client goes away. The response body is sent
+        after the request's dependencies may have been cleaned up, so the session must not
+        come from one.
+        """
+        chunks = self._encode(result)
+        first_chunk = await anext(chunks, None)
 
-        except DBAPIError as dbe:
-            raise DatabaseConnectionError(f"Database connection error: {str(dbe)}") from dbe
+        async def stream_chunks() -> AsyncIterator[bytes]:
+            try:
+                if first_chunk is not None:
+                    yield first_chunk
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+                await session.close()
 
-        except SQLAlchemyError as se:
-            raise QueryExecutionError(f"General database error: {str(se)}") from se
+        return stream_chunks()
 
 
 class QueryResponse(BaseModel):
@@ -49,3 +326,4 @@ class QueryResponse(BaseModel):
 
     results: list[dict[str, Any]]  # Structure for the query results
     status: str
+    next_cursor: Any = None  # after of the next page, when paginating with order_by
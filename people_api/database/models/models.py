@@ -5,6 +5,8 @@ SQLmodels
 from datetime import date, datetime, timezone
 
 from pydantic import EmailStr, condecimal
+from sqlalchemy import CompoundSelect, Computed, Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import (
     JSON,
     Boolean,
@@ -13,6 +15,7 @@ from sqlmodel import (
     Enum,
     Field,
     ForeignKey,
+    Index,
     Integer,
     Relationship,
     SQLModel,
@@ -22,15 +25,45 @@ from sqlmodel import (
     and_,
     col,
     delete,
+    exists,
     func,
     insert,
+    literal_column,
     select,
     text,
+    true,
+    union_all,
     update,
 )
 
 from people_api.database.models.feedback import FeedbackTargets, FeedbackTypes
-from people_api.database.models.types import CPFNumber, PhoneNumber, ZipNumber
+from people_api.database.models.types import (
+    PHONE_SUFFIX_LENGTH,
+    CPFNumber,
+    PhoneNumber,
+    ZipNumber,
+    phone_suffix,
+)
+
+PHONE_SUFFIX_EXPRESSION = (
+    rf"right(regexp_replace({{column}}, '\D', '', 'g'), {PHONE_SUFFIX_LENGTH})"
+)
+
+
+def phone_suffix_column(source: str = "phone_number") -> Column:
+    """
+    Return an indexed, stored generated column holding the last 8 digits of ``source``.
+    """
+    return Column(
+        String(PHONE_SUFFIX_LENGTH),
+        Computed(PHONE_SUFFIX_EXPRESSION.format(column=source), persisted=True),
+        index=True,
+    )
+
+
+def match_phone_suffix(column, phone_number: str | int):
+    """Return a suffix-equality clause comparing a ``phone_suffix`` column to a phone number."""
+    return column == phone_suffix(phone_number)
 
 
 class BaseSQLModel(SQLModel):
@@ -192,16 +225,7 @@ class Registration(BaseSQLModel, table=True):
         """
         Return a select statement for a registration record by the last 8 digits of the phone number.
         """
-        phone_pattern = f"%{phone_number[-8:]}"
-        return (
-            select(cls)
-            .join(Phones)
-            .where(
-                func.lower(
-                    func.cast(func.regexp_replace(Phones.phone_number, r"\D", "", "g"), String)
-                ).like(phone_pattern)
-            )
-        )
+        return select(cls).join(Phones).where(match_phone_suffix(Phones.phone_suffix, phone_number))
 
 
 class RegistrationAudit(BaseAuditModel, table=True):
@@ -293,6 +317,41 @@ class CertsAntecCriminais(BaseSQLModel, table=True):
     registration: "Registration" = Relationship(back_populates="certs_antec_criminais")
 
 
+class CertificateTokens(BaseSQLModel, table=True):
+    """
+    Certificate download token of a member and the data printed on the certificate,
+    mirrored from the member's Firestore document.
+    """
+
+    __tablename__ = "certificate_tokens"
+
+    registration_id: int = Field(
+        primary_key=True, foreign_key="registration.registration_id", ondelete="CASCADE"
+    )
+    token: str
+    display_name: str | None = None
+    expiration_date: date | None = None
+
+    @classmethod
+    def select_by_registration_id(cls, registration_id: int):
+        """Return a select statement for the certificate token of a member."""
+        return select(cls).where(cls.registration_id == registration_id)
+
+    @classmethod
+    def upsert_stmt(cls, rows: list[dict]):
+        """Return an insert statement for ``rows`` that overwrites the tokens already stored."""
+        stmt = pg_insert(cls).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[col(cls.registration_id)],
+            set_={
+                "token": stmt.excluded.token,
+                "display_name": stmt.excluded.display_name,
+                "expiration_date": stmt.excluded.expiration_date,
+                "updated_at": func.now(),
+            },
+        )
+
+
 class Emails(BaseSQLModel, table=True):
     """Model for storing email information linked to user registrations."""
 
@@ -362,6 +421,9 @@ class LegalRepresentatives(BaseSQLModel, table=True):
     full_name: str | None = Field(max_length=255)
     email: EmailStr | None = Field(None, max_length=255, min_length=5, index=True)
     phone: PhoneNumber | None = Field(max_length=60, min_length=9)
+    phone_suffix: str | None = Field(
+        default=None, sa_column=phone_suffix_column("phone"), exclude=True
+    )
     alternative_phone: PhoneNumber | None = Field(max_length=60, min_length=9)
     observations: str | None = None
     registration: "Registration" = Relationship(back_populates="legal_representatives")
@@ -383,6 +445,27 @@ class LegalRepresentatives(BaseSQLModel, table=True):
             observations=legal_representative.observations,
         )
 
+    @classmethod
+    def select_should_show_legal_rep_groups(cls, registration_id: int, is_junior: bool):
+        """
+        Return a select statement telling whether the member should see the legal
+        representative (RJB) groups, matching phones by their last 8 digits.
+
+        A junior member sees them when any of their legal representatives is not a member
+        themselves; an adult member when one of their phones belongs to a legal representative.
+        """
+        if is_junior:
+            condition = exists().where(
+                col(cls.registration_id) == registration_id,
+                ~exists().where(col(Phones.phone_suffix) == col(cls.phone_suffix)),
+            )
+        else:
+            condition = exists().where(
+                col(Phones.registration_id) == registration_id,
+                col(Phones.phone_suffix) == col(cls.phone_suffix),
+            )
+        return select(condition)
+
     @classmethod
     def get_legal_representatives_for_member(cls, member_id: int):
         """
@@ -477,16 +560,13 @@ class Phones(BaseSQLModel, table=True):
     phone_id: int | None = Field(default=None, primary_key=True)
     registration_id: int = Field(foreign_key="registration.registration_id")
     phone_number: PhoneNumber = Field(max_length=60, min_length=9)
+    phone_suffix: str | None = Field(default=None, sa_column=phone_suffix_column(), exclude=True)
     registration: Registration | None = Relationship(back_populates="phones")
 
     @classmethod
     def select_stmt_by_phone_pattern(cls, phone: int):
-        """Return a select statement for phone records matching the numeric phone pattern."""
-        return select(cls).where(
-            func.lower(
-                func.cast(func.regexp_replace(cls.phone_number, r"\D", "", "g"), String)
-            ).like(f"%{phone}%")
-        )
+        """Return a select statement for phone records matching the last 8 digits of the phone."""
+        return select(cls).where(match_phone_suffix(cls.phone_suffix, phone))
 
     @classmethod
     def select_stmt_by_registration_id(cls, registration_id: int):
@@ -496,12 +576,7 @@ class Phones(BaseSQLModel, table=True):
     @classmethod
     def get_member_by_trailing_8_digit_phone(cls, phone_number: int):
         """Return a select statement for a member by the last 8 digits of the phone number."""
-        phone_pattern = f"%{str(phone_number)[-8:]}"
-        return select(cls).where(
-            func.lower(
-                func.cast(func.regexp_replace(cls.phone_number, r"\D", "", "g"), String)
-            ).like(phone_pattern)
-        )
+        return select(cls).where(match_phone_suffix(cls.phone_suffix, phone_number))
 
     @classmethod
     def get_phones_for_member(cls, member_id: int):
@@ -551,13 +626,49 @@ class WhatsappComms(BaseSQLModel, table=True):
     )
 
 
+# Audience of a WhatsApp group, derived from its name prefix. Kept in sync by Postgres as a
+# stored generated column, so groups inserted by the WhatsApp workers are classified too.
+GROUP_CLASSIFICATION_EXPRESSION = r"""CASE
+    WHEN group_name ~* '^M[\s.]*JB' THEN 'MJB'
+    WHEN group_name ~* '^R[\s.]*JB' THEN 'RJB'
+    WHEN group_name ~* '^JB' THEN 'JB'
+    WHEN group_name ~* '^OrgMB' THEN 'OrgMB'
+    WHEN group_name ~* '^(MB|Mensa)' THEN 'MB'
+    ELSE 'NotMensa'
+END"""
+
+
 class GroupList(SQLModel, table=True):
     """Model for the group_list table."""
 
     __tablename__ = "group_list"
+    __table_args__ = (
+        Index(
+            "ix_group_list_classification_group_name",
+            "classification",
+            text('group_name COLLATE "C"'),
+        ),
+    )
 
     group_id: str = Field(max_length=255, primary_key=True)
     group_name: str = Field(max_length=255)
+    classification: str | None = Field(
+        default=None,
+        sa_column=Column(String(8), Computed(GROUP_CLASSIFICATION_EXPRESSION, persisted=True)),
+        exclude=True,
+    )
+
+    @classmethod
+    def select_by_classifications(cls, classifications: list[str]):
+        """
+        Return a select statement for the (group_id, group_name) of groups with any of the given
+        classifications, ordered by name as Python would sort it.
+        """
+        return (
+            select(cls.group_id, cls.group_name)
+            .where(col(cls.classification).in_(classifications))
+            .order_by(col(cls.group_name).collate("C"))
+        )
 
     @classmethod
     def select_by_group_name(cls, group_name: str):
@@ -862,6 +973,7 @@ class WhatsappAuthorization(BaseSQLModel, table=True):
 
     auth_id: int = Field(primary_key=True)
     phone_number: str = Field(max_length=20, min_length=10, index=True)
+    phone_suffix: str | None = Field(default=None, sa_column=phone_suffix_column(), exclude=True)
     worker_id: int = Field(foreign_key="whatsapp_workers.id", ondelete="CASCADE")
 
     __table_args__ = (
@@ -875,11 +987,62 @@ class WhatsappAuthorization(BaseSQLModel, table=True):
         """
         if not phone_number:
             raise ValueError("phone_number must not be None or empty")
-        phone_pattern = f"%{phone_number[-8:]}"
-        return select(cls).where(
-            func.lower(
-                func.cast(func.regexp_replace(cls.phone_number, r"\D", "", "g"), String)
-            ).like(phone_pattern)
+        return select(cls).where(match_phone_suffix(cls.phone_suffix, phone_number))
+
+    @classmethod
+    def select_status_by_registration_id(cls, registration_id: int, include_legal_reps: bool):
+        """
+        Return a select statement with one row per worker and phone of a member (and of their
+        legal representatives, if ``include_legal_reps``), telling whether the worker has
+        authorized that phone, matching phones by their last 8 digits.
+
+        Rows are ``(worker_phone, phone, kind, authorized)`` with ``kind`` either "member"
+        or "legal_rep". Workers are returned even when the member has no phones, with
+        ``phone`` set to None.
+        """
+        phones: Select | CompoundSelect = select(
+            col(Phones.phone_number).label("phone"),
+            col(Phones.phone_suffix).label("phone_suffix"),
+            literal_column("'member'").label("kind"),
+        ).where(Phones.registration_id == registration_id)
+        if include_legal_reps:
+            phones = union_all(
+                phones,
+                select(
+                    LegalRepresentatives.phone,
+                    col(LegalRepresentatives.phone_suffix),
+                    literal_column("'legal_rep'"),
+                ).where(
+                    LegalRepresentatives.registration_id == registration_id,
+                    col(LegalRepresentatives.phone).is_not(None),
+                ),
+            )
+        member_phones = phones.subquery("member_phones")
+
+        return (
+            select(
+                WhatsappWorkers.worker_phone,
+                member_phones.c.phone,
+                member_phones.c.kind,
+                func.bool_or(col(cls.auth_id).is_not(None)).label("authorized"),
+            )
+            .select_from(WhatsappWorkers)
+            .outerjoin(member_phones, true())
+            .outerjoin(
+                cls,
+                and_(
+                    cls.worker_id == WhatsappWorkers.id,
+                    col(cls.phone_suffix) == member_phones.c.phone_suffix,
+                ),
+            )
+            .group_by(
+                col(WhatsappWorkers.id),
+                WhatsappWorkers.worker_phone,
+                member_phones.c.phone,
+                member_phones.c.kind,
+            )
+            # Members first, so a phone shared with a legal representative reports "legal_rep"
+            .order_by(col(WhatsappWorkers.id), member_phones.c.kind.desc())
         )
 
 
@@ -5,6 +5,13 @@ import re
 import phonenumbers
 from phonenumbers import NumberParseException, PhoneNumberFormat
 
+PHONE_SUFFIX_LENGTH = 8
+
+
+def phone_suffix(phone_number: str | int) -> str:
+    """Return the last 8 digits of a phone number, ignoring any non-digit characters."""
+    return re.sub(r"\D", "", str(phone_number))[-PHONE_SUFFIX_LENGTH:]
+
 
 class PhoneNumber(str):
     "A custom type for phone number with E.164 format."
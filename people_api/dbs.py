@@ -3,17 +3,23 @@ MongoDB, Firebase, PostgreSQL, and Redis initialization.
 """
 
 import os
-from collections.abc import AsyncGenerator, AsyncIterator, Generator
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterable
+from typing import Literal, overload
 
-import firebase_admin
 import redis.asyncio as redis
-from firebase_admin import credentials, firestore
-from pydantic import BaseModel, ConfigDict
+from fastapi import Depends
+from opentelemetry import metrics, trace
+from opentelemetry.metrics import CallbackOptions, Observation
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, SessionTransaction
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import Session, create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from .resources import lazy_resource
 from .settings import get_settings
 
 settings = get_settings()
@@ -27,6 +33,8 @@ DATABASE_URL = f"postgresql://{settings.postgres_user}:{settings.postgres_passwo
 
 RO_DATABASE_URL = f"postgresql://{settings.postgres_ro_user}:{settings.postgres_ro_password}@{settings.postgres_host}/{settings.postgres_database}"
 
+ASYNC_SITE_RO_DATABASE_URL = f"postgresql+asyncpg://{settings.site_ro_user}:{settings.site_ro_password}@{settings.postgres_host}/{settings.site_database}"
+
 SITE_RO_DATABASE_URL = f"postgresql://{settings.site_ro_user}:{settings.site_ro_password}@{settings.postgres_host}/{settings.site_database}"
 
 async_engine_rw: AsyncEngine | None = None
@@ -35,84 +43,349 @@ rw_sessionmaker: async_sessionmaker[AsyncSession] | None = None
 async_engine_ro: AsyncEngine | None = None
 ro_sessionmaker: async_sessionmaker[AsyncSession] | None = None
 
-# Create SQLModel engine
-engine = create_engine(url=DATABASE_URL)
-ro_engine = create_engine(url=RO_DATABASE_URL)
+async_engine_site_ro: AsyncEngine | None = None
+site_ro_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+@lazy_resource("postgres_engine", on_startup=True)
+def get_engine() -> Engine:
+    """Return the sync read-write SQLModel engine."""
+    return create_engine(url=DATABASE_URL)
+
+
+@lazy_resource("postgres_ro_engine", on_startup=True)
+def get_ro_engine() -> Engine:
+    """Return the sync read-only SQLModel engine."""
+    return create_engine(url=RO_DATABASE_URL)
+
 
-ro_site_engine = create_engine(url=SITE_RO_DATABASE_URL)
+@lazy_resource("site_ro_engine")
+def get_ro_site_engine() -> Engine:
+    """Return the sync read-only engine for the site database."""
+    return create_engine(url=SITE_RO_DATABASE_URL)
 
 
 def get_session() -> Generator[Session]:
     """Provide an sync sqlmodel session to the database."""
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
         session.commit()
 
 
 def get_read_only_session() -> Generator[Session]:
     """Provide an sync sqlmodel read-only session to the database."""
-    with Session(ro_engine) as session:
+    with Session(get_ro_engine()) as session:
         yield session
 
 
 def get_site_read_only_session() -> Generator[Session]:
     """Provide a sync sqlmodel read-only session to the site-specific database."""
     # Use the site read-only engine to target the separate site database
-    with Session(ro_site_engine) as session:
+    with Session(get_ro_site_engine()) as session:
         yield session
 
 
-class AsyncSessionsTuple(BaseModel):
-    """Tuple of async read-only and read-write sessions."""
+_meter = metrics.get_meter(__name__)
+_checkout_duration = _meter.create_histogram(
+    "db.pool.checkout.duration",
+    unit="ms",
+    description="Time spent checking a connection out of the async pool.",
+)
+_pre_pings = _meter.create_counter(
+    "db.pool.pre_pings",
+    description="Liveness checks of connections that sat idle in the async pool.",
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _checkout_duration.record(
+                (time.perf_counter() - start) * 1000, {"db.pool": self.logging_name or "unknown"}
+            )
 
-    ro: AsyncSession
-    rw: AsyncSession
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+def _observe_pools(_options: CallbackOptions) -> Iterable[Observation]:
+    capacity = settings.db_pool_size + settings.db_max_overflow
+    for name, async_engine in (
+        ("rw", async_engine_rw),
+        ("ro", async_engine_ro),
+        ("site_ro", async_engine_site_ro),
+    ):
+        if async_engine is not None:
+            checked_out = async_engine.sync_engine.pool.checkedout()  # type: ignore[attr-defined]
+            yield Observation(checked_out / capacity, {"db.pool": name})
+
+
+_meter.create_observable_gauge(
+    "db.pool.saturation",
+    callbacks=[_observe_pools],
+    description="Share of the async pool capacity (size plus overflow) checked out.",
+)
+
+
+def _instrument_pool(async_engine: AsyncEngine, name: str) -> None:
+    """Ping connections on checkout only when they sat idle for ``db_pre_ping_idle_seconds``."""
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(_dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, _connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if (
+            checked_in_at is None
+            or time.monotonic() - checked_in_at < settings.db_pre_ping_idle_seconds
+        ):
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            _pre_pings.add(1, {"db.pool": name, "outcome": "disconnected"})
+            # The pool discards the connection and checks out another one.
+            raise DisconnectionError(f"Idle connection failed pre-ping: {e}") from e
+        _pre_pings.add(1, {"db.pool": name, "outcome": "alive"})
+
+
+def _create_pooled_async_engine(url: str, name: str) -> AsyncEngine:
+    """Create an async engine with the pool configured by the ``db_*`` settings."""
+    async_engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedAsyncPool,
+        pool_logging_name=name,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+    )
+    _instrument_pool(async_engine, name)
+    return async_engine
+
+
+class _TrackedSession(Session):
+    """Sync session behind each ``AsyncSession``; records pool waits and writes in ``info``."""
+
+
+@event.listens_for(_TrackedSession, "do_orm_execute")
+def _on_execute(orm_execute_state: ORMExecuteState) -> None:
+    session = orm_execute_state.session
+    session.info["acquire_started"] = time.perf_counter()
+    if not orm_execute_state.is_select:
+        session.info["wrote"] = True
+
+
+@event.listens_for(_TrackedSession, "before_flush")
+def _on_before_flush(session: Session, _flush_context, _instances) -> None:
+    session.info["acquire_started"] = time.perf_counter()
+
+
+@event.listens_for(_TrackedSession, "after_flush")
+def _on_after_flush(session: Session, _flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(_TrackedSession, "after_begin")
+def _on_after_begin(session: Session, _transaction, _connection) -> None:
+    # A connection is checked out from the pool when a transaction begins, right after the
+    # statement or flush that needed it.
+    started = session.info.pop("acquire_started", None)
+    if started is not None:
+        session.info["pool_wait"] = session.info.get("pool_wait", 0.0) + (
+            time.perf_counter() - started
+        )
 
 
-async def get_async_sessions() -> AsyncIterator[AsyncSessionsTuple]:
-    """Provide async read-only and read-write sessions."""
+@event.listens_for(_TrackedSession, "after_transaction_end")
+def _on_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    # Savepoints end inside the request's transaction, whose writes are still pending.
+    if transaction.parent is None:
+        session.info["wrote"] = False
+
+
+def _get_sessionmakers() -> tuple[
+    async_sessionmaker[AsyncSession], async_sessionmaker[AsyncSession]
+]:
+    """Return the read-only and read-write sessionmakers, creating the engines on first use."""
     global async_engine_rw, async_engine_ro, rw_sessionmaker, ro_sessionmaker
     if rw_sessionmaker is None or ro_sessionmaker is None:
-        async_engine_rw = create_async_engine(
-            url=ASYNC_DATABASE_URL,
-            poolclass=AsyncAdaptedQueuePool,
-            pool_size=5,
-            max_overflow=20,
-            pool_pre_ping=True,
-        )
+        async_engine_rw = _create_pooled_async_engine(ASYNC_DATABASE_URL, "rw")
         rw_sessionmaker = async_sessionmaker(
-            async_engine_rw, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            async_engine_rw,
+            class_=AsyncSession,
+            sync_session_class=_TrackedSession,
+            autoflush=False,
+            expire_on_commit=False,
         )
 
-        async_engine_ro = create_async_engine(
-            url=ASYNC_RO_DATABASE_URL,
-            poolclass=AsyncAdaptedQueuePool,
-            pool_size=5,
-            max_overflow=20,
-            pool_pre_ping=True,
-        )
+        async_engine_ro = _create_pooled_async_engine(ASYNC_RO_DATABASE_URL, "ro")
         ro_sessionmaker = async_sessionmaker(
-            async_engine_ro, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            async_engine_ro,
+            class_=AsyncSession,
+            sync_session_class=_TrackedSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return ro_sessionmaker, rw_sessionmaker
+
+
+def _get_site_ro_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Return the sessionmaker of the site database, creating its engine on first use."""
+    global async_engine_site_ro, site_ro_sessionmaker
+    if site_ro_sessionmaker is None:
+        async_engine_site_ro = _create_pooled_async_engine(ASYNC_SITE_RO_DATABASE_URL, "site_ro")
+        site_ro_sessionmaker = async_sessionmaker(
+            async_engine_site_ro, class_=AsyncSession, expire_on_commit=False
         )
+    return site_ro_sessionmaker
+
+
+class AsyncSessionsTuple:
+    """
+    Read-only and read-write async sessions for one request or unit of work.
+
+    Each session is only created the first time it is accessed, and like any
+    ``AsyncSession`` only checks out a pool connection when it first runs a statement, so
+    a request that never touches ``rw`` never holds a read-write connection.
+    """
+
+    def __init__(self, ro: AsyncSession | None = None, rw: AsyncSession | None = None):
+        self._ro = ro
+        self._rw = rw
+
+    @property
+    def ro(self) -> AsyncSession:
+        """The read-only session."""
+        if self._ro is None:
+            self._ro = _get_sessionmakers()[0]()
+        return self._ro
+
+    @property
+    def rw(self) -> AsyncSession:
+        """The read-write session."""
+        if self._rw is None:
+            self._rw = _get_sessionmakers()[1]()
+        return self._rw
+
+    @property
+    def pool_wait(self) -> dict[str, float]:
+        """Seconds spent waiting for pool connections so far, by session that was used."""
+        return {
+            name: session.info.get("pool_wait", 0.0)
+            for name, session in (("ro", self._ro), ("rw", self._rw))
+            if session is not None
+        }
+
+    def has_pending_writes(self) -> bool:
+        """Whether the read-write session has changes that still need to be committed."""
+        rw = self._rw
+        return rw is not None and bool(rw.info.get("wrote") or rw.new or rw.dirty or rw.deleted)
+
+    async def rollback(self) -> None:
+        """Roll back the read-write session, if it was opened."""
+        if self._rw is not None:
+            await self._rw.rollback()
+
+    async def close(self) -> None:
+        """Close the sessions that were opened, returning their connections to the pool."""
+        for session in (self._rw, self._ro):
+            if session is not None:
+                await session.close()
+
 
-    rw_session = rw_sessionmaker()
-    ro_session = ro_sessionmaker()
+async def get_async_sessions() -> AsyncIterator[AsyncSessionsTuple]:
+    """
+    Provide lazily opened async read-only and read-write sessions.
+
+    The read-write session is only committed when something was written through it, and
+    the time spent waiting for pool connections is recorded on the current span.
+    """
+    sessions = AsyncSessionsTuple()
     try:
-        yield AsyncSessionsTuple(ro=ro_session, rw=rw_session)
-        await rw_session.commit()
+        yield sessions
+        if sessions.has_pending_writes():
+            await sessions.rw.commit()
     except Exception:
-        await rw_session.rollback()
+        await sessions.rollback()
         raise
     finally:
-        await rw_session.close()
-        await ro_session.close()
+        await sessions.close()
+        span = trace.get_current_span()
+        for name, wait in sessions.pool_wait.items():
+            span.set_attribute(f"db.{name}.pool_wait_ms", wait * 1000)
+
+
+async def get_async_ro_session(
+    sessions: AsyncSessionsTuple = Depends(get_async_sessions),
+) -> AsyncSession:
+    """Provide only the read-only session of the request."""
+    return sessions.ro
+
+
+async def get_async_rw_session(
+    sessions: AsyncSessionsTuple = Depends(get_async_sessions),
+) -> AsyncSession:
+    """Provide only the read-write session of the request, committed if anything was written."""
+    return sessions.rw
+
+
+async def get_async_site_ro_session() -> AsyncIterator[AsyncSession]:
+    """Provide an async read-only session to the site database."""
+    async with _get_site_ro_sessionmaker()() as session:
+        yield session
+
+
+def get_async_ro_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Provide the read-only sessionmaker, for responses that stream from a session after
+    the request's dependencies have been cleaned up.
+    """
+    return _get_sessionmakers()[0]
+
+
+def get_async_site_ro_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Provide the read-only sessionmaker of the site database, for streamed responses."""
+    return _get_site_ro_sessionmaker()
+
+
+async def dispose_engines() -> None:
+    """Close the async connection pools so a new event loop starts from a clean state."""
+    global async_engine_rw, async_engine_ro, async_engine_site_ro
+    global rw_sessionmaker, ro_sessionmaker, site_ro_sessionmaker
+    for async_engine in (async_engine_rw, async_engine_ro, async_engine_site_ro):
+        if async_engine is not None:
+            await async_engine.dispose()
+    async_engine_rw = async_engine_ro = async_engine_site_ro = None
+    rw_sessionmaker = ro_sessionmaker = site_ro_sessionmaker = None
+
+
+@overload
+def create_redis_client(decode_responses: Literal[True] = True) -> "redis.Redis[str]": ...
+
+
+@overload
+def create_redis_client(decode_responses: Literal[False]) -> "redis.Redis[bytes]": ...
+
+
+def create_redis_client(decode_responses: bool = True) -> redis.Redis:
+    """Create an async Redis client from the configured host and port."""
+    if decode_responses:
+        return redis.Redis(
+            host=settings.redis_host, port=settings.redis_port, decode_responses=True
+        )
+    return redis.Redis(host=settings.redis_host, port=settings.redis_port, decode_responses=False)
 
 
 async def get_redis_client() -> AsyncGenerator[redis.Redis, None]:
     """Provides an async Redis client."""
-    client = redis.Redis(host=settings.redis_host, port=settings.redis_port, decode_responses=True)
+    client = create_redis_client()
     try:
         yield client
     finally:
@@ -120,27 +393,26 @@ async def get_redis_client() -> AsyncGenerator[redis.Redis, None]:
 
 
 # Firebase
-firebase_app = None
-
-
+@lazy_resource("firebase_app", on_startup=True)
 def initialize_firebase():
     """Initialize Firebase."""
 
-    global firebase_app
-    if firebase_app is None:
-        if os.path.exists("firebase_secret.json"):
-            print("Initializing Firebase", flush=True)
-            cred = credentials.Certificate("firebase_secret.json")
-            firebase_app = firebase_admin.initialize_app(cred)
-        else:
-            print(
-                "firebase_secret.json not found. Skipping Firebase initialization.",
-                flush=True,
-            )
-            firebase_app = "mock_firebase_app"
-    return firebase_app
+    # firebase_admin pulls in gRPC and the Firestore client; only load it when needed.
+    import firebase_admin  # pylint: disable=import-outside-toplevel
+    from firebase_admin import credentials  # pylint: disable=import-outside-toplevel
+
+    if os.path.exists("firebase_secret.json"):
+        print("Initializing Firebase", flush=True)
+        cred = credentials.Certificate("firebase_secret.json")
+        return firebase_admin.initialize_app(cred)
+    print(
+        "firebase_secret.json not found. Skipping Firebase initialization.",
+        flush=True,
+    )
+    return "mock_firebase_app"
 
 
+@lazy_resource("firebase_collection", on_startup=True)
 def get_firebase_collection():
     """Get the Firebase collection."""
 
@@ -148,8 +420,7 @@ def get_firebase_collection():
     if app == "mock_firebase_app":
         print("Using mock Firebase collection.", flush=True)
         return None
+    from firebase_admin import firestore  # pylint: disable=import-outside-toplevel
+
     db = firestore.client(app=app)
     return db.collection("users")
-
-
-firebase_collection = get_firebase_collection()
@@ -1,8 +1,11 @@
 """Endpoints for generating and downloading certificates."""
 
-from fastapi import APIRouter
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import HTMLResponse
 
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..services import CertificateService
 
 certificate_router = APIRouter()
@@ -11,8 +14,14 @@ certificate_router = APIRouter()
 @certificate_router.get(
     "/download_certificate.png", description="Gerar certificado", tags=["certificado"]
 )
-async def _get_certificado(MB: int, key: str):
-    return await CertificateService.generate_certificate(MB, key)
+async def _get_certificado(
+    MB: int,
+    key: str,
+    image_format: Literal["png", "webp", "jpeg"] = Query("png", alias="format"),
+    width: int | None = Query(None, ge=64, le=2048, description="Downscale for previews"),
+    sessions: AsyncSessionsTuple = Depends(get_async_sessions),
+):
+    return await CertificateService.generate_certificate(MB, key, sessions, image_format, width)
 
 
 @certificate_router.get(
@@ -1,10 +1,11 @@
 """Data endpoint for querying the database"""
 
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..database.models import QueryRequest, QueryResponse
-from ..dbs import get_read_only_session, get_site_read_only_session
+from ..dbs import get_async_ro_sessionmaker, get_async_site_ro_sessionmaker
 from ..services.data_service import DataService, get_api_key
 
 data_router = APIRouter(tags=["Data"], prefix="/data")
@@ -14,17 +15,19 @@ data_router = APIRouter(tags=["Data"], prefix="/data")
 async def get_data(
     request: QueryRequest,
     api_key: str = Depends(get_api_key),
-    session: Session = Depends(get_read_only_session),
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_async_ro_sessionmaker),
+    accept: str | None = Header(None),
 ):
     """Get data from DB"""
-    return await DataService.get_data(request, api_key, session)
+    return await DataService.get_data(request, api_key, sessionmaker, accept)
 
 
 @data_router.post("/query_site", response_model=QueryResponse)
 async def get_data_site(
     request: QueryRequest,
     api_key: str = Depends(get_api_key),
-    session: Session = Depends(get_site_read_only_session),
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_async_site_ro_sessionmaker),
+    accept: str | None = Header(None),
 ):
     """Get data from DB"""
-    return await DataService.get_data(request, api_key, session)
+    return await DataService.get_data(request, api_key, sessionmaker, accept)
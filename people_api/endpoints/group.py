@@ -1,11 +1,12 @@
 """Endpoints for managing member WhatsApp groups and group join requests."""
 
 from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.schemas import InternalToken, UserToken
 
 from ..auth import permission_required, verify_firebase_token
-from ..dbs import AsyncSessionsTuple, get_async_sessions
+from ..dbs import get_async_ro_session, get_async_rw_session
 from ..models.member import GroupJoinRequest
 from ..permissions import AdminPermissions
 from ..services import GroupService
@@ -20,9 +21,9 @@ group_router = APIRouter()
 )
 async def _get_can_participate(
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
-    response = await GroupService.get_can_participate(token_data, session.ro)
+    response = await GroupService.get_can_participate(token_data, session)
     return response
 
 
@@ -33,9 +34,9 @@ async def _get_can_participate(
 )
 async def _get_participate_in(
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
-    return await GroupService.get_participate_in(token_data, session.ro)
+    return await GroupService.get_participate_in(token_data, session)
 
 
 @group_router.get(
@@ -45,9 +46,9 @@ async def _get_participate_in(
 )
 async def _get_pending_requests(
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
-    return await GroupService.get_pending_requests(token_data, session.ro)
+    return await GroupService.get_pending_requests(token_data, session)
 
 
 @group_router.get(
@@ -57,9 +58,9 @@ async def _get_pending_requests(
 )
 async def _get_failed_requests(
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
-    return await GroupService.get_failed_requests(token_data, session.ro)
+    return await GroupService.get_failed_requests(token_data, session)
 
 
 @group_router.post(
@@ -70,9 +71,9 @@ async def _get_failed_requests(
 async def _request_join_group(
     join_request: GroupJoinRequest,
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_rw_session),
 ):
-    return await GroupService.request_join_group(join_request, token_data, session.rw)
+    return await GroupService.request_join_group(join_request, token_data, session)
 
 
 @group_router.get(
@@ -82,9 +83,9 @@ async def _request_join_group(
 )
 async def _get_authorization_status(
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
-    return await GroupService.get_authorization_status(token_data, session.ro)
+    return await GroupService.get_authorization_status(token_data, session)
 
 
 @group_router.get(
@@ -96,9 +97,9 @@ async def _get_workers(
     _token_data: UserToken | InternalToken = Depends(
         permission_required(AdminPermissions.manage_workers)
     ),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
-    return await GroupService.get_workers(session.ro)
+    return await GroupService.get_workers(session)
 
 
 @group_router.post(
@@ -111,9 +112,9 @@ async def _add_worker(
     _token_data: UserToken | InternalToken = Depends(
         permission_required(AdminPermissions.manage_workers)
     ),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_rw_session),
 ):
-    return await GroupService.add_worker(worker_phone, session.rw)
+    return await GroupService.add_worker(worker_phone, session)
 
 
 @group_router.delete(
@@ -126,6 +127,6 @@ async def _remove_worker(
     _token_data: UserToken | InternalToken = Depends(
         permission_required(AdminPermissions.manage_workers)
     ),
-    session: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_rw_session),
 ):
-    return await GroupService.remove_worker(worker_phone, session.rw)
+    return await GroupService.remove_worker(worker_phone, session)
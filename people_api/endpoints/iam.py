@@ -1,6 +1,7 @@
 """Endpoints for managing roles and groups."""
 
 from fastapi import APIRouter, Depends, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..auth import verify_firebase_token
 from ..database.models.iam_model import (
@@ -22,7 +23,7 @@ from ..database.models.iam_model import (
     UpdatePermission,
     UpdateRole,
 )
-from ..dbs import AsyncSessionsTuple, get_async_sessions
+from ..dbs import AsyncSessionsTuple, get_async_ro_session, get_async_sessions
 from ..services import IamService
 
 iam_router = APIRouter(tags=["IAM"], prefix="/iam", dependencies=[Depends(verify_firebase_token)])
@@ -143,19 +144,19 @@ async def _add_permission_to_group(
 @iam_router.get("/roles/", status_code=status.HTTP_200_OK, tags=["roles"])
 async def _get_roles(
     token_data=Depends(verify_firebase_token),
-    sessions: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
     """Get roles for member"""
-    return await IamService.get_member_roles(token_data=token_data, session=sessions.ro)
+    return await IamService.get_member_roles(token_data=token_data, session=session)
 
 
 @iam_router.get("/groups/", status_code=status.HTTP_200_OK, tags=["groups"])
 async def _get_groups(
     token_data=Depends(verify_firebase_token),
-    sessions: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
     """Get groups for member"""
-    return await IamService.get_member_groups(token_data=token_data, session=sessions.ro)
+    return await IamService.get_member_groups(token_data=token_data, session=session)
 
 
 @iam_router.get("/permissions/", status_code=status.HTTP_200_OK, tags=["permissions"])
@@ -1,13 +1,12 @@
 """Endpoints for managing members addresses."""
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
 
 from people_api.database.models.models import Addresses
 from people_api.schemas import InternalToken, UserToken
 
 from ..auth import verify_firebase_token
-from ..dbs import get_session
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..services import AddressService
 
 member_address_router = APIRouter()
@@ -20,12 +19,12 @@ member_address_router = APIRouter()
 )
 async def get_addresses(
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
     """Get addresses for member."""
     if not token_data.email or not token_data.registration_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return AddressService.get_addresses(token_data, session)
+    return await AddressService.get_addresses(token_data, session.ro)
 
 
 @member_address_router.post("/address/{mb}", description="Add address to member", tags=["address"])
@@ -33,12 +32,12 @@ async def _add_address(
     mb: int,
     address: Addresses,
     token_data: UserToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
     """Add address to member."""
     if not token_data.email:
         return {"message": "Unauthorized"}
-    return AddressService.add_address(mb, address, token_data.email, session)
+    return await AddressService.add_address(mb, address, token_data.email, session.rw)
 
 
 @member_address_router.put(
@@ -51,12 +50,14 @@ async def update_address(
     address_id: int,
     updated_address: Addresses,
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
     """Update address for member."""
     if not token_data.email:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return AddressService.update_address(mb, address_id, updated_address, token_data.email, session)
+    return await AddressService.update_address(
+        mb, address_id, updated_address, token_data.email, session.rw
+    )
 
 
 @member_address_router.delete(
@@ -68,9 +69,9 @@ async def delete_address(
     mb: int,
     address_id: int,
     token_data: UserToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
     """Delete address from member."""
     if not token_data.email:
         return {"message": "Unauthorized"}
-    return AddressService.delete_address(mb, address_id, token_data.email, session)
+    return await AddressService.delete_address(mb, address_id, token_data.email, session.rw)
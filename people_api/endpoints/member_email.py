@@ -1,12 +1,11 @@
 """Endpoints for managing members emails."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
 
 from people_api.database.models.models import EmailInput
 
 from ..auth import verify_firebase_token
-from ..dbs import AsyncSessionsTuple, get_async_sessions, get_session
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..services import EmailService
 
 member_email_router = APIRouter()
@@ -18,9 +17,9 @@ async def _add_email(
     mb: int,
     email: EmailInput,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return EmailService.add_email(mb, email, token_data, session)
+    return await EmailService.add_email(mb, email, token_data, session.rw)
 
 
 # update email from member
@@ -32,9 +31,9 @@ async def update_email(
     email_id: int,
     updated_email: EmailInput,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return EmailService.update_email(mb, email_id, updated_email, token_data, session)
+    return await EmailService.update_email(mb, email_id, updated_email, token_data, session.rw)
 
 
 # delete email from member
@@ -45,9 +44,9 @@ async def delete_email(
     mb: int,
     email_id: int,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return EmailService.delete_email(mb, email_id, token_data, session)
+    return await EmailService.delete_email(mb, email_id, token_data, session.rw)
 
 
 # request email creation
@@ -1,13 +1,12 @@
 """Endpoints for managing legal representatives of members."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
 
 from people_api.database.models.models import LegalRepresentatives
 from people_api.schemas import InternalToken, UserToken
 
 from ..auth import verify_firebase_token
-from ..dbs import AsyncSessionsTuple, get_async_sessions, get_session
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..services.legal_representative_service import (
     LegalRepresentativeRequest,
     LegalRepresentativeService,
@@ -37,9 +36,9 @@ async def get_legal_representatives(
 )
 async def add_legal_representative_api_key(
     request: LegalRepresentativeRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return LegalRepresentativeService.add_legal_representative_api_key(request, session)
+    return await LegalRepresentativeService.add_legal_representative_api_key(request, session.rw)
 
 
 # add legal representative to member
@@ -52,10 +51,10 @@ async def _add_legal_representative(
     mb: int,
     legal_representative: LegalRepresentatives,
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return LegalRepresentativeService.add_legal_representative(
-        mb, legal_representative, token_data, session
+    return await LegalRepresentativeService.add_legal_representative(
+        mb, legal_representative, token_data, session.rw
     )
 
 
@@ -70,10 +69,10 @@ async def update_legal_representative(
     legal_rep_id: int,
     updated_legal_rep: LegalRepresentatives,
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return LegalRepresentativeService.update_legal_representative(
-        mb, legal_rep_id, updated_legal_rep, token_data, session
+    return await LegalRepresentativeService.update_legal_representative(
+        mb, legal_rep_id, updated_legal_rep, token_data, session.rw
     )
 
 
@@ -87,8 +86,8 @@ async def delete_legal_representative(
     mb: int,
     legal_rep_id: int,
     token_data: UserToken | InternalToken = Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return LegalRepresentativeService.delete_legal_representative(
-        mb, legal_rep_id, token_data, session
+    return await LegalRepresentativeService.delete_legal_representative(
+        mb, legal_rep_id, token_data, session.rw
     )
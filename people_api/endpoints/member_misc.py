@@ -1,10 +1,9 @@
 """Endpoints for managing miscellaneous member-related operations in the .."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
 
 from ..auth import verify_firebase_token
-from ..dbs import get_session
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..exceptions import PersonNotFoundException, get_exception_responses
 from ..models.member import PostgresMemberRead, PronounsCreate
 from ..models.member_data import MemberProfessionFacebookUpdate
@@ -23,18 +22,18 @@ member_misc_router = APIRouter()
 async def _get_member(
     mb: int,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return MiscService.get_member(mb, token_data, session)
+    return await MiscService.get_member(mb, token_data, session.ro)
 
 
 @member_misc_router.patch("/pronouns", description="Set pronouns for member", tags=["member"])
 async def _set_pronouns(
     pronouns: PronounsCreate,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return MiscService.set_pronouns(pronouns, token_data, session)
+    return await MiscService.set_pronouns(pronouns, token_data, session.rw)
 
 
 @member_misc_router.put(
@@ -46,6 +45,6 @@ async def update_fb_profession(
     mb: int,
     updated_member: MemberProfessionFacebookUpdate,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return MiscService.update_fb_profession(mb, updated_member, token_data, session)
+    return await MiscService.update_fb_profession(mb, updated_member, token_data, session.rw)
@@ -1,12 +1,11 @@
 """Endpoints for managing members phone numbers."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
 
 from people_api.database.models.models import PhoneInput
 
 from ..auth import verify_firebase_token
-from ..dbs import get_session
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..services import PhoneService
 
 member_phone_router = APIRouter()
@@ -18,9 +17,9 @@ async def _add_phone(
     mb: int,
     phone: PhoneInput,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return PhoneService.add_phone(mb, phone, token_data, session)
+    return await PhoneService.add_phone(mb, phone, token_data, session.rw)
 
 
 # update phone from member
@@ -32,9 +31,9 @@ async def update_phone(
     phone_id: int,
     updated_phone: PhoneInput,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return PhoneService.update_phone(mb, phone_id, updated_phone, token_data, session)
+    return await PhoneService.update_phone(mb, phone_id, updated_phone, token_data, session.rw)
 
 
 # delete phone from member
@@ -45,6 +44,6 @@ async def delete_phone(
     mb: int,
     phone_id: int,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return PhoneService.delete_phone(mb, phone_id, token_data, session)
+    return await PhoneService.delete_phone(mb, phone_id, token_data, session.rw)
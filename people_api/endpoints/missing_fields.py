@@ -1,10 +1,9 @@
 """Endpoints for managing missing fields of members."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
 
 from ..auth import verify_firebase_token
-from ..dbs import get_session
+from ..dbs import AsyncSessionsTuple, get_async_sessions
 from ..models.member_data import MissingFieldsCreate
 from ..services import MissingFieldsService
 
@@ -18,9 +17,10 @@ missing_fields_router = APIRouter()
     tags=["missing_fields"],
 )
 async def _get_missing_fields(
-    token_data=Depends(verify_firebase_token), session: Session = Depends(get_session)
+    token_data=Depends(verify_firebase_token),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return MissingFieldsService.get_missing_fields(token_data, session)
+    return await MissingFieldsService.get_missing_fields(token_data, session.ro)
 
 
 # set the missing fields of a member
@@ -32,6 +32,6 @@ async def _get_missing_fields(
 async def _set_missing_fields(
     missing_fields: MissingFieldsCreate,
     token_data=Depends(verify_firebase_token),
-    session: Session = Depends(get_session),
+    session: AsyncSessionsTuple = Depends(get_async_sessions),
 ):
-    return MissingFieldsService.set_missing_fields(token_data, missing_fields, session)
+    return await MissingFieldsService.set_missing_fields(token_data, missing_fields, session.rw)
@@ -8,6 +8,7 @@ from datetime import datetime, time, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.auth import (
     get_registration_id,
@@ -41,7 +42,7 @@ from people_api.permissions import VolunteerAdmin as A
 from people_api.permissions import VolunteerMember as M
 from people_api.utils import generate_presigned_media_url, upload_media_to_s3
 
-from ..dbs import AsyncSessionsTuple, get_async_sessions
+from ..dbs import AsyncSessionsTuple, get_async_ro_session, get_async_sessions
 from ..schemas import UserToken
 from ..settings import get_settings
 
@@ -250,7 +251,7 @@ async def get_member_activity_evaluations(
 async def get_leaderboard(
     start_date: datetime = Query(..., description="ISO start date"),
     end_date: datetime = Query(..., description="ISO end date"),
-    sessions: AsyncSessionsTuple = Depends(get_async_sessions),
+    session: AsyncSession = Depends(get_async_ro_session),
 ):
     """
     Top 10 volunteer rankings between start_date and end_date.
@@ -260,7 +261,7 @@ async def get_leaderboard(
     end_date = datetime.combine(end_date.date(), time.max)
 
     rows = (
-        await sessions.ro.exec(VolunteerPointTransaction.select_top_n(start_date, end_date, n=10))
+        await session.exec(VolunteerPointTransaction.select_top_n(start_date, end_date, n=10))
     ).all()
 
     return [
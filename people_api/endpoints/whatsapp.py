@@ -1,8 +1,14 @@
 """Whatsapp router for updating phone numbers for members and their legal representatives."""
 
-from fastapi import APIRouter, Depends, Request
+import logging
+
+from fastapi import APIRouter, Depends, Request, Response
+from redis.exceptions import RedisError
 
 from people_api.services.whatsapp_service.chatbot.client import WhatsappChatBot
+from people_api.services.whatsapp_service.chatbot.message_queue import (
+    ChatbotMessageQueue,
+)
 
 from ..database.models import UpdateInput
 from ..database.models.whatsapp import ReceivedWhatsappMessage
@@ -12,6 +18,7 @@ from ..services.whatsapp_service.chatbot.validation import (
     validate_member_and_permissions,
 )
 from ..services.whatsapp_service.utils import WhatsAppService
+from ..settings import get_settings
 
 whatsapp_router = APIRouter(tags=["Whatsapp"], prefix="/whatsapp")
 
@@ -35,6 +42,10 @@ async def chatbot_message(
 ):
     """
     Whatsapp endpoint for chatbot messages.
+
+    Messages from active members are queued and answered by ``ChatbotMessageQueue`` workers,
+    and Twilio gets an empty TwiML response right away. Without workers, or when Redis is
+    unavailable, the message is answered before responding.
     """
     form_data = await request.form()
     data_dict = {key: str(value) for key, value in form_data.items()}
@@ -42,6 +53,13 @@ async def chatbot_message(
 
     registration_id = await validate_member_and_permissions(received_message, sessions.ro)
 
+    if get_settings().chatbot_queue_workers > 0:
+        try:
+            await ChatbotMessageQueue.enqueue(received_message, registration_id)
+            return Response(content="<Response/>", media_type="application/xml")
+        except RedisError as e:
+            logging.warning("[CHATBOT-QUEUE] Could not queue message, answering inline: %s", e)
+
     return await WhatsappChatBot.chatbot_message(
-        message=received_message, session=sessions.ro, registration_id=registration_id
+        message=received_message, sessions=sessions, registration_id=registration_id
     )
@@ -6,34 +6,60 @@ import argparse
 import asyncio
 from collections.abc import Callable
 
-from people_api.app import start_api
-from people_api.cronjobs.workspace_groups.update_workspace_groups import run_update
-from people_api.scripts.redrive_dlq import redrive_dlq_to_sqs
-from people_api.services.sqs_handler import (
-    consume_and_store_messages,
-    setup_sqs_and_sns,
-)
+# Each entrypoint imports only the modules it needs, so that e.g. the DLQ redrive does not
+# pay for loading every API router. pylint: disable=import-outside-toplevel
 
 
 def api(_: argparse.Namespace) -> None:
     """Start the API service."""
+    from people_api.app import start_api
+
     start_api()
 
 
-def update_workspace_groups(_: argparse.Namespace) -> None:
+def update_workspace_groups(args: argparse.Namespace) -> None:
     """Run the workspace groups update job."""
-    asyncio.run(run_update())
+    from people_api.cronjobs.workspace_groups.update_workspace_groups import run_update
+
+    asyncio.run(run_update(dry_run=args.dry_run, concurrency=args.concurrency))
 
 
-def sqs_handler(_: argparse.Namespace) -> None:
+def sqs_handler(args: argparse.Namespace) -> None:
     """Start the SQS/SNS handler."""
+    from people_api.services.sqs_handler import (
+        consume_and_store_messages,
+        setup_sqs_and_sns,
+    )
+
     _, sqs, _, queue_url, _ = setup_sqs_and_sns()
-    asyncio.run(consume_and_store_messages(sqs_client=sqs, queue_url=queue_url))
+    asyncio.run(
+        consume_and_store_messages(sqs_client=sqs, queue_url=queue_url, workers=args.workers)
+    )
 
 
-def redrive_dlq(_: argparse.Namespace) -> None:
+def redrive_dlq(args: argparse.Namespace) -> None:
     """Redrive messages from DLQ to main SQS queue."""
-    asyncio.run(redrive_dlq_to_sqs())
+    from people_api.scripts.redrive_dlq import redrive_dlq_to_sqs
+
+    stats = asyncio.run(
+        redrive_dlq_to_sqs(
+            receivers=args.receivers,
+            dry_run=args.dry_run,
+            match=args.match,
+            limit=args.limit,
+            visibility_timeout=args.visibility_timeout,
+        )
+    )
+    print(stats.report(args.dry_run))
+
+
+def import_certificate_tokens(args: argparse.Namespace) -> None:
+    """Import the certificate tokens of members from Firestore into Postgres."""
+    from people_api.scripts.import_certificate_tokens import (
+        import_certificate_tokens as run_import,
+    )
+
+    print(run_import(batch_size=args.batch_size).report())
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -45,16 +71,52 @@ def build_parser() -> argparse.ArgumentParser:
     parser_api.set_defaults(func=api)
 
     parser_update = subparsers.add_parser("update_workspace_groups", help="Update workspace groups")
+    parser_update.add_argument(
+        "--dry-run", action="store_true", help="Print the changes without applying them"
+    )
+    parser_update.add_argument(
+        "--concurrency", type=int, default=2, help="Number of groups updated at the same time"
+    )
     parser_update.set_defaults(func=update_workspace_groups)
 
     parser_sqs = subparsers.add_parser("sqs_handler", help="Start the SQS handler")
+    parser_sqs.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of concurrent poll loops (defaults to the CONSUMER_WORKERS setting)",
+    )
     parser_sqs.set_defaults(func=sqs_handler)
 
     parser_redrive = subparsers.add_parser(
         "redrive_dlq", help="Redrive messages from DLQ to main SQS queue"
     )
+    parser_redrive.add_argument(
+        "--receivers", type=int, default=4, help="Number of concurrent DLQ receivers"
+    )
+    parser_redrive.add_argument(
+        "--dry-run", action="store_true", help="Report what would be redriven without moving it"
+    )
+    parser_redrive.add_argument(
+        "--match", help="Only redrive messages whose body matches this regular expression"
+    )
+    parser_redrive.add_argument("--limit", type=int, help="Stop after receiving this many messages")
+    parser_redrive.add_argument(
+        "--visibility-timeout",
+        type=int,
+        default=60,
+        help="Seconds skipped and dry-run messages stay hidden before reappearing in the DLQ",
+    )
     parser_redrive.set_defaults(func=redrive_dlq)
 
+    parser_import_tokens = subparsers.add_parser(
+        "import_certificate_tokens", help="Import certificate tokens from Firestore"
+    )
+    parser_import_tokens.add_argument(
+        "--batch-size", type=int, default=500, help="Number of members upserted per statement"
+    )
+    parser_import_tokens.set_defaults(func=import_certificate_tokens)
+
     return parser
 
 
@@ -39,6 +39,11 @@ __all__ = (
     "EmailAlreadyExistsException",
     "LegalRepresentativeNotFoundException",
     "LegalRepresentativeAlreadyExistsException",
+    "QueryExecutionError",
+    "QuerySyntaxError",
+    "DatabaseConnectionError",
+    "InsufficientPrivilegeError",
+    "QueryTimeoutError",
 )
 
 
@@ -159,3 +164,27 @@ def get_exception_responses(*args: type[BaseAPIException]) -> dict:
     for cls in args:
         responses.update(cls.response_model())
     return responses
+
+
+class QueryExecutionError(Exception):
+    """Base class for query execution errors."""
+
+
+class QuerySyntaxError(QueryExecutionError):
+    """Raised when there is a syntax error in the SQL query."""
+
+
+class DatabaseConnectionError(QueryExecutionError):
+    """Raised when the connection to the database fails."""
+
+
+class InsufficientPrivilegeError(QueryExecutionError):
+    """Raised when the user lacks the necessary privileges to execute the query."""
+
+
+class QueryTimeoutError(QueryExecutionError):
+    """Raised when the query is cancelled by the statement timeout."""
+
+
+class ResultTooLargeError(QueryExecutionError):
+    """Raised when a JSON result without a limit or pagination exceeds the row cap."""
@@ -1,63 +1,164 @@
-"""OpenTelemetry logging middleware for FastAPI."""
+"""OpenTelemetry tracing middleware and metrics setup for FastAPI."""
 
-from collections.abc import Awaitable, Callable
+import random
 
 import jwt
-from fastapi import Request, Response
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from starlette.datastructures import URL, Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-provider = TracerProvider(resource=Resource.create({"service.name": "mensa-api"}))
-otlp_exporter = OTLPSpanExporter(endpoint="http://jaeger:4317", insecure=True)
-processor = BatchSpanProcessor(otlp_exporter)
+from .resources import lazy_resource
+from .settings import get_settings
 
-provider.add_span_processor(processor)
 
-trace.set_tracer_provider(provider)
-tracer = trace.get_tracer(__name__)
+@lazy_resource("otel_tracer")
+def get_tracer() -> trace.Tracer:
+    """Set up the OTLP exporter and tracer provider on first use."""
+    provider = TracerProvider(resource=Resource.create({"service.name": "mensa-api"}))
+    otlp_exporter = OTLPSpanExporter(endpoint="http://jaeger:4317", insecure=True)
+    processor = BatchSpanProcessor(otlp_exporter)
 
+    provider.add_span_processor(processor)
 
-async def otel_logging_middleware(
-    request: Request, call_next: Callable[[Request], Awaitable[Response]]
-) -> Response:
-    """Middleware to log request and response payloads."""
-    firebase_token: str = request.headers.get("Authorization", "")
-    req_body: bytes = await request.body()
-    with tracer.start_as_current_span("http-request") as span:
-        span.set_attribute("http.method", request.method)
-        span.set_attribute("http.url", str(request.url))
-        if firebase_token:
-            token: str = (
-                firebase_token[7:] if firebase_token.startswith("Bearer ") else firebase_token
+    trace.set_tracer_provider(provider)
+    return trace.get_tracer(__name__)
+
+
+@lazy_resource("otel_meter_provider", on_startup=True)
+def get_meter_provider() -> MeterProvider | None:
+    """
+    Export the metrics recorded through the OpenTelemetry API (e.g. the DB pool metrics in
+    ``dbs``) to ``otel_metrics_endpoint``. Metrics are no-ops when it is not configured.
+    """
+    endpoint = get_settings().otel_metrics_endpoint
+    if not endpoint:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
+        OTLPMetricExporter,
+    )
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+    reader = PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=endpoint, insecure=True))
+    provider = MeterProvider(
+        resource=Resource.create({"service.name": "mensa-api"}), metric_readers=[reader]
+    )
+    metrics.set_meter_provider(provider)
+    return provider
+
+
+# Content types whose payloads are readable enough to attach to spans.
+TEXT_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded", "text/", "+json")
+
+
+def _is_text(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return any(
+        content_type.startswith(prefix) or content_type.endswith(prefix)
+        for prefix in TEXT_CONTENT_TYPES
+    )
+
+
+class _PayloadTee:
+    """Keeps a copy of the first ``limit`` bytes of a streamed body, and its total size."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.head = bytearray()
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        if len(self.head) < self.limit:
+            self.head += chunk[: self.limit - len(self.head)]
+        self.size += len(chunk)
+
+    def attach(self, span: trace.Span, name: str) -> None:
+        span.set_attribute(name, self.head.decode("utf-8", errors="replace"))
+        span.set_attribute(f"{name}.size", self.size)
+        if self.size > self.limit:
+            span.set_attribute(f"{name}.truncated", True)
+
+
+class OtelLoggingMiddleware:
+    """
+    ASGI middleware tracing each HTTP request, with a sample of its payloads.
+
+    Request and response bodies are streamed through untouched; only the first
+    ``otel_payload_max_bytes`` of text bodies (JSON, forms, text) are copied aside, so
+    binary downloads and large bodies are never buffered. The copies are attached to the
+    span for a sample of requests: ``otel_payload_route_sample_rates`` overrides
+    ``otel_payload_sample_rate`` per route template, and responses with a status of 500 or
+    more are sampled at ``otel_payload_error_sample_rate``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _should_capture(route: str | None, status: int) -> bool:
+        settings = get_settings()
+        if status >= 500:
+            rate = settings.otel_payload_error_sample_rate
+        else:
+            rate = settings.otel_payload_route_sample_rates.get(
+                route or "", settings.otel_payload_sample_rate
             )
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = get_settings().otel_payload_max_bytes
+        headers = Headers(scope=scope)
+        request_tee = _PayloadTee(limit) if _is_text(headers.get("content-type", "")) else None
+        response_tee: _PayloadTee | None = None
+        status = 500
+
+        async def tee_receive() -> Message:
+            message = await receive()
+            if request_tee is not None and message["type"] == "http.request":
+                request_tee.feed(message.get("body", b""))
+            return message
+
+        async def tee_send(message: Message) -> None:
+            nonlocal response_tee, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = Headers(raw=message.get("headers", []))
+                if _is_text(response_headers.get("content-type", "")):
+                    response_tee = _PayloadTee(limit)
+            elif message["type"] == "http.response.body" and response_tee is not None:
+                response_tee.feed(message.get("body", b""))
+            await send(message)
+
+        with get_tracer().start_as_current_span("http-request") as span:
+            span.set_attribute("http.method", scope["method"])
+            span.set_attribute("http.url", str(URL(scope=scope)))
+            firebase_token = headers.get("Authorization", "")
+            if firebase_token:
+                token = firebase_token.removeprefix("Bearer ")
+                try:
+                    decoded: dict = jwt.decode(token, options={"verify_signature": False})
+                    span.set_attribute("firebase.email", decoded.get("email", "unknown"))
+                except jwt.InvalidTokenError as e:
+                    span.set_attribute("firebase.decode_error", str(e))
             try:
-                decoded: dict = jwt.decode(token, options={"verify_signature": False})
-                email: str = decoded.get("email", "unknown")
-                span.set_attribute("firebase.email", email)
-            except jwt.InvalidTokenError as e:
-                span.set_attribute("firebase.decode_error", str(e))
-        try:
-            payload: str = req_body.decode("utf-8")
-            span.set_attribute("request.payload", payload)
-        except UnicodeDecodeError:
-            span.set_attribute("request.payload", str(req_body))
-        response: Response = await call_next(request)
-        resp_body: bytes = b""
-        if hasattr(response, "body_iterator"):
-            async for chunk in response.body_iterator:
-                resp_body += chunk
-            response = Response(
-                content=resp_body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-            )
-        elif hasattr(response, "body"):
-            if isinstance(response.body, bytes):
-                resp_body = response.body
-            else:
-                resp_body = str(response.body).encode("utf-8")
-        span.set_attribute("response.payload", resp_body.decode("utf-8", errors="replace"))
-        return response
+                await self.app(scope, tee_receive, tee_send)
+            finally:
+                # The router stores the matched route in the scope.
+                route = getattr(scope.get("route"), "path", None)
+                span.set_attribute("http.status_code", status)
+                if route:
+                    span.set_attribute("http.route", route)
+                if self._should_capture(route, status):
+                    if request_tee is not None:
+                        request_tee.attach(span, "request.payload")
+                    if response_tee is not None:
+                        response_tee.attach(span, "response.payload")
@@ -5,13 +5,12 @@ Methods to interact with the database
 """
 
 # # Package # #
-import json
-import re
 from datetime import date, datetime
 
 from fastapi import HTTPException
 from sqlalchemy import text
-from sqlmodel import Session, func, or_, select, union_all, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import func, or_, select, union_all, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.database.models.models import (
@@ -23,7 +22,7 @@ from people_api.database.models.models import (
     Registration,
 )
 
-from .dbs import firebase_collection
+from .dbs import get_firebase_collection
 from .exceptions import (
     AddressNotFoundException,
     EmailNotFoundException,
@@ -37,18 +36,40 @@ from .models import (
     FirebaseMemberRead,
     LegalRepresentative,
     Phone,
+    PostgresMemberRead,
     PostgresMemberRegistration,
 )
-from .utils import CustomJSONEncoder
 
 __all__ = ["MemberRepository"]
 
+MEMBER_PROFILE_QUERY = text("""
+    SELECT
+        to_jsonb(r) AS member,
+        (SELECT coalesce(jsonb_agg(to_jsonb(a) ORDER BY a.address_id), '[]')
+            FROM addresses a WHERE a.registration_id = r.registration_id) AS addresses,
+        (SELECT coalesce(jsonb_agg(to_jsonb(p) ORDER BY p.phone_id), '[]')
+            FROM phones p WHERE p.registration_id = r.registration_id) AS phones,
+        (SELECT coalesce(jsonb_agg(to_jsonb(e) ORDER BY e.email_id), '[]')
+            FROM emails e WHERE e.registration_id = r.registration_id) AS emails,
+        (SELECT coalesce(jsonb_agg(to_jsonb(l) ORDER BY l.representative_id), '[]')
+            FROM legal_representatives l
+            WHERE l.registration_id = r.registration_id) AS legal_representatives
+    FROM registration r
+    WHERE r.registration_id = :mb
+""").columns(
+    member=JSONB,
+    addresses=JSONB,
+    phones=JSONB,
+    emails=JSONB,
+    legal_representatives=JSONB,
+)
+
 
 class MemberRepository:
     @staticmethod
-    def setPronounsOnPostgres(mb: int, pronouns: str, session: Session) -> bool:
+    async def setPronounsOnPostgres(mb: int, pronouns: str, session: AsyncSession) -> bool:
         query = text("""UPDATE registration SET pronouns = :pronouns WHERE registration_id = :mb""")
-        session.execute(query, {"pronouns": pronouns, "mb": mb})
+        await session.execute(query, {"pronouns": pronouns, "mb": mb})
         return True
 
     @staticmethod
@@ -70,8 +91,6 @@ class MemberRepository:
                 - ((today.month, today.day) < (birth_date.month, birth_date.day))
             )
 
-            should_show_RJB_groups_in_app = False
-
             if age < 10:
                 user_classification = "MJB"
             elif 10 <= age < 18:
@@ -79,76 +98,22 @@ class MemberRepository:
             else:
                 user_classification = "MB"
 
-            if user_classification in ("MJB", "JB"):
-                legal_representatives = (
-                    await session.exec(
-                        LegalRepresentatives.get_legal_representatives_for_member(
-                            member_id=registration.registration_id
-                        )
+            should_show_RJB_groups_in_app = (
+                await session.exec(
+                    LegalRepresentatives.select_should_show_legal_rep_groups(
+                        registration_id=registration.registration_id,
+                        is_junior=user_classification != "MB",
                     )
-                ).all()
-                legal_rep_mensans = []
-                for legal_rep in legal_representatives:
-                    legal_mensan = (
-                        await session.exec(
-                            Registration.get_registration_by_last_8_phone_digits(legal_rep.phone)
-                        )
-                    ).first()
-                    if legal_mensan:
-                        legal_rep_mensans.append(legal_mensan)
-                if len(legal_rep_mensans) < len(legal_representatives):
-                    should_show_RJB_groups_in_app = True
-
-            if user_classification == "MB":
-                member_phones = (
-                    await session.exec(
-                        Phones.select_stmt_by_registration_id(registration.registration_id)
-                    )
-                ).all()
-                for phone in member_phones:
-                    legal_rep_correspondence = (
-                        await session.exec(
-                            select(LegalRepresentatives).where(
-                                LegalRepresentatives.phone == phone.phone_number
-                            )
-                        )
-                    ).first()
-                    if legal_rep_correspondence:
-                        should_show_RJB_groups_in_app = True
-
-            all_groups = (await session.exec(select(GroupList))).all()
-            result_list = []
-
-            for group in all_groups:
-                name = group.group_name
-                group_id = group.group_id
-
-                if re.search(r"^M[\s\.]*JB", name, re.IGNORECASE):
-                    group_classification = "MJB"
-                elif re.search(r"^R[\s\.]*JB", name, re.IGNORECASE):
-                    group_classification = "RJB"
-                elif re.search(r"^(?!R[\s\.]*JB)(?!M[\s\.]*JB)JB", name, re.IGNORECASE):
-                    group_classification = "JB"
-                elif re.search(r"^OrgMB", name, re.IGNORECASE):
-                    group_classification = "OrgMB"
-                elif re.search(r"^MB", name, re.IGNORECASE) or re.search(
-                    r"^Mensa", name, re.IGNORECASE
-                ):
-                    group_classification = "MB"
-                else:
-                    group_classification = "NotMensa"
-
-                if should_show_RJB_groups_in_app and group_classification == "RJB":
-                    result_list.append({"group_id": group_id, "group_name": name})
-                if user_classification == "MJB" and group_classification == "MJB":
-                    result_list.append({"group_id": group_id, "group_name": name})
-                elif user_classification == "JB" and group_classification == "JB":
-                    result_list.append({"group_id": group_id, "group_name": name})
-                elif user_classification == "MB" and group_classification == "MB":
-                    result_list.append({"group_id": group_id, "group_name": name})
-
-            result_list = sorted(result_list, key=lambda x: x["group_name"])
-            return result_list
+                )
+            ).one()
+
+            classifications = [user_classification]
+            if should_show_RJB_groups_in_app:
+                classifications.append("RJB")
+            groups = (
+                await session.exec(GroupList.select_by_classifications(classifications))
+            ).all()
+            return [{"group_id": group_id, "group_name": name} for group_id, name in groups]
 
         except Exception as e:
             raise HTTPException(
@@ -353,11 +318,11 @@ class MemberRepository:
         return []
 
     @staticmethod
-    def getMissingFieldsFromPostgres(mb: int, session: Session) -> list:
+    async def getMissingFieldsFromPostgres(mb: int, session: AsyncSession) -> list:
         query = text(
             """SELECT registration_id, cpf, birth_date FROM registration WHERE registration_id = :mb"""
         )
-        result = session.execute(query, {"mb": mb})
+        result = await session.execute(query, {"mb": mb})
         data = result.fetchone()
         if data:
             missing_fields = []
@@ -370,21 +335,21 @@ class MemberRepository:
             raise PersonNotFoundException(mb)
 
     @staticmethod
-    def setBirthDateOnPostgres(mb: int, birthdate: date, session: Session):
+    async def setBirthDateOnPostgres(mb: int, birthdate: date, session: AsyncSession):
         query = text(
             """UPDATE registration SET birth_date = :birthdate WHERE registration_id = :mb"""
         )
-        session.execute(query, {"birthdate": birthdate, "mb": mb})
+        await session.execute(query, {"birthdate": birthdate, "mb": mb})
         return True
 
     @staticmethod
-    def setCPFOnPostgres(mb: int, cpf: str, session: Session):
+    async def setCPFOnPostgres(mb: int, cpf: str, session: AsyncSession):
         query = text("""UPDATE registration SET cpf = :cpf WHERE registration_id = :mb""")
-        session.execute(query, {"cpf": cpf, "mb": mb})
+        await session.execute(query, {"cpf": cpf, "mb": mb})
         return True
 
     @staticmethod
-    def addAddressToPostgres(mb: int, address: Address, session: Session):
+    async def addAddressToPostgres(mb: int, address: Address, session: AsyncSession):
         query = text("""INSERT INTO addresses (registration_id, state, city, address, neighborhood, zip)
                     VALUES (:registration_id, :state, :city, :address, :neighborhood, :zip)""")
         data = {
@@ -395,15 +360,15 @@ class MemberRepository:
             "neighborhood": address.neighborhood,
             "zip": address.zip,
         }
-        session.execute(query, data)
+        await session.execute(query, data)
         return True
 
     @staticmethod
-    def addEmailToPostgres(mb: int, email: Email, session: Session):
+    async def addEmailToPostgres(mb: int, email: Email, session: AsyncSession):
         query = text(
             """INSERT INTO emails (registration_id, email_type, email_address) VALUES (:registration_id, :email_type, :email_address)"""
         )
-        session.execute(
+        await session.execute(
             query,
             {
                 "registration_id": mb,
@@ -414,20 +379,20 @@ class MemberRepository:
         return True
 
     @staticmethod
-    def addPhoneToPostgres(mb: int, phone: Phone, session: Session):
+    async def addPhoneToPostgres(mb: int, phone: Phone, session: AsyncSession):
         query = text(
             """INSERT INTO phones (registration_id, phone_number) VALUES (:registration_id, :phone_number)"""
         )
-        session.execute(query, {"registration_id": mb, "phone_number": phone.phone_number})
+        await session.execute(query, {"registration_id": mb, "phone_number": phone.phone_number})
         return True
 
     @staticmethod
-    def addLegalRepresentativeToPostgres(
-        mb: int, legal_representative: LegalRepresentative, session: Session
+    async def addLegalRepresentativeToPostgres(
+        mb: int, legal_representative: LegalRepresentative, session: AsyncSession
     ):
         query = text("""INSERT INTO legal_representatives (registration_id, cpf, full_name, email, phone, alternative_phone, observations)
                        VALUES (:registration_id, :cpf, :full_name, :email, :phone, :alternative_phone, :observations)""")
-        session.execute(
+        await session.execute(
             query,
             {
                 "registration_id": mb,
@@ -442,11 +407,11 @@ class MemberRepository:
         return True
 
     @staticmethod
-    def deleteAddressFromPostgres(mb: int, address_id: int, session: Session):
+    async def deleteAddressFromPostgres(mb: int, address_id: int, session: AsyncSession):
         query = text(
             "DELETE FROM addresses WHERE registration_id = :mb AND address_id = :address_id RETURNING address_id"
         )
-        result = session.execute(query, {"mb": mb, "address_id": address_id})
+        result = await session.execute(query, {"mb": mb, "address_id": address_id})
         deleted_row = result.fetchone()
         if deleted_row:
             return True
@@ -454,11 +419,11 @@ class MemberRepository:
             raise AddressNotFoundException(str(address_id))
 
     @staticmethod
-    def deleteEmailFromPostgres(mb: int, email_id: int, session: Session):
+    async def deleteEmailFromPostgres(mb: int, email_id: int, session: AsyncSession):
         query = text(
             "DELETE FROM emails WHERE registration_id = :mb AND email_id = :email_id RETURNING email_id"
         )
-        result = session.execute(query, {"mb": mb, "email_id": email_id})
+        result = await session.execute(query, {"mb": mb, "email_id": email_id})
         deleted_row = result.fetchone()
         if deleted_row:
             return True
@@ -466,11 +431,11 @@ class MemberRepository:
             raise EmailNotFoundException(str(email_id))
 
     @staticmethod
-    def deletePhoneFromPostgres(mb: int, phone_id: int, session: Session):
+    async def deletePhoneFromPostgres(mb: int, phone_id: int, session: AsyncSession):
         query = text(
             "DELETE FROM phones WHERE registration_id = :mb AND phone_id = :phone_id RETURNING phone_id"
         )
-        result = session.execute(query, {"mb": mb, "phone_id": phone_id})
+        result = await session.execute(query, {"mb": mb, "phone_id": phone_id})
         deleted_row = result.fetchone()
         if deleted_row:
             return True
@@ -478,11 +443,13 @@ class MemberRepository:
             raise PhoneNotFoundException(str(phone_id))
 
     @staticmethod
-    def deleteLegalRepresentativeFromPostgres(mb: int, legal_rep_id: int, session: Session):
+    async def deleteLegalRepresentativeFromPostgres(
+        mb: int, legal_rep_id: int, session: AsyncSession
+    ):
         query = text(
             "DELETE FROM legal_representatives WHERE registration_id = :mb AND representative_id = :legal_rep_id RETURNING representative_id"
         )
-        result = session.execute(query, {"mb": mb, "legal_rep_id": legal_rep_id})
+        result = await session.execute(query, {"mb": mb, "legal_rep_id": legal_rep_id})
         deleted_row = result.fetchone()
         if deleted_row:
             return True
@@ -490,7 +457,9 @@ class MemberRepository:
             raise LegalRepresentativeNotFoundException(str(legal_rep_id))
 
     @staticmethod
-    def updateAddressInPostgres(mb: int, address_id: int, new_address: Address, session: Session):
+    async def updateAddressInPostgres(
+        mb: int, address_id: int, new_address: Address, session: AsyncSession
+    ):
         query = text("""
                 UPDATE addresses
                 SET state = :state, city = :city, address = :address, neighborhood = :neighborhood, zip = :zip
@@ -506,12 +475,14 @@ class MemberRepository:
             "address_id": address_id,
         }
 
-        session.execute(query, data)
+        await session.execute(query, data)
 
         return True
 
     @staticmethod
-    def updateEmailInPostgres(mb: int, email_id: int, new_email: Email, session: Session):
+    async def updateEmailInPostgres(
+        mb: int, email_id: int, new_email: Email, session: AsyncSession
+    ):
         query = text("""
                 UPDATE emails
                 SET email_type = :email_type, email_address = :email_address
@@ -524,12 +495,14 @@ class MemberRepository:
             "email_id": email_id,
         }
 
-        session.execute(query, data)
+        await session.execute(query, data)
 
         return True
 
     @staticmethod
-    def updatePhoneInPostgres(mb: int, phone_id: int, new_phone: Phone, session: Session):
+    async def updatePhoneInPostgres(
+        mb: int, phone_id: int, new_phone: Phone, session: AsyncSession
+    ):
         query = text("""
                 UPDATE phones
                 SET phone_number = :phone_number
@@ -537,13 +510,13 @@ class MemberRepository:
             """)
         data = {"phone_number": new_phone.phone_number, "mb": mb, "phone_id": phone_id}
 
-        session.execute(query, data)
+        await session.execute(query, data)
 
         return True
 
     @staticmethod
-    def updateLegalRepresentativeInPostgres(
-        mb: int, legal_rep_id: int, new_legal_rep: LegalRepresentative, session: Session
+    async def updateLegalRepresentativeInPostgres(
+        mb: int, legal_rep_id: int, new_legal_rep: LegalRepresentative, session: AsyncSession
     ):
         query = text("""
                 UPDATE legal_representatives
@@ -561,54 +534,27 @@ class MemberRepository:
             "legal_rep_id": legal_rep_id,
         }
 
-        session.execute(query, data)
+        await session.execute(query, data)
 
         return True
 
     @staticmethod
-    def getAllMemberDataFromPostgres(
-        mb: int, session: Session
-    ) -> str:  # Return type changed to str
-        # Retrieve information from the database
-        address = MemberRepository.getAddressesFromPostgres(mb, session)
-        phone = MemberRepository.getPhonesFromPostgres(mb, session)
-        email = MemberRepository.getEmailsFromPostgres(mb, session)
-        member_data = MemberRepository.getFromPostgres(mb, session)
-        legal_representatives = MemberRepository.getLegalRepresentativesFromPostgres(mb, session)
+    async def getAllMemberDataFromPostgres(mb: int, session: AsyncSession) -> PostgresMemberRead:
+        """Retrieve a member with their addresses, phones, emails and legal representatives.
 
-        # Convert Address objects to dictionaries
-        address_data = [address.__dict__ for address in address]
-
-        # Convert Phone objects to dictionaries
-        phone_data = [phone.__dict__ for phone in phone]
-
-        # Convert Email objects to dictionaries
-        email_data = [email.__dict__ for email in email]
-
-        legal_representatives_data = [
-            legal_representative.__dict__ for legal_representative in legal_representatives
-        ]
-
-        # Create a dictionary to store the information
-        member_info = {
-            "addresses": address_data,
-            "phones": phone_data,
-            "emails": email_data,
-            "member": member_data.__dict__,
-            "legal_representatives": legal_representatives_data,
-        }
-
-        # Convert the dictionary to a JSON string
-        json_data = json.dumps(member_info, cls=CustomJSONEncoder)
-
-        # Return the JSON string
-        return json_data
+        Everything is aggregated into JSON by Postgres, so this is a single round-trip.
+        """
+        result = await session.execute(MEMBER_PROFILE_QUERY, {"mb": mb})
+        data = result.mappings().first()
+        if data is None:
+            raise PersonNotFoundException(mb)
+        return PostgresMemberRead(**data)
 
     @staticmethod
-    def getFromPostgres(member_id: int, session: Session) -> PostgresMemberRegistration:
+    async def getFromPostgres(member_id: int, session: AsyncSession) -> PostgresMemberRegistration:
         """Retrieve a single Member by its unique id"""
         query = text("""SELECT * FROM registration WHERE "registration_id" = :member_id""")
-        result = session.execute(query, {"member_id": member_id})
+        result = await session.execute(query, {"member_id": member_id})
         data = result.fetchone()
         if data:
             return PostgresMemberRegistration(**data._mapping)
@@ -616,20 +562,20 @@ class MemberRepository:
             raise PersonNotFoundException(member_id)
 
     @staticmethod
-    def getAddressesFromPostgres(
-        member_id: int, session: Session
+    async def getAddressesFromPostgres(
+        member_id: int, session: AsyncSession
     ) -> list[Address]:  # Return type updated
         query = text("""SELECT * FROM addresses WHERE "registration_id" = :member_id""")
-        result = session.execute(query, {"member_id": member_id})
+        result = await session.execute(query, {"member_id": member_id})
         data = result.fetchall()
         if data:
             return [Address(**address._asdict()) for address in data]
         return []
 
     @staticmethod
-    def getPhonesFromPostgres(member_id: int, session: Session) -> list[Phone]:
+    async def getPhonesFromPostgres(member_id: int, session: AsyncSession) -> list[Phone]:
         query = text("""SELECT * FROM phones WHERE "registration_id" = :member_id""")
-        result = session.execute(query, {"member_id": member_id})
+        result = await session.execute(query, {"member_id": member_id})
         data = result.fetchall()
 
         if data:
@@ -639,13 +585,13 @@ class MemberRepository:
         return []
 
     @staticmethod
-    def updateProfessionAndFacebookOnPostgres(
-        member_id: int, profession: str, facebook: str, session: Session
+    async def updateProfessionAndFacebookOnPostgres(
+        member_id: int, profession: str, facebook: str, session: AsyncSession
     ):
         query = text(
             """UPDATE registration SET profession = :profession, facebook = :facebook WHERE registration_id = :member_id"""
         )
-        session.execute(
+        await session.execute(
             query,
             {"profession": profession, "facebook": facebook, "member_id": member_id},
         )
@@ -653,22 +599,22 @@ class MemberRepository:
         return True
 
     @staticmethod
-    def getEmailsFromPostgres(
-        member_id: int, session: Session
+    async def getEmailsFromPostgres(
+        member_id: int, session: AsyncSession
     ) -> list[Email]:  # Return type updated
         query = text("""SELECT * FROM emails WHERE "registration_id" = :member_id""")
-        result = session.execute(query, {"member_id": member_id})
+        result = await session.execute(query, {"member_id": member_id})
         data = result.fetchall()
         if data:
             return [Email(**email._mapping) for email in data]
         return []
 
     @staticmethod
-    def getLegalRepresentativesFromPostgres(
-        member_id: int, session: Session
+    async def getLegalRepresentativesFromPostgres(
+        member_id: int, session: AsyncSession
     ) -> list[LegalRepresentative]:
         query = text("""SELECT * FROM legal_representatives WHERE "registration_id" = :member_id""")
-        result = session.execute(query, {"member_id": member_id})
+        result = await session.execute(query, {"member_id": member_id})
         data = result.mappings().all()  # fetch all rows as dict-like mappings
 
         if data:
@@ -677,9 +623,9 @@ class MemberRepository:
         return []
 
     @staticmethod
-    def getMBByEmail(email: str, session: Session) -> int:
+    async def getMBByEmail(email: str, session: AsyncSession) -> int:
         query = text("""SELECT "registration_id" FROM emails WHERE "email_address" = :email""")
-        result = session.execute(query, {"email": email})
+        result = await session.execute(query, {"email": email})
         data = result.fetchone()
         if data:
             return data[0]
@@ -689,7 +635,7 @@ class MemberRepository:
     @staticmethod
     def getFromFirebase(member_id: int) -> FirebaseMemberRead:
         """Retrieve a single Member by its unique id"""
-        document = firebase_collection.document(str(member_id)).get()
+        document = get_firebase_collection().document(str(member_id)).get()
 
         if document.exists:
             data = document.to_dict()
@@ -701,7 +647,7 @@ class MemberRepository:
     @staticmethod
     def getFromFirebaseByEmail(email: str) -> FirebaseMemberRead:
         """Retrieve a single Member by its unique email"""
-        documents = firebase_collection.where("email", "==", email).get()
+        documents = get_firebase_collection().where("email", "==", email).get()
         if len(documents) > 0:
             data = documents[0].to_dict()
             data["updated_at"] = data["updated_at"].date()
@@ -0,0 +1,111 @@
+"""RESOURCES
+Registry of lazily initialized, process-wide resources (DB engines, Firebase, keys, assets).
+
+Nothing here runs at import time. Each resource is built on first use, or eagerly during
+FastAPI startup through ``lifespan``, and the time spent building it is recorded so that
+slow dependencies show up in the startup logs.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import TypeVar
+
+from fastapi import FastAPI
+
+T = TypeVar("T")
+
+_factories: dict[str, Callable[[], object]] = {}
+_startup: list[str] = []
+_timings: dict[str, float] = {}
+_lock = threading.RLock()
+
+
+def lazy_resource(name: str, *, on_startup: bool = False):
+    """
+    Register a zero-argument factory as a named resource built once, on first call.
+
+    Resources flagged ``on_startup`` are warmed up by the API ``lifespan`` so the first
+    request does not pay for them; CLI entrypoints only build what they actually touch.
+    """
+
+    def decorator(factory: Callable[[], T]) -> Callable[[], T]:
+        sentinel = object()
+        value: object = sentinel
+
+        @wraps(factory)
+        def getter() -> T:
+            nonlocal value
+            if value is sentinel:
+                with _lock:
+                    if value is sentinel:
+                        start = time.perf_counter()
+                        value = factory()
+                        _timings[name] = (time.perf_counter() - start) * 1000
+                        logging.info("[RESOURCES] Initialized %s in %.1fms", name, _timings[name])
+            return value  # type: ignore[return-value]
+
+        def cache_clear() -> None:
+            nonlocal value
+            with _lock:
+                value = sentinel
+                _timings.pop(name, None)
+
+        getter.cache_clear = cache_clear  # type: ignore[attr-defined]
+        _factories[name] = getter
+        if on_startup:
+            _startup.append(name)
+        return getter
+
+    return decorator
+
+
+def get_resource_timings() -> dict[str, float]:
+    """Return the init time, in milliseconds, of every resource built so far."""
+    return dict(_timings)
+
+
+def init_startup_resources() -> dict[str, float]:
+    """Build every resource registered with ``on_startup`` and return their init timings."""
+    for name in _startup:
+        _factories[name]()
+    return {name: _timings[name] for name in _startup if name in _timings}
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Warm up the API resources on startup and release pools and workers on shutdown."""
+    # Imported here so that the modules registering startup resources are loaded first.
+    # pylint: disable-next=import-outside-toplevel
+    from . import auth, dbs, otel_middleware  # noqa: F401
+    from .services.authorization_status_cache import (  # pylint: disable=import-outside-toplevel
+        AuthorizationStatusCache,
+    )
+    from .services.certificate_renderer import (  # pylint: disable=import-outside-toplevel
+        CertificateRenderer,
+    )
+    from .services.email_sending_service import (  # pylint: disable=import-outside-toplevel
+        EmailSendingService,
+    )
+    from .services.whatsapp_service.chatbot.message_queue import (  # pylint: disable=import-outside-toplevel
+        ChatbotMessageQueue,
+    )
+
+    start = time.perf_counter()
+    timings = init_startup_resources()
+    logging.info(
+        "[RESOURCES] Startup resources ready in %.1fms: %s",
+        (time.perf_counter() - start) * 1000,
+        ", ".join(f"{name}={ms:.1f}ms" for name, ms in timings.items()),
+    )
+    AuthorizationStatusCache.start()
+    ChatbotMessageQueue.start()
+    yield
+    await ChatbotMessageQueue.stop()
+    await dbs.dispose_engines()
+    await AuthorizationStatusCache.close()
+    CertificateRenderer.shutdown()
+    EmailSendingService.close_pool()
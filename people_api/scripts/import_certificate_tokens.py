@@ -0,0 +1,91 @@
+"""Module to import the certificate tokens of members from Firestore into Postgres."""
+
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+
+from sqlmodel import Session, col, select
+
+from people_api.database.models.models import CertificateTokens, Registration
+from people_api.dbs import get_engine, get_firebase_collection
+
+FIRESTORE_FIELDS = ["MB", "CertificateToken", "display_name", "expiration_date"]
+
+
+@dataclass
+class ImportStats:
+    """Counters for an import run."""
+
+    read: int = 0
+    imported: int = 0
+    skipped: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def report(self) -> str:
+        """Return a one-line summary of the run."""
+        elapsed = time.perf_counter() - self.started_at
+        return (
+            f"Read {self.read}, imported {self.imported}, skipped {self.skipped} in {elapsed:.1f}s"
+        )
+
+
+def stream_firestore_members() -> Iterator[dict]:
+    """Yield the certificate fields of every member document in Firestore."""
+    collection = get_firebase_collection()
+    if collection is None:
+        return
+    for document in collection.select(FIRESTORE_FIELDS).stream():
+        yield document.to_dict()
+
+
+def _to_row(member: dict) -> dict | None:
+    """Return the ``certificate_tokens`` row of a member document, or None if it has no token."""
+    if not member.get("MB") or not member.get("CertificateToken"):
+        return None
+    expiration_date = member.get("expiration_date")
+    if isinstance(expiration_date, datetime):
+        expiration_date = expiration_date.date()
+    return {
+        "registration_id": int(member["MB"]),
+        "token": member["CertificateToken"],
+        "display_name": member.get("display_name"),
+        "expiration_date": expiration_date,
+    }
+
+
+def import_certificate_tokens(
+    members: Iterable[dict] | None = None, batch_size: int = 500
+) -> ImportStats:
+    """
+    Upsert the certificate tokens of ``members`` (all Firestore members by default).
+
+    Documents without a token, or whose MB has no registration, are skipped.
+    """
+    if members is None:
+        members = stream_firestore_members()
+    stats = ImportStats()
+    documents = iter(members)
+
+    with Session(get_engine()) as session:
+        while batch := list(islice(documents, batch_size)):
+            stats.read += len(batch)
+            rows = {row["registration_id"]: row for row in map(_to_row, batch) if row}
+            existing = set(
+                session.exec(
+                    select(Registration.registration_id).where(
+                        col(Registration.registration_id).in_(rows)
+                    )
+                )
+            )
+            rows = {registration_id: rows[registration_id] for registration_id in existing}
+            if rows:
+                session.exec(CertificateTokens.upsert_stmt(list(rows.values())))  # type: ignore
+                session.commit()
+            stats.imported += len(rows)
+            stats.skipped += len(batch) - len(rows)
+
+    logging.info("Certificate token import finished. %s", stats.report())
+    return stats
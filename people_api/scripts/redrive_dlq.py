@@ -1,48 +1,183 @@
 """Module to redrive messages from a Dead Letter Queue (DLQ) to the main SQS queue."""
 
+import asyncio
 import logging
+import re
+import time
+from dataclasses import dataclass, field
+
+from botocore.exceptions import ClientError
 
 from people_api.services.sqs_handler import get_sqs_settings
 from people_api.utils import get_aws_client
 
+SQS_BATCH_SIZE = 10
+
+
+@dataclass
+class RedriveStats:
+    """Counters for a redrive run."""
+
+    received: int = 0
+    redriven: int = 0
+    skipped: int = 0
+    failed: int = 0
+    claimed: int = field(default=0, repr=False)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started."""
+        return time.perf_counter() - self.started_at
+
+    def report(self, dry_run: bool = False) -> str:
+        """Return a one-line summary of the run, including throughput."""
+        elapsed = self.elapsed
+        action = "would redrive" if dry_run else "redriven"
+        return (
+            f"Received {self.received}, {action} {self.redriven}, skipped {self.skipped}, "
+            f"failed {self.failed} in {elapsed:.1f}s "
+            f"({self.received / elapsed if elapsed else 0:.1f} msg/s)"
+        )
+
+
+async def _redrive_batch(
+    sqs, dlq_url: str, main_url: str, messages: list[dict], stats: RedriveStats
+) -> None:
+    """Send a batch to the main queue, then delete from the DLQ the entries that were sent."""
+    entries = [{"Id": str(i), "MessageBody": m["Body"]} for i, m in enumerate(messages)]
+    try:
+        response = await asyncio.to_thread(
+            sqs.send_message_batch, QueueUrl=main_url, Entries=entries
+        )
+    except ClientError as e:
+        logging.error("Error redriving message batch: %s", e)
+        stats.failed += len(messages)
+        return
+
+    for failure in response.get("Failed", []):
+        logging.error("Failed to redrive message %s: %s", failure["Id"], failure.get("Message"))
+    stats.failed += len(response.get("Failed", []))
 
-async def redrive_dlq_to_sqs():
-    """Redrive messages from the DLQ to the main SQS queue."""
-    sqs = get_aws_client("sqs")
+    sent = [messages[int(entry["Id"])] for entry in response.get("Successful", [])]
+    if not sent:
+        return
+    delete_entries = [
+        {"Id": str(i), "ReceiptHandle": m["ReceiptHandle"]} for i, m in enumerate(sent)
+    ]
+    try:
+        response = await asyncio.to_thread(
+            sqs.delete_message_batch, QueueUrl=dlq_url, Entries=delete_entries
+        )
+    except ClientError as e:
+        # The messages are already on the main queue; they will be redriven again next run.
+        logging.error("Error deleting redriven messages from DLQ: %s", e)
+        stats.redriven += len(sent)
+        return
+    for failure in response.get("Failed", []):
+        logging.error(
+            "Failed to delete message %s from DLQ: %s", failure["Id"], failure.get("Message")
+        )
+    stats.redriven += len(sent)
+
+
+async def _receiver(
+    sqs,
+    dlq_url: str,
+    main_url: str,
+    stats: RedriveStats,
+    *,
+    pattern: re.Pattern | None,
+    dry_run: bool,
+    limit: int | None,
+    wait_time_seconds: int,
+    visibility_timeout: int,
+) -> None:
+    """Drain the DLQ in batches of 10 until a receive comes back empty or ``limit`` is hit."""
+    while limit is None or stats.claimed < limit:
+        max_messages = SQS_BATCH_SIZE
+        if limit is not None:
+            max_messages = min(max_messages, limit - stats.claimed)
+        # Claimed before awaiting so concurrent receivers never overshoot ``limit``.
+        stats.claimed += max_messages
+        try:
+            response = await asyncio.to_thread(
+                sqs.receive_message,
+                QueueUrl=dlq_url,
+                MaxNumberOfMessages=max_messages,
+                WaitTimeSeconds=wait_time_seconds,
+                VisibilityTimeout=visibility_timeout,
+            )
+        except ClientError as e:
+            logging.error("Error receiving from DLQ: %s", e)
+            return
+        messages = response.get("Messages", [])
+        stats.claimed -= max_messages - len(messages)
+        if not messages:
+            return
+        stats.received += len(messages)
+
+        # Skipped messages are left invisible until the visibility timeout expires, so the
+        # run does not receive them again and they stay in the DLQ afterwards.
+        selected = [m for m in messages if pattern is None or pattern.search(m["Body"])]
+        stats.skipped += len(messages) - len(selected)
+        if dry_run:
+            for msg in selected:
+                logging.info("Would redrive message: %s", msg["Body"])
+            stats.redriven += len(selected)
+        elif selected:
+            await _redrive_batch(sqs, dlq_url, main_url, selected, stats)
+
+
+async def redrive_dlq_to_sqs(
+    *,
+    receivers: int = 4,
+    dry_run: bool = False,
+    match: str | None = None,
+    limit: int | None = None,
+    wait_time_seconds: int = 2,
+    visibility_timeout: int = 60,
+    sqs_client=None,
+) -> RedriveStats:
+    """
+    Redrive messages from the DLQ to the main SQS queue.
+
+    ``receivers`` loops drain the DLQ concurrently, each moving up to 10 messages per
+    SendMessageBatch / DeleteMessageBatch pair. Only messages whose body matches the
+    ``match`` regex are redriven; with ``dry_run`` nothing is sent or deleted. Unselected
+    and dry-run messages stay in the DLQ and become visible again after
+    ``visibility_timeout`` seconds.
+    """
+    sqs = sqs_client or get_aws_client("sqs")
     settings = get_sqs_settings()
     dlq_url = sqs.get_queue_url(QueueName=settings.dlq_name)["QueueUrl"]
     main_url = sqs.get_queue_url(QueueName=settings.queue_name)["QueueUrl"]
+    pattern = re.compile(match) if match else None
 
-    logging.info("Starting redrive from DLQ (%s) to main queue (%s)", dlq_url, main_url)
+    logging.info(
+        "Starting %sredrive from DLQ (%s) to main queue (%s) with %d receivers",
+        "dry-run " if dry_run else "",
+        dlq_url,
+        main_url,
+        receivers,
+    )
 
-    while True:
-        response = sqs.receive_message(
-            QueueUrl=dlq_url,
-            MaxNumberOfMessages=10,
-            WaitTimeSeconds=2,
-            VisibilityTimeout=10,
+    stats = RedriveStats()
+    await asyncio.gather(
+        *(
+            _receiver(
+                sqs,
+                dlq_url,
+                main_url,
+                stats,
+                pattern=pattern,
+                dry_run=dry_run,
+                limit=limit,
+                wait_time_seconds=wait_time_seconds,
+                visibility_timeout=visibility_timeout,
+            )
+            for _ in range(receivers)
         )
-        messages = response.get("Messages", [])
-        if not messages:
-            logging.info("No more messages in DLQ.")
-            break
-
-        for msg in messages:
-            try:
-                body = msg["Body"]
-
-                logging.info("Processing message: %s", body)
-
-                sqs.send_message(
-                    QueueUrl=main_url,
-                    MessageBody=body,
-                )
-                logging.info("Redriven message to main queue.")
-
-                sqs.delete_message(
-                    QueueUrl=dlq_url,
-                    ReceiptHandle=msg["ReceiptHandle"],
-                )
-                logging.info("Deleted message from DLQ.")
-            except Exception as e:
-                logging.error("Error redriving message: %s", e)
+    )
+    logging.info("Redrive finished. %s", stats.report(dry_run))
+    return stats
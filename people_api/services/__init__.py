@@ -1,17 +1,44 @@
-import people_api.services.whatsapp_service.chatbot.openai_service as openai_service
-
-from .address_service import AddressService
-from .certificate_service import CertificateService
-from .data_service import DataService
-from .email_service import EmailService
-from .group_service import GroupService
-from .iam_service import IamService
-from .legal_representative_service import LegalRepresentativeService
-from .member_onboarding import MemberOnboardingService
-from .misc_service import MiscService
-from .missing_fields_service import MissingFieldsService
-from .phone_service import PhoneService
-from .workspace_service import WorkspaceService
+"""Service layer.
+
+Services are imported on first access so that entrypoints which only need one of them
+(e.g. the SQS handler) do not load the OpenAI client and every other service at startup.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import people_api.services.whatsapp_service.chatbot.openai_service as openai_service
+
+    from .address_service import AddressService
+    from .certificate_service import CertificateService
+    from .data_service import DataService
+    from .email_service import EmailService
+    from .group_service import GroupService
+    from .iam_service import IamService
+    from .identity_cache import IdentityCache
+    from .legal_representative_service import LegalRepresentativeService
+    from .member_onboarding import MemberOnboardingService
+    from .misc_service import MiscService
+    from .missing_fields_service import MissingFieldsService
+    from .phone_service import PhoneService
+    from .workspace_service import WorkspaceService
+
+_LAZY_IMPORTS = {
+    "AddressService": ".address_service",
+    "CertificateService": ".certificate_service",
+    "DataService": ".data_service",
+    "EmailService": ".email_service",
+    "GroupService": ".group_service",
+    "IamService": ".iam_service",
+    "IdentityCache": ".identity_cache",
+    "LegalRepresentativeService": ".legal_representative_service",
+    "MemberOnboardingService": ".member_onboarding",
+    "MiscService": ".misc_service",
+    "MissingFieldsService": ".missing_fields_service",
+    "PhoneService": ".phone_service",
+    "WorkspaceService": ".workspace_service",
+}
 
 __all__ = [
     "AddressService",
@@ -25,6 +52,18 @@ __all__ = [
     "PhoneService",
     "WorkspaceService",
     "IamService",
+    "IdentityCache",
     "openai_service",
     "MemberOnboardingService",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "openai_service":
+        value = import_module(".whatsapp_service.chatbot.openai_service", __name__)
+    elif name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
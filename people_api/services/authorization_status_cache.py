@@ -0,0 +1,127 @@
+"""Cache of WhatsApp authorization statuses keyed by registration ID."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import asyncpg
+
+from ..dbs import RO_DATABASE_URL
+from ..settings import get_settings
+
+# Notified by triggers on whatsapp_authorization, whatsapp_workers, phones and
+# legal_representatives; the payload is the affected registration ID, or empty when any
+# member may be affected.
+CHANNEL = "whatsapp_authorization_changed"
+LISTENER_RETRY_AFTER_SECONDS = 30
+
+
+class AuthorizationStatusCache:
+    """
+    In-process LRU cache of ``GroupService.get_authorization_status`` results.
+
+    Entries are evicted as soon as Postgres notifies a change on ``CHANNEL``, received over
+    a dedicated LISTEN connection that a background task started with the app keeps open.
+    While that connection is down changes could be missed, so the cache is bypassed.
+    Entries also expire after ``authorization_status_cache_ttl`` seconds as a safety net.
+    """
+
+    _entries: OrderedDict[int, tuple[dict, float]] = OrderedDict()
+    _generation: int = 0
+    _listener: asyncpg.Connection | None = None
+    _listener_task: asyncio.Task | None = None
+
+    @classmethod
+    def _on_change(cls, _connection, _pid, _channel, payload: str) -> None:
+        cls._generation += 1
+        if payload:
+            cls._entries.pop(int(payload), None)
+        else:
+            cls._entries.clear()
+
+    @classmethod
+    def _is_listening(cls) -> bool:
+        """Return whether changes are being listened for, so that entries can be trusted."""
+        return cls._listener is not None and not cls._listener.is_closed()
+
+    @classmethod
+    async def _listen(cls) -> None:
+        """Keep a LISTEN connection open, reconnecting after ``LISTENER_RETRY_AFTER_SECONDS``."""
+        while True:
+            lost = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(RO_DATABASE_URL, timeout=5)
+                await connection.add_listener(CHANNEL, cls._on_change)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                logging.warning("[AUTH-STATUS-CACHE] Could not listen for changes: %s", e)
+                await asyncio.sleep(LISTENER_RETRY_AFTER_SECONDS)
+                continue
+            connection.add_termination_listener(lambda _connection, lost=lost: lost.set())
+            # Entries cached before this listener started may have missed a notification.
+            cls._on_change(None, None, CHANNEL, "")
+            cls._listener = connection
+            try:
+                await lost.wait()
+            finally:
+                cls._listener = None
+                cls._on_change(None, None, CHANNEL, "")
+                if not connection.is_closed():
+                    await connection.close()
+            logging.warning("[AUTH-STATUS-CACHE] LISTEN connection lost, bypassing the cache")
+
+    @classmethod
+    def start(cls) -> None:
+        """Start listening for changes in the background; the cache is bypassed until then."""
+        if cls._listener_task is None or cls._listener_task.done():
+            cls._listener_task = asyncio.create_task(
+                cls._listen(), name="authorization-status-listener"
+            )
+
+    @classmethod
+    async def get(cls, registration_id: int) -> dict | None:
+        """Return the cached authorization status of a member, if any."""
+        if not cls._is_listening():
+            return None
+        entry = cls._entries.get(registration_id)
+        if entry is None:
+            return None
+        status, expires_at = entry
+        if expires_at <= time.monotonic():
+            cls._entries.pop(registration_id, None)
+            return None
+        cls._entries.move_to_end(registration_id)
+        return status
+
+    @classmethod
+    def current_generation(cls) -> int:
+        """Return a counter that is bumped by every change notification."""
+        return cls._generation
+
+    @classmethod
+    async def set(cls, registration_id: int, status: dict, generation: int) -> None:
+        """
+        Cache the authorization status of a member.
+
+        Pass the ``generation`` read before querying the status, so that a change notified
+        while the query ran is not masked by a stale entry.
+        """
+        if not cls._is_listening() or generation != cls._generation:
+            return
+        settings = get_settings()
+        cls._entries[registration_id] = (
+            status,
+            time.monotonic() + settings.authorization_status_cache_ttl,
+        )
+        cls._entries.move_to_end(registration_id)
+        while len(cls._entries) > settings.authorization_status_cache_max_entries:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    async def close(cls) -> None:
+        """Stop listening for changes and drop every cached status."""
+        task, cls._listener_task = cls._listener_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        cls._entries.clear()
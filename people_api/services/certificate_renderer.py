@@ -0,0 +1,126 @@
+"""Rendering of membership certificates in worker processes, with a Redis cache."""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from ..dbs import create_redis_client
+from ..settings import get_settings
+from ..utils import create_certificate, get_certificate_assets
+
+CACHE_KEY_PREFIX = "certificate:"
+REDIS_RETRY_AFTER_SECONDS = 30
+
+
+class CertificateRenderer:
+    """
+    Renders certificates off the event loop and caches them by content.
+
+    Drawing and encoding a full-resolution certificate is CPU-bound, so it runs in a pool
+    of ``certificate_render_workers`` processes (each loading the template and fonts once)
+    instead of threads contending for the GIL. Rendered images are cached in Redis under a
+    hash of everything drawn on them, so repeated downloads on the same day are served
+    without rendering.
+    """
+
+    _executor: ProcessPoolExecutor | None = None
+    _executor_lock = threading.Lock()
+    _redis_client: redis.Redis | None = None
+    _redis_unavailable_until: float = 0.0
+
+    @staticmethod
+    def cache_key(
+        name: str,
+        MB: int,
+        expiration: datetime,
+        issued_on: date,
+        image_format: str,
+        width: int | None,
+    ) -> str:
+        """Return the content-addressed cache key of a rendered certificate."""
+        content = "\x1f".join(
+            str(part) for part in (name, MB, expiration.isoformat(), issued_on, image_format, width)
+        )
+        return CACHE_KEY_PREFIX + hashlib.sha256(content.encode()).hexdigest()
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor | None:
+        """Return the rendering process pool, or None when rendering runs in a thread."""
+        workers = get_settings().certificate_render_workers
+        if workers <= 0:
+            return None
+        with cls._executor_lock:
+            if cls._executor is None:
+                # Workers are spawned rather than forked, so they do not inherit the API's
+                # event loop, threads and connections.
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=get_certificate_assets,
+                )
+            return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the rendering processes, e.g. on shutdown."""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(cancel_futures=True)
+                cls._executor = None
+
+    @classmethod
+    def _get_redis(cls) -> redis.Redis:
+        if time.monotonic() < cls._redis_unavailable_until:
+            raise RedisError("Redis marked unavailable, skipping certificate cache")
+        if cls._redis_client is None:
+            cls._redis_client = create_redis_client(decode_responses=False)
+        return cls._redis_client
+
+    @classmethod
+    def _redis_failed(cls, action: str, error: Exception) -> None:
+        if time.monotonic() >= cls._redis_unavailable_until:
+            logging.warning("[CERTIFICATE] Could not %s: %s", action, error)
+            cls._redis_unavailable_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+    @classmethod
+    async def render(
+        cls,
+        name: str,
+        MB: int,
+        expiration: datetime,
+        image_format: str = "png",
+        width: int | None = None,
+    ) -> bytes:
+        """Return the certificate image issued today, rendering it on a cache miss."""
+        issued_on = date.today()
+        key = cls.cache_key(name, MB, expiration, issued_on, image_format, width)
+        try:
+            cached = await cls._get_redis().get(key)
+        except (RedisError, RuntimeError) as e:
+            cls._redis_failed("read cached certificate", e)
+            cached = None
+        if isinstance(cached, bytes):
+            return cached
+
+        args = (name, MB, expiration, issued_on, image_format, width)
+        executor = cls.get_executor()
+        if executor is None:
+            image = await asyncio.to_thread(create_certificate, *args)
+        else:
+            image = await asyncio.get_running_loop().run_in_executor(
+                executor, create_certificate, *args
+            )
+
+        try:
+            await cls._get_redis().set(key, image, ex=get_settings().certificate_cache_ttl)
+        except (RedisError, RuntimeError) as e:
+            cls._redis_failed("cache certificate", e)
+        return image
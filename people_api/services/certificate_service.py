@@ -3,27 +3,90 @@
 """Service for generating certificates."""
 
 import asyncio
+import hmac
+import logging
+from datetime import datetime, timedelta, timezone
 
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
+from sqlalchemy.exc import IntegrityError
 
+from ..database.models.models import CertificateTokens
+from ..dbs import AsyncSessionsTuple
 from ..repositories import MemberRepository
+from ..settings import get_settings
 from ..static import download_cert
-from ..utils import create_certificate
+from ..utils import CERTIFICATE_FORMATS
+from .certificate_renderer import CertificateRenderer
 
 
 class CertificateService:
     @staticmethod
-    async def generate_certificate(MB: int, key: str):
-        member = MemberRepository.getFromFirebase(MB)
-        if member.CertificateToken != key:
+    async def get_certificate_token(MB: int, sessions: AsyncSessionsTuple) -> CertificateTokens:
+        """
+        Return the certificate token of a member from Postgres.
+
+        Tokens are bulk imported from Firestore by the ``import_certificate_tokens`` job.
+        A member missing from the table, or whose row is older than
+        ``certificate_token_max_age``, is read from Firestore and the row is upserted. If
+        that refresh fails, the stored row is still served.
+        """
+        result = await sessions.ro.exec(CertificateTokens.select_by_registration_id(MB))
+        stored = result.first()
+        max_age = timedelta(seconds=get_settings().certificate_token_max_age)
+        if (
+            stored is not None
+            and stored.updated_at is not None
+            and stored.updated_at > datetime.now(timezone.utc) - max_age
+        ):
+            return stored
+
+        try:
+            member = await asyncio.to_thread(MemberRepository.getFromFirebase, MB)
+            certificate_token = CertificateTokens(
+                registration_id=MB,
+                token=member.CertificateToken or "",
+                display_name=member.display_name,
+                expiration_date=member.expiration_date,
+            )
+            if member.CertificateToken or stored is not None:
+                try:
+                    async with sessions.rw.begin_nested():
+                        await sessions.rw.execute(
+                            CertificateTokens.upsert_stmt([certificate_token.model_dump()])
+                        )
+                except IntegrityError:
+                    logging.warning("[CERTIFICATE] Member %s has no registration, not storing", MB)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if stored is None:
+                raise
+            logging.warning("[CERTIFICATE] Could not refresh the token of member %s: %s", MB, e)
+            return stored
+        return certificate_token
+
+    @staticmethod
+    async def generate_certificate(
+        MB: int,
+        key: str,
+        sessions: AsyncSessionsTuple,
+        image_format: str = "png",
+        width: int | None = None,
+    ):
+        certificate_token = await CertificateService.get_certificate_token(MB, sessions)
+        if not certificate_token.token or not hmac.compare_digest(
+            certificate_token.token.encode(), key.encode()
+        ):
             return {"error": "Chave inválida"}
-        cert = await asyncio.to_thread(
-            create_certificate, member.display_name, MB, member.expiration_date
+        cert = await CertificateRenderer.render(
+            certificate_token.display_name,
+            MB,
+            certificate_token.expiration_date,
+            image_format,
+            width,
         )
-        return StreamingResponse(
+        return Response(
             cert,
-            media_type="image/png",
-            headers={"Content-Disposition": "attachment; filename=certificate.png"},
+            media_type=CERTIFICATE_FORMATS[image_format][1],
+            headers={"Content-Disposition": f"attachment; filename=certificate.{image_format}"},
         )
 
     @staticmethod
@@ -1,18 +1,23 @@
 """Service for handling data requests from the data endpoints."""
 
 from fastapi import HTTPException, Security
+from fastapi.responses import StreamingResponse
 from fastapi.security.api_key import APIKeyHeader
-from sqlmodel import Session
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_403_FORBIDDEN
 
-from people_api.endpoints.errors import (
+from people_api.exceptions import (
     DatabaseConnectionError,
     InsufficientPrivilegeError,
     QueryExecutionError,
     QuerySyntaxError,
+    QueryTimeoutError,
+    ResultTooLargeError,
 )
 
 from ..database.models import QueryRequest, QueryResponse
+from ..database.models.data import STREAM_MEDIA_TYPES
 from ..settings import get_settings
 
 SETTINGS = get_settings()
@@ -21,6 +26,9 @@ API_KEY_NAME = "data_endpoint_token"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 API_KEY = SETTINGS.data_route_api_key
 
+# Streaming formats selected by the Accept header when the request body does not set one
+ACCEPTED_FORMATS = {media_type: name for name, media_type in STREAM_MEDIA_TYPES.items()}
+
 
 def get_api_key(api_key: str = Security(api_key_header)):
     """
@@ -35,12 +43,51 @@ def get_api_key(api_key: str = Security(api_key_header)):
     return API_KEY
 
 
+def negotiate_format(request: QueryRequest, accept: str | None) -> QueryRequest:
+    """Return ``request`` with the first streaming format listed in ``accept``, if any."""
+    if accept is None or "format" in request.model_fields_set:
+        return request
+    for media_range in accept.split(","):
+        file_format = ACCEPTED_FORMATS.get(media_range.split(";")[0].strip())
+        if file_format is not None:
+            return request.model_copy(update={"format": file_format})
+    return request
+
+
 class DataService:
     @staticmethod
-    async def get_data(request: QueryRequest, api_key: str, session: Session):
+    async def get_data(
+        request: QueryRequest,
+        api_key: str,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        accept: str | None = None,
+    ):
+        """
+        Run the query on a read-only session opened from ``sessionmaker``.
+
+        JSON results are returned in one body, with the cursor of the next page when
+        paginating; without ``limit`` or ``order_by`` they are refused with a 413 past
+        ``data_query_max_rows`` rows. NDJSON, CSV, Arrow IPC and Parquet are streamed from
+        the server-side cursor as they are fetched, so the full result is never held in
+        memory; they are chosen by the request's ``format`` or the ``Accept`` header, and
+        the stream closes the session once sent.
+        """
+        request = negotiate_format(request, accept)
+        session = sessionmaker()
+        streaming = False
         try:
-            result = await QueryRequest.execute(request.query, session)
-            return QueryResponse(results=result, status="success")
+            result = await request.execute(session)
+            if request.format != "json":
+                chunks = await request.stream(result, session)
+                streaming = True
+                return StreamingResponse(chunks, media_type=STREAM_MEDIA_TYPES[request.format])
+            rows = await request.fetch(result)
+            return QueryResponse(
+                results=rows, status="success", next_cursor=request.next_cursor(rows)
+            )
+
+        except ResultTooLargeError as rtle:
+            raise HTTPException(status_code=413, detail=str(rtle)) from rtle
 
         except QuerySyntaxError as qse:
             raise HTTPException(status_code=400, detail=str(qse)) from qse
@@ -48,6 +95,9 @@ class DataService:
         except InsufficientPrivilegeError as rote:
             raise HTTPException(status_code=403, detail=str(rote)) from rote
 
+        except QueryTimeoutError as qte:
+            raise HTTPException(status_code=504, detail=str(qte)) from qte
+
         except DatabaseConnectionError as dce:
             raise HTTPException(status_code=503, detail=str(dce)) from dce
 
@@ -58,3 +108,7 @@ class DataService:
             raise HTTPException(
                 status_code=500, detail=f"An unexpected error occurred: {str(e)}"
             ) from e
+
+        finally:
+            if not streaming:
+                await session.close()
@@ -1,40 +1,249 @@
 """Service to send e-mails to members using smtplib."""
 
+import asyncio
 import logging
+import queue
 import smtplib
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from people_api.settings import get_smtp_settings
 
 
+@dataclass
+class EmailMessage:
+    """An HTML e-mail to be sent."""
+
+    to_email: str
+    subject: str
+    html_content: str
+    sender_email: str
+    reply_to: str | None = None
+
+    def as_string(self) -> str:
+        """Render the message as a MIME document."""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = self.subject
+        msg["From"] = self.sender_email
+        msg["To"] = self.to_email
+        if self.reply_to:
+            msg["Reply-To"] = self.reply_to
+        msg.attach(MIMEText(self.html_content, "html"))
+        return msg.as_string()
+
+
+@dataclass
+class FailedEmail:
+    """A message that could not be delivered, with the last error and the attempts made."""
+
+    message: EmailMessage
+    error: Exception
+    attempts: int
+
+
+class EmailDeliveryError(Exception):
+    """Raised when one or more messages could not be delivered after retrying."""
+
+    def __init__(self, failures: list[FailedEmail]):
+        self.failures = failures
+        recipients = ", ".join(failure.message.to_email for failure in failures)
+        super().__init__(
+            f"Failed to send {len(failures)} e-mail(s) to {recipients}: {failures[0].error}"
+        )
+
+
+def _is_transient(error: Exception) -> bool:
+    """Connection problems and 4xx replies are worth retrying; 5xx replies are not."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of connected and authenticated SMTP sessions.
+
+    smtplib is blocking, so sessions are used from worker threads; the pool lets those
+    threads reuse a session (and its STARTTLS handshake and login) across messages
+    instead of reconnecting for each one. At most ``size`` sessions are open at a time.
+    """
+
+    def __init__(self, size: int):
+        self._idle: queue.LifoQueue[tuple[smtplib.SMTP, float]] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @staticmethod
+    def _connect() -> smtplib.SMTP:
+        settings = get_smtp_settings()
+        server = smtplib.SMTP(
+            settings.smtp_server, settings.smtp_port, timeout=settings.smtp_timeout
+        )
+        try:
+            if settings.smtp_starttls:
+                server.starttls()
+            server.login(settings.smtp_username, settings.smtp_password)
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    def _take_idle(self) -> smtplib.SMTP | None:
+        """Return an idle session that has not been unused for too long, if any."""
+        max_idle = get_smtp_settings().smtp_max_idle_seconds
+        while True:
+            try:
+                server, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - released_at < max_idle:
+                return server
+            _quit(server)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """Borrow a session, opening one if none is idle. Broken sessions are discarded."""
+        with self._slots:
+            server = self._take_idle() or self._connect()
+            try:
+                yield server
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                # The session is still usable after a rejected message, unless the server
+                # is closing it (421).
+                if getattr(e, "smtp_code", None) == 421:
+                    _quit(server)
+                else:
+                    self._idle.put((server, time.monotonic()))
+                raise
+            except BaseException:
+                _quit(server)
+                raise
+            self._idle.put((server, time.monotonic()))
+
+    def close(self) -> None:
+        """Close every idle session."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit(server)
+
+
+def _quit(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
 class EmailSendingService:
-    """Service to send e-mails to members using smtplib."""
+    """Service to send e-mails to members over a shared pool of SMTP sessions."""
+
+    _pool: SMTPConnectionPool | None = None
+    _pool_lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls) -> SMTPConnectionPool:
+        """Return the process-wide SMTP session pool, creating it on first use."""
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = SMTPConnectionPool(get_smtp_settings().smtp_pool_size)
+            return cls._pool
+
+    @classmethod
+    def close_pool(cls) -> None:
+        """Close the pooled SMTP sessions, e.g. on shutdown."""
+        with cls._pool_lock:
+            if cls._pool is not None:
+                cls._pool.close()
+                cls._pool = None
+
+    def _send_blocking(self, message: EmailMessage) -> None:
+        with self.get_pool().connection() as server:
+            server.sendmail(message.sender_email, message.to_email, message.as_string())
+        logging.info(
+            "Email sent successfully from %s to %s", message.sender_email, message.to_email
+        )
+
+    async def send_many(self, messages: list[EmailMessage]) -> None:
+        """
+        Send ``messages`` concurrently over the session pool, retrying transient failures.
+
+        Messages that fail with a connection error or a 4xx reply are queued again with
+        exponential backoff, up to ``smtp_max_retries`` times. Every message is attempted
+        before ``EmailDeliveryError`` is raised listing the ones that could not be sent.
+        """
+        if not messages:
+            return
+        settings = get_smtp_settings()
+        pending: asyncio.Queue[tuple[EmailMessage, int]] = asyncio.Queue()
+        for message in messages:
+            pending.put_nowait((message, 1))
+        failures: list[FailedEmail] = []
+        retries: set[asyncio.Task] = set()
+
+        async def retry_later(message: EmailMessage, attempt: int) -> None:
+            await asyncio.sleep(settings.smtp_retry_backoff * 2 ** (attempt - 1))
+            await pending.put((message, attempt + 1))
+            pending.task_done()
 
-    def send_email(
+        async def worker() -> None:
+            while True:
+                message, attempt = await pending.get()
+                try:
+                    await asyncio.to_thread(self._send_blocking, message)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    if _is_transient(e) and attempt <= settings.smtp_max_retries:
+                        logging.warning(
+                            "Retrying email to %s (attempt %d) after error: %s",
+                            message.to_email,
+                            attempt,
+                            e,
+                        )
+                        task = asyncio.create_task(retry_later(message, attempt))
+                        retries.add(task)
+                        task.add_done_callback(retries.discard)
+                        continue
+                    logging.error("Failed to send email to %s: %s", message.to_email, e)
+                    failures.append(FailedEmail(message=message, error=e, attempts=attempt))
+                pending.task_done()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(settings.smtp_pool_size, len(messages)))
+        ]
+        try:
+            await pending.join()
+        finally:
+            for task in [*workers, *retries]:
+                task.cancel()
+        if failures:
+            raise EmailDeliveryError(failures)
+
+    async def send_email(
         self,
         to_email: str,
         subject: str,
         html_content: str,
         sender_email: str,
         reply_to: str | None = None,
-    ):
+    ) -> None:
         """Sends an email with the provided HTML content, sender, and optional reply-to address."""
-
-        settings = get_smtp_settings()
-
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = sender_email
-        msg["To"] = to_email
-        if reply_to:
-            msg["Reply-To"] = reply_to
-
-        msg.attach(MIMEText(html_content, "html"))
-
-        with smtplib.SMTP(settings.smtp_server, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_username, settings.smtp_password)
-            server.sendmail(sender_email, to_email, msg.as_string())
-
-        logging.info("Email sent successfully from %s to %s", sender_email, to_email)
+        await self.send_many(
+            [
+                EmailMessage(
+                    to_email=to_email,
+                    subject=subject,
+                    html_content=html_content,
+                    sender_email=sender_email,
+                    reply_to=reply_to,
+                )
+            ]
+        )
@@ -9,8 +9,6 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.database.models.models import (
-    LegalRepresentatives,
-    Phones,
     Registration,
     WhatsappAuthorization,
     WhatsappWorkers,
@@ -20,6 +18,7 @@ from people_api.schemas import InternalToken, UserToken
 from ..enums import Gender
 from ..models.member import GroupJoinRequest
 from ..repositories import MemberRepository
+from .authorization_status_cache import AuthorizationStatusCache
 
 
 class GroupService:
@@ -127,12 +126,20 @@ class GroupService:
     async def get_authorization_status(
         token_data: UserToken | InternalToken, session: AsyncSession
     ) -> dict:
-        """Retrieves the authorization status for a member."""
+        """
+        Retrieves the authorization status for a member.
+
+        Statuses are served from ``AuthorizationStatusCache`` until Postgres notifies a
+        change to the authorizations, workers or phones they were built from.
+        """
+        registration_id = token_data.registration_id
+        cached = await AuthorizationStatusCache.get(registration_id)
+        if cached is not None:
+            return cached
+        generation = AuthorizationStatusCache.current_generation()
 
         registration = (
-            await session.exec(
-                Registration.select_stmt_by_id(registration_id=token_data.registration_id)
-            )
+            await session.exec(Registration.select_stmt_by_id(registration_id=registration_id))
         ).first()
 
         if not registration:
@@ -149,74 +156,24 @@ class GroupService:
             - ((today.month, today.day) < (birth_date.month, birth_date.day))
         )
 
-        member_phone_records = (
+        rows = (
             await session.exec(
-                select(Phones.phone_number).where(
-                    Phones.registration_id == registration.registration_id
+                WhatsappAuthorization.select_status_by_registration_id(
+                    registration_id=registration_id, include_legal_reps=age < 18
                 )
             )
         ).all()
-        member_phones = list(member_phone_records)
-        member_phones_map = {phone[-8:]: phone for phone in member_phones}
-
-        legal_rep_phones = []
-        legal_rep_phones_map = {}
-        if age < 18:
-            legal_rep_phone_records = (
-                await session.exec(
-                    select(LegalRepresentatives.phone).where(
-                        LegalRepresentatives.registration_id == registration.registration_id
-                    )
-                )
-            ).all()
-            legal_rep_phones = list(legal_rep_phone_records)
-            legal_rep_phones_map = {phone[-8:]: phone for phone in legal_rep_phones}
-
-        workers = (await session.exec(select(WhatsappWorkers))).all()
 
-        authorization_status = {"authorizations": {}}
-
-        for worker in workers:
-            worker_phone = worker.worker_phone
-
-            authorization_status["authorizations"][worker_phone] = {
-                "authorized_numbers": {},
-                "pending_authorization": {},
-            }
-
-            authorizations = (
-                await session.exec(
-                    select(WhatsappAuthorization).where(
-                        WhatsappAuthorization.worker_id == worker.id
-                    )
-                )
-            ).all()
-
-            authorized_phone_last_8_digits = {auth.phone_number[-8:] for auth in authorizations}
-
-            for phone_last_8 in member_phones_map:
-                full_phone = member_phones_map[phone_last_8]
-                if phone_last_8 in authorized_phone_last_8_digits:
-                    authorization_status["authorizations"][worker_phone]["authorized_numbers"][
-                        full_phone
-                    ] = "member"
-                else:
-                    authorization_status["authorizations"][worker_phone]["pending_authorization"][
-                        full_phone
-                    ] = "member"
-
-            if age < 18:
-                for phone_last_8 in legal_rep_phones_map:
-                    full_phone = legal_rep_phones_map[phone_last_8]
-                    if phone_last_8 in authorized_phone_last_8_digits:
-                        authorization_status["authorizations"][worker_phone]["authorized_numbers"][
-                            full_phone
-                        ] = "legal_rep"
-                    else:
-                        authorization_status["authorizations"][worker_phone][
-                            "pending_authorization"
-                        ][full_phone] = "legal_rep"
+        authorization_status: dict = {"authorizations": {}}
+        for worker_phone, phone, kind, authorized in rows:
+            worker_status = authorization_status["authorizations"].setdefault(
+                worker_phone, {"authorized_numbers": {}, "pending_authorization": {}}
+            )
+            if phone is not None:
+                bucket = "authorized_numbers" if authorized else "pending_authorization"
+                worker_status[bucket][phone] = kind
 
+        await AuthorizationStatusCache.set(registration_id, authorization_status, generation)
         return authorization_status
 
     @staticmethod
@@ -5,6 +5,7 @@ from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.schemas import UserToken
+from people_api.services.identity_cache import IdentityCache
 
 from ..database.models import (
     Emails,
@@ -22,6 +23,12 @@ from ..database.models import (
 class IamService:
     """Service class for IAM."""
 
+    @staticmethod
+    async def _commit_and_invalidate_identities(session: AsyncSession) -> None:
+        """Commit an IAM mutation and drop every cached identity resolved before it."""
+        await session.commit()
+        await IdentityCache.invalidate()
+
     @staticmethod
     async def get_member_id_by_email(email: str, session: AsyncSession) -> int:
         """Get member id by email."""
@@ -291,6 +298,7 @@ class IamService:
             if new_permission_description
             else permission.permission_description
         )
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Permission: {permission_name} updated successfully."}
 
     @staticmethod
@@ -324,6 +332,7 @@ class IamService:
             )
         role_permission_map = IAMRolePermissionsMap(role_id=role.id, permission_id=permission.id)
         session.add(role_permission_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Permission: {permission_name} added to role: {role_name} successfully."}
 
     @staticmethod
@@ -359,6 +368,7 @@ class IamService:
             group_id=group.id, permission_id=permission.id
         )
         session.add(group_permission_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {
             "detail": f"Permission: {permission_name} added to group: {group_name} successfully."
         }
@@ -383,6 +393,7 @@ class IamService:
             )
         role_map = IAMUserRolesMap(role_id=role.id, registration_id=member_id)
         session.add(role_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Role: {role_name} added to member with id: {member_id} successfully."}
 
     @staticmethod
@@ -405,6 +416,7 @@ class IamService:
             )
         group_map = IAMUserGroupsMap(group_id=group.id, registration_id=member_id)
         session.add(group_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Group: {group_name} added to member with id: {member_id} successfully."}
 
     @staticmethod
@@ -435,6 +447,7 @@ class IamService:
                 detail=f"Role: {role_name} does not have permission: {permission_name}.",
             )
         await session.delete(role_permission_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {
             "detail": f"Permission: {permission_name} removed from role: {role_name} successfully."
         }
@@ -468,6 +481,7 @@ class IamService:
                 detail=f"Group: {group_name} does not have permission: {permission_name}.",
             )
         await session.delete(group_permission_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {
             "detail": f"Permission: {permission_name} removed from group: {group_name} successfully."
         }
@@ -496,6 +510,7 @@ class IamService:
                 detail=f"Role: {role_name} not assigned to member with id: {member_id}.",
             )
         await session.delete(role_member_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {
             "detail": f"Role: {role_name} removed from member with id: {member_id} successfully."
         }
@@ -524,6 +539,7 @@ class IamService:
                 detail=f"Group: {group_name} not assigned to member with id: {member_id}.",
             )
         await session.delete(group_member_map)
+        await IamService._commit_and_invalidate_identities(session)
         return {
             "detail": f"Group: {group_name} removed from member with id: {member_id} successfully."
         }
@@ -538,6 +554,7 @@ class IamService:
                 detail=f"Role: {role_name} does not exist.",
             )
         await session.delete(role)
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Role: {role_name} deleted successfully."}
 
     @staticmethod
@@ -550,6 +567,7 @@ class IamService:
                 detail=f"Group: {group_name} does not exist.",
             )
         await session.delete(group)
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Group: {group_name} deleted successfully."}
 
     @staticmethod
@@ -562,4 +580,5 @@ class IamService:
                 detail=f"Permission: {permission_name} does not exist.",
             )
         await session.delete(permission)
+        await IamService._commit_and_invalidate_identities(session)
         return {"detail": f"Permission: {permission_name} deleted successfully."}
@@ -0,0 +1,172 @@
+"""Cache of resolved Firebase identities (registration ID and permissions) keyed by token hash."""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from ..dbs import create_redis_client
+from ..settings import get_settings
+
+GENERATION_KEY = "auth:identity:generation"
+ENTRY_KEY_PREFIX = "auth:identity:token:"
+REDIS_RETRY_AFTER_SECONDS = 30
+
+
+@dataclass
+class _LocalEntry:
+    """Identity cached in-process, with the IAM generation it was resolved under."""
+
+    decoded_token: dict
+    generation: int
+    expires_at: float
+    checked_at: float
+
+
+class IdentityCache:
+    """
+    Two-level cache (in-process LRU in front of Redis) for resolved Firebase identities.
+
+    Entries are tagged with an IAM generation counter stored in Redis. Any IAM mutation
+    increments the counter, which invalidates every cached identity across all workers.
+    In-process hits skip Redis for up to ``auth_cache_local_ttl`` seconds; after that the
+    generation is re-checked before the entry is served again.
+    """
+
+    _local: OrderedDict[str, _LocalEntry] = OrderedDict()
+    _local_generation: int = 0
+    _redis_client: redis.Redis | None = None
+    _redis_unavailable_until: float = 0.0
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        """Return the cache key for a raw bearer token."""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def _get_redis(cls) -> redis.Redis:
+        """Return the shared Redis client, unless Redis recently failed."""
+        if time.monotonic() < cls._redis_unavailable_until:
+            raise RedisError("Redis marked unavailable, skipping identity cache")
+        if cls._redis_client is None:
+            cls._redis_client = create_redis_client()
+        return cls._redis_client
+
+    @classmethod
+    def _redis_failed(cls, action: str, error: Exception) -> None:
+        """Log a Redis failure and skip Redis for a while so auth does not wait on it."""
+        if time.monotonic() >= cls._redis_unavailable_until:
+            logging.warning("[IDENTITY-CACHE] Could not %s: %s", action, error)
+            cls._redis_unavailable_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+    @classmethod
+    async def current_generation(cls) -> int:
+        """Return the IAM generation from Redis, falling back to the local one."""
+        try:
+            value = await cls._get_redis().get(GENERATION_KEY)
+        except (RedisError, RuntimeError) as e:
+            cls._redis_failed("read IAM generation", e)
+            return cls._local_generation
+        generation = int(value) if value else 0
+        if generation != cls._local_generation:
+            cls._local.clear()
+            cls._local_generation = generation
+        return generation
+
+    @classmethod
+    def _store_local(cls, key: str, decoded_token: dict, generation: int, expires_at: float):
+        settings = get_settings()
+        cls._local[key] = _LocalEntry(
+            decoded_token=decoded_token,
+            generation=generation,
+            expires_at=expires_at,
+            checked_at=time.monotonic(),
+        )
+        cls._local.move_to_end(key)
+        while len(cls._local) > settings.auth_cache_max_entries:
+            cls._local.popitem(last=False)
+
+    @classmethod
+    async def get(cls, token: str) -> dict | None:
+        """Return the cached decoded token (with registration_id and permissions), if any."""
+        key = cls.token_key(token)
+        now = time.time()
+
+        entry = cls._local.get(key)
+        if (
+            entry is not None
+            and entry.expires_at > now
+            and time.monotonic() - entry.checked_at < get_settings().auth_cache_local_ttl
+        ):
+            cls._local.move_to_end(key)
+            return entry.decoded_token
+
+        generation = await cls.current_generation()
+        entry = cls._local.get(key)
+        if entry is not None:
+            if entry.expires_at > now and entry.generation == generation:
+                entry.checked_at = time.monotonic()
+                cls._local.move_to_end(key)
+                return entry.decoded_token
+            cls._local.pop(key, None)
+
+        try:
+            raw = await cls._get_redis().get(ENTRY_KEY_PREFIX + key)
+        except (RedisError, RuntimeError) as e:
+            cls._redis_failed("read cached identity", e)
+            return None
+        if not raw:
+            return None
+
+        cached = json.loads(raw)
+        if cached["generation"] != generation or cached["expires_at"] <= now:
+            return None
+        cls._store_local(key, cached["decoded_token"], generation, cached["expires_at"])
+        return cached["decoded_token"]
+
+    @classmethod
+    async def set(cls, token: str, decoded_token: dict, generation: int | None = None) -> None:
+        """
+        Cache a resolved identity until the token expires or the configured TTL elapses.
+
+        Pass the ``generation`` read before resolving permissions so that an IAM mutation
+        committed in the meantime is not masked by a stale entry.
+        """
+        now = time.time()
+        ttl = get_settings().auth_cache_ttl
+        exp = decoded_token.get("exp")
+        if exp is not None:
+            ttl = min(ttl, int(exp - now))
+        if ttl <= 0:
+            return
+
+        key = cls.token_key(token)
+        if generation is None:
+            generation = await cls.current_generation()
+        expires_at = now + ttl
+        cls._store_local(key, decoded_token, generation, expires_at)
+        payload = {
+            "generation": generation,
+            "expires_at": expires_at,
+            "decoded_token": decoded_token,
+        }
+        try:
+            await cls._get_redis().set(ENTRY_KEY_PREFIX + key, json.dumps(payload), ex=ttl)
+        except (RedisError, RuntimeError) as e:
+            cls._redis_failed("store identity", e)
+
+    @classmethod
+    async def invalidate(cls) -> None:
+        """Invalidate every cached identity, in this process and in Redis."""
+        cls._local.clear()
+        cls._local_generation += 1
+        cls._redis_unavailable_until = 0.0
+        try:
+            cls._local_generation = await cls._get_redis().incr(GENERATION_KEY)
+        except (RedisError, RuntimeError) as e:
+            cls._redis_failed("bump IAM generation", e)
@@ -6,7 +6,6 @@ from datetime import datetime
 
 from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.database.models.models import LegalRepresentatives, Registration
@@ -48,13 +47,15 @@ class LegalRepresentativeService:
         return legal_representatives
 
     @staticmethod
-    def add_legal_representative_api_key(request: LegalRepresentativeRequest, session: Session):
+    async def add_legal_representative_api_key(
+        request: LegalRepresentativeRequest, session: AsyncSession
+    ):
         """Add legal representative to member using API key."""
         if request.token != SETTINGS.whatsapp_route_api_key:
             raise HTTPException(status_code=401, detail="Unauthorized")
         request.mb = int(request.mb)
         reg_stmt = Registration.select_stmt_by_id(request.mb)
-        member_data = session.exec(reg_stmt).first()
+        member_data = (await session.exec(reg_stmt)).first()
         if not member_data:
             raise HTTPException(status_code=404, detail="Member not found")
 
@@ -75,23 +76,23 @@ class LegalRepresentativeService:
         stmt = LegalRepresentatives.insert_stmt_for_legal_representative(
             request.mb, request.legal_representative
         )
-        session.exec(stmt)
+        await session.exec(stmt)
         return {"message": "Legal representative added successfully"}
 
     @staticmethod
-    def add_legal_representative(
+    async def add_legal_representative(
         mb: int,
         legal_representative: LegalRepresentatives,
         token_data: UserToken | InternalToken,
-        session: Session,
+        session: AsyncSession,
     ):
         """Add legal representative to member."""
         reg_stmt = Registration.select_stmt_by_email(token_data.email)
-        member_data = session.exec(reg_stmt).first()
+        member_data = (await session.exec(reg_stmt)).first()
         if not member_data or member_data.registration_id != mb:
             raise HTTPException(status_code=401, detail="Unauthorized")
         reg_stmt_by_id = Registration.select_stmt_by_id(mb)
-        member_data = session.exec(reg_stmt_by_id).first()
+        member_data = (await session.exec(reg_stmt_by_id)).first()
         if member_data.birth_date is None:
             raise HTTPException(
                 status_code=400,
@@ -110,7 +111,7 @@ class LegalRepresentativeService:
                 detail="User must be under 18 to add legal representative",
             )
         stmt_get_lr = LegalRepresentatives.get_legal_representatives_for_member(mb)
-        existing_legal_reps = session.exec(stmt_get_lr).all()
+        existing_legal_reps = (await session.exec(stmt_get_lr)).all()
         if len(existing_legal_reps) > 1:
             raise HTTPException(
                 status_code=400, detail="User already has two legal representatives"
@@ -118,44 +119,44 @@ class LegalRepresentativeService:
         stmt_insert = LegalRepresentatives.insert_stmt_for_legal_representative(
             mb, legal_representative
         )
-        session.exec(stmt_insert)
+        await session.exec(stmt_insert)
         return {"message": "Legal representative added successfully"}
 
     @staticmethod
-    def update_legal_representative(
+    async def update_legal_representative(
         mb: int,
         legal_rep_id: int,
         updated_legal_rep: LegalRepresentatives,
         token_data: UserToken | InternalToken,
-        session: Session,
+        session: AsyncSession,
     ):
         """Update legal representative for member."""
         reg_stmt = Registration.select_stmt_by_email(token_data.email)
-        member_data = session.exec(reg_stmt).first()
+        member_data = (await session.exec(reg_stmt)).first()
         if not member_data or member_data.registration_id != mb:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         update_stmt = LegalRepresentatives.update_stmt_for_legal_representative(
             mb, legal_rep_id, updated_legal_rep
         )
-        result = session.exec(update_stmt)
+        result = await session.exec(update_stmt)
         if result.rowcount is None or result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Legal representative not found")
         return {"message": "Legal representative updated successfully"}
 
     @staticmethod
-    def delete_legal_representative(
-        mb: int, legal_rep_id: int, token_data: UserToken | InternalToken, session: Session
+    async def delete_legal_representative(
+        mb: int, legal_rep_id: int, token_data: UserToken | InternalToken, session: AsyncSession
     ):
         """Delete legal representative from member."""
         reg_stmt = Registration.select_stmt_by_email(token_data.email)
-        member_data = session.exec(reg_stmt).first()
+        member_data = (await session.exec(reg_stmt)).first()
 
         if not member_data or member_data.registration_id != mb:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         delete_stmt = LegalRepresentatives.delete_stmt_for_legal_representative(mb, legal_rep_id)
-        result = session.exec(delete_stmt)
+        result = await session.exec(delete_stmt)
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Legal representative not found")
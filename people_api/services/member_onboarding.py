@@ -20,7 +20,7 @@ from people_api.database.models.pending_registration import (
 )
 from people_api.dbs import get_async_sessions
 from people_api.models.asaas import AnuityType, PaymentChoice
-from people_api.services.email_sending_service import EmailSendingService
+from people_api.services.email_sending_service import EmailMessage, EmailSendingService
 from people_api.services.email_service import EmailTemplates
 from people_api.services.workspace_service import WorkspaceService
 from people_api.settings import get_asaas_settings, get_settings, get_smtp_settings
@@ -357,14 +357,18 @@ class MemberOnboardingService:
             )
 
             logging.info("Sending welcome emails for registration ID: %s", reg_id)
-            for email in emails:
-                email_service.send_email(
-                    to_email=email["recipient_email"],
-                    subject=email["subject"],
-                    html_content=email["body"],
-                    sender_email=sender,
-                    reply_to="secretaria@mensa.org.br",
-                )
+            await email_service.send_many(
+                [
+                    EmailMessage(
+                        to_email=email["recipient_email"],
+                        subject=email["subject"],
+                        html_content=email["body"],
+                        sender_email=sender,
+                        reply_to="secretaria@mensa.org.br",
+                    )
+                    for email in emails
+                ]
+            )
 
             pending_member.member_effectivation_date = datetime.now()
             session.add(pending_member)
@@ -431,13 +435,15 @@ async def send_initial_payment_email(
             complete_payment_url=complete_payment_url,
         )
 
-        email_service.send_email(
-            to_email=member_data.email,
-            subject=subject,
-            html_content=html_content,
-            sender_email=sender_email,
-            reply_to="secretaria@mensa.org.br",
-        )
+        messages = [
+            EmailMessage(
+                to_email=member_data.email,
+                subject=subject,
+                html_content=html_content,
+                sender_email=sender_email,
+                reply_to="secretaria@mensa.org.br",
+            )
+        ]
 
         if member_data.legal_representatives:
             for rep in member_data.legal_representatives:
@@ -447,14 +453,18 @@ async def send_initial_payment_email(
                     admission_type=member_data.admission_type,
                     complete_payment_url=complete_payment_url,
                 )
-                email_service.send_email(
-                    to_email=rep.email,  # type: ignore
-                    subject=rep_subject,
-                    html_content=rep_html_content,
-                    sender_email=sender_email,
-                    reply_to="secretaria@mensa.org.br",
+                messages.append(
+                    EmailMessage(
+                        to_email=rep.email,  # type: ignore
+                        subject=rep_subject,
+                        html_content=rep_html_content,
+                        sender_email=sender_email,
+                        reply_to="secretaria@mensa.org.br",
+                    )
                 )
 
+        await email_service.send_many(messages)
+
         pending_registration.email_sent_at = date.today()
         session.add(pending_registration)
 
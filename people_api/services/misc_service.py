@@ -2,10 +2,8 @@
 
 """Service for miscellaneous member operations."""
 
-import json
-
 from fastapi import HTTPException
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.schemas import UserToken
 
@@ -18,19 +16,16 @@ class MiscService:
     """Service for miscellaneous member operations."""
 
     @staticmethod
-    def get_member(mb: int, token_data: UserToken, session: Session) -> PostgresMemberRead:
-        MB = MemberRepository.getMBByEmail(token_data.email, session)
-        member_data = MemberRepository.getAllMemberDataFromPostgres(MB, session)
-
-        member_data_dict = json.loads(member_data)
-        validated_data = PostgresMemberRead(**member_data_dict)
-
-        return validated_data
+    async def get_member(
+        mb: int, token_data: UserToken, session: AsyncSession
+    ) -> PostgresMemberRead:
+        MB = await MemberRepository.getMBByEmail(token_data.email, session)
+        return await MemberRepository.getAllMemberDataFromPostgres(MB, session)
 
     @staticmethod
-    def set_pronouns(pronouns: PronounsCreate, token_data: UserToken, session: Session):
+    async def set_pronouns(pronouns: PronounsCreate, token_data: UserToken, session: AsyncSession):
         """Set pronouns for a member."""
-        MB = MemberRepository.getMBByEmail(token_data.email, session)
+        MB = await MemberRepository.getMBByEmail(token_data.email, session)
         if pronouns.pronouns not in [
             "Ele/dele",
             "Ela/dela",
@@ -41,24 +36,24 @@ class MiscService:
                 status_code=400,
                 detail="Pronouns must be Ele/dele, Ela/dela or Elu/delu or Nenhuma das opções",
             )
-        MemberRepository.setPronounsOnPostgres(MB, pronouns.pronouns, session)
+        await MemberRepository.setPronounsOnPostgres(MB, pronouns.pronouns, session)
         return {"message": "Pronouns set successfully"}
 
     @staticmethod
-    def update_fb_profession(
+    async def update_fb_profession(
         mb: int,
         updated_member: MemberProfessionFacebookUpdate,
         token_data: UserToken,
-        session: Session,
+        session: AsyncSession,
     ):
         """Update profession and facebook for a member."""
-        MB = MemberRepository.getMBByEmail(token_data.email, session)
+        MB = await MemberRepository.getMBByEmail(token_data.email, session)
         if MB != mb:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         profession = updated_member.profession
         facebook = updated_member.facebook
-        success = MemberRepository.updateProfessionAndFacebookOnPostgres(
+        success = await MemberRepository.updateProfessionAndFacebookOnPostgres(
             mb, profession, facebook, session
         )
         if not success:
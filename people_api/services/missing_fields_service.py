@@ -4,7 +4,7 @@ from datetime import datetime
 
 from fastapi import HTTPException
 from pycpfcnpj.cpf import validate as validate_cpf
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from people_api.schemas import UserToken
 
@@ -16,19 +16,19 @@ class MissingFieldsService:
     """Service for managing missing fields of members."""
 
     @staticmethod
-    def get_missing_fields(token_data: UserToken, session: Session):
+    async def get_missing_fields(token_data: UserToken, session: AsyncSession):
         """Get missing fields for a member."""
-        missing_fields = MemberRepository.getMissingFieldsFromPostgres(
+        missing_fields = await MemberRepository.getMissingFieldsFromPostgres(
             token_data.registration_id, session
         )
         return missing_fields
 
     @staticmethod
-    def set_missing_fields(
-        token_data: UserToken, missing_fields: MissingFieldsCreate, session: Session
+    async def set_missing_fields(
+        token_data: UserToken, missing_fields: MissingFieldsCreate, session: AsyncSession
     ):
         """Set missing fields for a member."""
-        missing_fields_list = MemberRepository.getMissingFieldsFromPostgres(
+        missing_fields_list = await MemberRepository.getMissingFieldsFromPostgres(
             token_data.registration_id, session
         )
 
@@ -37,7 +37,7 @@ class MissingFieldsService:
                 if not validate_cpf(missing_fields.cpf):
                     raise HTTPException(status_code=422, detail="Invalid CPF")
 
-                MemberRepository.setCPFOnPostgres(
+                await MemberRepository.setCPFOnPostgres(
                     token_data.registration_id, missing_fields.cpf, session
                 )
         if missing_fields.birth_date is not None:
@@ -53,7 +53,7 @@ class MissingFieldsService:
                         raise HTTPException(
                             status_code=422, detail="Invalid birth_date format"
                         ) from e
-                MemberRepository.setBirthDateOnPostgres(
+                await MemberRepository.setBirthDateOnPostgres(
                     token_data.registration_id, birth_date, session
                 )
 
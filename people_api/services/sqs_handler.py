@@ -1,6 +1,7 @@
 """SQS and SNS setup for AWS"""
 
 import asyncio
+import itertools
 import json
 import logging
 import re
@@ -35,6 +36,11 @@ class SQSSettings(BaseSettings):
     topic_name: str = "member_onboarding"
     queue_name: str = "pending_member_first_payment"
     dlq_name: str = "dlq"
+    consumer_workers: int = 2
+    consumer_max_in_flight: int = 10
+    wait_time_seconds: int = 20
+    visibility_timeout: int = 30
+    heartbeat_interval: float = 10
 
 
 @lru_cache
@@ -206,86 +212,176 @@ async def process_message(raw_message: str) -> PendingRegistration:
         raise e
 
 
-async def consume_and_store_messages(sqs_client, queue_url, *, max_polls: int | None = None):
-    """Continuously consume messages from SQS, validate, and store in the database.
-
-    Args:
-        sqs_client: Boto3 SQS client.
-        queue_url: URL of the SQS queue to consume from.
-        max_polls: Optional maximum number of polling iterations; if set, exit after polling this many times.
-    """
+async def _notify_failed_message(error: Exception) -> None:
+    """Report a message that could not be processed to the onboarding monitor."""
+    try:
+        async with aiohttp.ClientSession() as websession:
+            await websession.get(
+                url=get_settings().monitor_onboarding_failed_dlq_url
+                + f"?status=down&msg={str(error)}&ping={time.time()}",
+                headers={"Content-Type": "application/json"},
+            )
+        logging.info("Sent error notification to monitoring endpoint")
+    except Exception as notify_error:
+        logging.error("Failed to notify monitoring endpoint: %s", notify_error)
 
-    logging.info("Starting to consume messages from SQS queue...")
-    poll_count = 0
 
+async def _keep_batch_visible(sqs_client, queue_url: str, receipt_handles: set[str]) -> None:
+    """Extend the visibility timeout of in-flight messages until they are acked or released."""
+    settings = get_sqs_settings()
     while True:
-        if max_polls is not None and poll_count >= max_polls:
-            logging.info("Reached max_polls=%d, exiting consume loop", max_polls)
-            break
-        poll_count += 1
-        await asyncio.sleep(1)
+        await asyncio.sleep(settings.heartbeat_interval)
+        if not receipt_handles:
+            continue
+        entries = [
+            {
+                "Id": str(i),
+                "ReceiptHandle": handle,
+                "VisibilityTimeout": settings.visibility_timeout,
+            }
+            for i, handle in enumerate(receipt_handles)
+        ]
         try:
-            response = sqs_client.receive_message(
-                QueueUrl=queue_url,
-                MaxNumberOfMessages=10,
-                WaitTimeSeconds=20,
-                VisibilityTimeout=30,
+            await asyncio.to_thread(
+                sqs_client.change_message_visibility_batch, QueueUrl=queue_url, Entries=entries
             )
-            messages = response.get("Messages", [])
-            if not messages:
-                logging.debug("No messages received. Continuing...")
-                continue
-
-            logging.info("Received %d messages from SQS", len(messages))
-
-            for msg in messages:
-                try:
-                    body = json.loads(msg["Body"])
-                    logging.info("Processing message: %s", body)
-
-                    pending = await process_message(body["Message"])
-
-                    async for sessions in get_async_sessions():
-                        sessions.rw.add(pending)
-                    logging.info("Added pending registration: %s", pending)
-
-                    sqs_client.delete_message(
-                        QueueUrl=queue_url, ReceiptHandle=msg["ReceiptHandle"]
-                    )
-                    logging.info(
-                        "Successfully deleted message with ReceiptHandle: %s",
-                        msg["ReceiptHandle"],
-                    )
-                    async for sessions in get_async_sessions():
-                        await send_initial_payment_email(
-                            session=sessions.rw,
-                            pending_registration=pending,
-                        )
-                except (ValidationError, JSONDecodeError, ClientError, ValueError) as e:
-                    logging.error("Error processing message: %s", e)
-                    logging.warning("Skipping message due to error: %s", e)
-
-                    try:
-                        async with aiohttp.ClientSession() as websession:
-                            await websession.get(
-                                url=get_settings().monitor_onboarding_failed_dlq_url
-                                + f"?status=down&msg={str(e)}&ping={time.time()}",
-                                headers={"Content-Type": "application/json"},
-                            )
-                        logging.info("Sent error notification to monitoring endpoint")
-                    except Exception as notify_error:
-                        logging.error("Failed to notify monitoring endpoint: %s", notify_error)
-
-                    try:
-                        sqs_client.change_message_visibility(
-                            QueueUrl=queue_url,
-                            ReceiptHandle=msg["ReceiptHandle"],
-                            VisibilityTimeout=0,
-                        )
-                    except ClientError as ce:
-                        logging.error("Error resetting message visibility: %s", ce)
-                    continue
-
+            logging.debug("Extended visibility of %d in-flight messages", len(entries))
         except ClientError as e:
-            logging.error("AWS ClientError while receiving or processing messages from SQS: %s", e)
-            logging.error("Error receiving or processing messages from SQS: %s", e)
+            logging.warning("Error extending message visibility: %s", e)
+
+
+async def _store_message(
+    sqs_client,
+    queue_url: str,
+    msg: dict,
+    in_flight: asyncio.Semaphore,
+    receipt_handles: set[str],
+) -> PendingRegistration | None:
+    """Validate and store one message. Returns the stored registration, or None on failure."""
+    async with in_flight:
+        try:
+            body = json.loads(msg["Body"])
+            logging.info("Processing message: %s", body)
+
+            pending = await process_message(body["Message"])
+
+            async for sessions in get_async_sessions():
+                sessions.rw.add(pending)
+            logging.info("Added pending registration: %s", pending)
+            return pending
+        except (ValidationError, JSONDecodeError, KeyError, ValueError) as e:
+            logging.error("Error processing message: %s", e)
+            logging.warning("Skipping message due to error: %s", e)
+            receipt_handles.discard(msg["ReceiptHandle"])
+            await _notify_failed_message(e)
+            try:
+                await asyncio.to_thread(
+                    sqs_client.change_message_visibility,
+                    QueueUrl=queue_url,
+                    ReceiptHandle=msg["ReceiptHandle"],
+                    VisibilityTimeout=0,
+                )
+            except ClientError as ce:
+                logging.error("Error resetting message visibility: %s", ce)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Unexpected (e.g. database) errors: let the visibility timeout expire so the
+            # message is retried later instead of immediately.
+            logging.exception("Unexpected error storing message: %s", e)
+            receipt_handles.discard(msg["ReceiptHandle"])
+        return None
+
+
+async def _delete_messages(sqs_client, queue_url: str, messages: list[dict]) -> None:
+    """Ack processed messages with a single DeleteMessageBatch call."""
+    if not messages:
+        return
+    entries = [{"Id": str(i), "ReceiptHandle": m["ReceiptHandle"]} for i, m in enumerate(messages)]
+    try:
+        response = await asyncio.to_thread(
+            sqs_client.delete_message_batch, QueueUrl=queue_url, Entries=entries
+        )
+    except ClientError as e:
+        logging.error("Error deleting message batch: %s", e)
+        return
+    for failure in response.get("Failed", []):
+        logging.error("Failed to delete message %s: %s", failure["Id"], failure.get("Message"))
+    logging.info("Deleted %d messages", len(response.get("Successful", [])))
+
+
+async def _send_payment_email(pending: PendingRegistration, in_flight: asyncio.Semaphore) -> None:
+    async with in_flight:
+        async for sessions in get_async_sessions():
+            await send_initial_payment_email(session=sessions.rw, pending_registration=pending)
+
+
+async def _consume_batch(sqs_client, queue_url: str, in_flight: asyncio.Semaphore) -> int:
+    """Receive one batch, store its messages concurrently and ack them in a single call."""
+    settings = get_sqs_settings()
+    try:
+        response = await asyncio.to_thread(
+            sqs_client.receive_message,
+            QueueUrl=queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=settings.wait_time_seconds,
+            VisibilityTimeout=settings.visibility_timeout,
+        )
+    except ClientError as e:
+        logging.error("AWS ClientError while receiving messages from SQS: %s", e)
+        await asyncio.sleep(1)
+        return 0
+
+    messages = response.get("Messages", [])
+    if not messages:
+        logging.debug("No messages received. Continuing...")
+        return 0
+    logging.info("Received %d messages from SQS", len(messages))
+
+    receipt_handles = {msg["ReceiptHandle"] for msg in messages}
+    heartbeat = asyncio.create_task(_keep_batch_visible(sqs_client, queue_url, receipt_handles))
+    try:
+        results = await asyncio.gather(
+            *(
+                _store_message(sqs_client, queue_url, msg, in_flight, receipt_handles)
+                for msg in messages
+            )
+        )
+        stored = [(msg, pending) for msg, pending in zip(messages, results) if pending]
+        await _delete_messages(sqs_client, queue_url, [msg for msg, _ in stored])
+    finally:
+        heartbeat.cancel()
+
+    await asyncio.gather(*(_send_payment_email(pending, in_flight) for _, pending in stored))
+    return len(stored)
+
+
+async def consume_and_store_messages(
+    sqs_client, queue_url, *, max_polls: int | None = None, workers: int | None = None
+):
+    """Continuously consume messages from SQS, validate, and store in the database.
+
+    ``workers`` poll loops run concurrently. Each one long-polls a batch of up to 10
+    messages, stores them concurrently (bounded by ``consumer_max_in_flight`` across all
+    workers), acks the stored ones with DeleteMessageBatch and then sends the payment
+    emails. Visibility of in-flight messages is extended every ``heartbeat_interval``
+    seconds, so slow messages are not redelivered while still being processed.
+
+    Args:
+        sqs_client: Boto3 SQS client.
+        queue_url: URL of the SQS queue to consume from.
+        max_polls: Optional maximum number of polling iterations, shared by all workers;
+            if set, exit after polling this many times.
+        workers: Number of concurrent poll loops. Defaults to ``consumer_workers``.
+    """
+    settings = get_sqs_settings()
+    workers = workers or settings.consumer_workers
+    in_flight = asyncio.Semaphore(settings.consumer_max_in_flight)
+    polls = itertools.count()
+
+    async def poll_loop() -> None:
+        while max_polls is None or next(polls) < max_polls:
+            await _consume_batch(sqs_client, queue_url, in_flight)
+
+    logging.info("Starting to consume messages from SQS queue with %d workers...", workers)
+    await asyncio.gather(*(poll_loop() for _ in range(workers)))
+    if max_polls is not None:
+        logging.info("Reached max_polls=%d, exiting consume loop", max_polls)
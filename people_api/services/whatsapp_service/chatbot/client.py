@@ -4,23 +4,32 @@ import asyncio
 import logging
 
 from fastapi import HTTPException
-from sqlmodel.ext.asyncio.session import AsyncSession
+from redis.exceptions import RedisError
 
 from people_api.services.twilio_service import TwilioService
 
 from ....database.models.whatsapp import ReceivedWhatsappMessage
+from ....dbs import AsyncSessionsTuple
 from .message_handler import MessageHandler
 from .thread_handler import ThreadService
+from .thread_store import ThreadStore
 
 
 class WhatsappChatBot:
     """Service for handling incoming messages from WhatsApp and sending them to the OpenAI chatbot."""
 
-    error_notifications: dict[str, str] = {}
+    @staticmethod
+    async def _should_notify_error(phone_number: str, error: str) -> bool:
+        """Return whether the member still has to be told about an error."""
+        try:
+            return await ThreadStore.mark_error_notified(phone_number, error)
+        except RedisError as e:
+            logging.warning("[CHATBOT-MENSA] Could not check error notification: %s", e)
+            return True
 
     @staticmethod
     async def chatbot_message(
-        message: ReceivedWhatsappMessage, session: AsyncSession, registration_id: int
+        message: ReceivedWhatsappMessage, sessions: AsyncSessionsTuple, registration_id: int
     ) -> str:
         """Handle incoming WhatsApp messages and forward them to the assistant."""
 
@@ -29,9 +38,7 @@ class WhatsappChatBot:
 
         try:
             if message_text.strip() == "!reset":
-                thread_key = str(phone_number)
-                if thread_key in ThreadService.threads_by_phone:
-                    del ThreadService.threads_by_phone[thread_key]
+                await ThreadStore.delete_thread(str(phone_number))
                 await TwilioService().send_whatsapp_message(
                     to_=message.From, message="Thread reset successfully!"
                 )
@@ -47,16 +54,14 @@ class WhatsappChatBot:
 
         try:
             thread_id = await ThreadService.get_or_create_thread(
-                phone_number=phone_number, session=session
+                phone_number=phone_number, session=sessions.ro
             )
-            ThreadService.record_message(str(phone_number), thread_id, message_text)
-            if str(phone_number) in WhatsappChatBot.error_notifications:
-                del WhatsappChatBot.error_notifications[str(phone_number)]
+            await ThreadService.record_message(str(phone_number), thread_id, message_text)
+            await ThreadStore.clear_error_notified(str(phone_number))
         except ValueError as e:
             logging.error("[CHATBOT-MENSA] Error processing message: %s", e)
             error_msg = str(e)
-            if str(phone_number) not in WhatsappChatBot.error_notifications:
-                WhatsappChatBot.error_notifications[str(phone_number)] = error_msg
+            if await WhatsappChatBot._should_notify_error(str(phone_number), error_msg):
                 await TwilioService().send_whatsapp_message(
                     to_=message.From,
                     message="Algo deu errado ao processar sua mensagem. Por favor, tente novamente mais tarde.",
@@ -65,8 +70,7 @@ class WhatsappChatBot:
         except HTTPException as e:
             logging.error("[CHATBOT-MENSA] Error processing message: %s", e)
             error_msg = e.detail
-            if str(phone_number) not in WhatsappChatBot.error_notifications:
-                WhatsappChatBot.error_notifications[str(phone_number)] = error_msg
+            if await WhatsappChatBot._should_notify_error(str(phone_number), error_msg):
                 await TwilioService().send_whatsapp_message(
                     to_=message.From,
                     message="Algo deu errado ao processar sua mensagem. Por favor, tente novamente mais tarde.",
@@ -78,6 +82,7 @@ class WhatsappChatBot:
                 thread_id=thread_id,
                 message=message_text,
                 registration_id=registration_id,
+                sessions=sessions,
             )
             logging.info(
                 "[CHATBOT-MENSA] Assistant response to be sent to user: %s",
@@ -114,8 +119,7 @@ class WhatsappChatBot:
         except Exception as e:
             logging.error("[CHATBOT-MENSA] Error processing message: %s", e)
             error_msg = str(e)
-            if str(phone_number) not in WhatsappChatBot.error_notifications:
-                WhatsappChatBot.error_notifications[str(phone_number)] = error_msg
+            if await WhatsappChatBot._should_notify_error(str(phone_number), error_msg):
                 await TwilioService().send_whatsapp_message(
                     to_=message.From,
                     message="Erro ao processar mensagem, tente novamente mais tarde...",
@@ -2,116 +2,148 @@
 
 import asyncio
 import logging
+import weakref
 
+from openai.types.beta.threads.run import Run
+
+from ....dbs import AsyncSessionsTuple
 from ....settings import get_settings
 from .openai_service import openai_client
 from .tool_calls_handler import ToolCallService
 
+TERMINAL_RUN_STATUSES = ("completed", "failed", "cancelled", "expired")
+RUN_TIMEOUT_SECONDS = 240
+# Runs are polled after 0.25s, then at intervals growing 1.5x up to 4s
+POLL_INITIAL_INTERVAL_SECONDS = 0.25
+POLL_MAX_INTERVAL_SECONDS = 4.0
+POLL_BACKOFF_FACTOR = 1.5
+
 
 class MessageHandler:
     """Service for handling incoming messages from WhatsApp and sending them to the OpenAI chatbot."""
 
-    @staticmethod
-    async def process_message(thread_id: str, message: str, registration_id: int) -> str:
-        """Handle incoming WhatsApp messages and forward them to the assistant."""
+    _thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
 
-        logging.info("[CHATBOT-MENSA] Processing message: %s", message)
-        try:
+    @classmethod
+    def thread_lock(cls, thread_id: str) -> asyncio.Lock:
+        """Return the lock serializing the runs of a thread in this worker."""
+        lock = cls._thread_locks.get(thread_id)
+        if lock is None:
+            lock = cls._thread_locks[thread_id] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    async def wait_for_active_runs(thread_id: str) -> None:
+        """Wait, with backoff, until runs started on the thread by other workers end."""
+        deadline = asyncio.get_running_loop().time() + RUN_TIMEOUT_SECONDS
+        interval = POLL_INITIAL_INTERVAL_SECONDS
+        while True:
             runs_response = await openai_client.beta.threads.runs.list(thread_id=thread_id)
-            active_runs = [
-                r
-                for r in runs_response.data
-                if r.status not in ("completed", "failed", "cancelled", "expired")
-            ]
-            if active_runs:
-                logging.info(
-                    "[CHATBOT-MENSA] Waiting for active runs to complete before adding new message..."
-                )
-                timeout = 240
-                elapsed = 0
-                while active_runs and elapsed < timeout:
-                    await asyncio.sleep(1)
-                    elapsed += 1
-                    runs_response = await openai_client.beta.threads.runs.list(thread_id=thread_id)
-                    active_runs = [
-                        r
-                        for r in runs_response.data
-                        if r.status not in ("completed", "failed", "cancelled", "expired")
-                    ]
-                if active_runs:
-                    raise TimeoutError("Previous run did not complete in time.")
-
-            await openai_client.beta.threads.messages.create(
-                thread_id=thread_id,
-                role="user",
-                content=message,
+            if all(r.status in TERMINAL_RUN_STATUSES for r in runs_response.data):
+                return
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                raise TimeoutError("Previous run did not complete in time.")
+            logging.info(
+                "[CHATBOT-MENSA] Waiting for active runs to complete before adding new message..."
             )
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL_SECONDS)
 
-            logging.info("[CHATBOT-MENSA] Message sent to assistant. Waiting for response...")
-            run = await openai_client.beta.threads.runs.create_and_poll(
-                thread_id=thread_id,
-                assistant_id=get_settings().chatgpt_assistant_id,
+    @staticmethod
+    async def wait_for_run(run: Run, registration_id: int, sessions: AsyncSessionsTuple) -> Run:
+        """
+        Wait until a run ends, handling its tool calls.
+
+        The run is polled with exponential backoff, restarting from the shortest interval
+        after tool outputs are submitted, when the run is about to resume.
+        """
+        deadline = asyncio.get_running_loop().time() + RUN_TIMEOUT_SECONDS
+        interval = POLL_INITIAL_INTERVAL_SECONDS
+        while run.status not in TERMINAL_RUN_STATUSES:
+            if run.status == "requires_action" and run.required_action:
+                logging.info("[CHATBOT-MENSA] Tool call detected... Handling tool calls...")
+                run = await ToolCallService.handle_tool_calls(run, registration_id, sessions)
+                interval = POLL_INITIAL_INTERVAL_SECONDS
+                if run.status in TERMINAL_RUN_STATUSES:
+                    break
+            else:
+                logging.info("[CHATBOT-MENSA] Assistant run status: %s", run.status)
+
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL_SECONDS)
+            run = await openai_client.beta.threads.runs.retrieve(
+                thread_id=run.thread_id, run_id=run.id
             )
+        return run
 
-            logging.info(
-                "[CHATBOT-MENSA] Assistant response received. Initial status: %s", run.status
-            )
+    @staticmethod
+    async def process_message(
+        thread_id: str, message: str, registration_id: int, sessions: AsyncSessionsTuple
+    ) -> str:
+        """
+        Handle incoming WhatsApp messages and forward them to the assistant.
+
+        Messages to the same thread are handled one at a time: those arriving at this
+        worker wait for its lock, and runs started by other workers are waited for.
+        """
 
-            timeout = 240
-            elapsed = 0
-
-            while (
-                run.status not in ("completed", "failed", "cancelled", "expired")
-                and elapsed < timeout
-            ):
-                if run.status == "queued":
-                    logging.info("[CHATBOT-MENSA] Assistant run is queued. Waiting to start...")
-                elif run.status == "in_progress":
-                    logging.info("[CHATBOT-MENSA] Assistant run is in progress...")
-                elif run.status == "requires_action" and run.required_action:
-                    logging.info("[CHATBOT-MENSA] Tool call detected... Handling tool calls...")
-                    run = await ToolCallService.handle_tool_calls(run, registration_id)
-                else:
-                    logging.info("[CHATBOT-MENSA] Assistant run status: %s", run.status)
-
-                if run.status not in ("completed", "failed", "cancelled", "expired"):
-                    await asyncio.sleep(1)
-                    elapsed += 1
-                    run = await openai_client.beta.threads.runs.retrieve(
-                        thread_id=thread_id, run_id=run.id
-                    )
-
-            if run.status == "completed":
-                logging.info("[CHATBOT-MENSA] Assistant response completed.")
-                messages_response = await openai_client.beta.threads.messages.list(
-                    thread_id=thread_id
+        logging.info("[CHATBOT-MENSA] Processing message: %s", message)
+        try:
+            async with MessageHandler.thread_lock(thread_id):
+                return await MessageHandler._run_message(
+                    thread_id, message, registration_id, sessions
                 )
-                assistant_messages = [
-                    msg for msg in messages_response.data if msg.role == "assistant"
-                ]
-                if not assistant_messages:
-                    logging.error("[CHATBOT-MENSA] No assistant messages found after completion.")
-                    raise ValueError("No valid response from the assistant.")
-
-                assistant_messages.sort(key=lambda msg: msg.created_at)
-
-                latest_timestamp = assistant_messages[-1].created_at
-                latest_messages = [
-                    msg for msg in assistant_messages if msg.created_at == latest_timestamp
-                ]
-                responses = []
-                for msg in latest_messages:
-                    if hasattr(msg.content[0], "text") and hasattr(msg.content[0].text, "value"):
-                        responses.append(msg.content[0].text.value)
-                return "\n".join(responses)
-
-            if run.status in ("failed", "cancelled", "expired"):
-                logging.error("[CHATBOT-MENSA] Assistant run ended with status: %s", run.status)
-                raise ValueError(f"Assistant run ended with status: {run.status}")
-
-            logging.error("[CHATBOT-MENSA] Assistant run did not complete in time.")
-            raise TimeoutError("Assistant run did not complete in time.")
 
         except Exception as e:
             logging.error("[CHATBOT-MENSA] Error processing message: %s", e)
             return "Erro ao processar mensagem, tente novamente mais tarde..."
+
+    @staticmethod
+    async def _run_message(
+        thread_id: str, message: str, registration_id: int, sessions: AsyncSessionsTuple
+    ) -> str:
+        await MessageHandler.wait_for_active_runs(thread_id)
+
+        await openai_client.beta.threads.messages.create(
+            thread_id=thread_id,
+            role="user",
+            content=message,
+        )
+
+        logging.info("[CHATBOT-MENSA] Message sent to assistant. Waiting for response...")
+        run = await openai_client.beta.threads.runs.create(
+            thread_id=thread_id,
+            assistant_id=get_settings().chatgpt_assistant_id,
+        )
+        run = await MessageHandler.wait_for_run(run, registration_id, sessions)
+
+        if run.status == "completed":
+            logging.info("[CHATBOT-MENSA] Assistant response completed.")
+            messages_response = await openai_client.beta.threads.messages.list(thread_id=thread_id)
+            assistant_messages = [msg for msg in messages_response.data if msg.role == "assistant"]
+            if not assistant_messages:
+                logging.error("[CHATBOT-MENSA] No assistant messages found after completion.")
+                raise ValueError("No valid response from the assistant.")
+
+            assistant_messages.sort(key=lambda msg: msg.created_at)
+
+            latest_timestamp = assistant_messages[-1].created_at
+            latest_messages = [
+                msg for msg in assistant_messages if msg.created_at == latest_timestamp
+            ]
+            responses = []
+            for msg in latest_messages:
+                if hasattr(msg.content[0], "text") and hasattr(msg.content[0].text, "value"):
+                    responses.append(msg.content[0].text.value)
+            return "\n".join(responses)
+
+        if run.status in ("failed", "cancelled", "expired"):
+            logging.error("[CHATBOT-MENSA] Assistant run ended with status: %s", run.status)
+            raise ValueError(f"Assistant run ended with status: {run.status}")
+
+        logging.error("[CHATBOT-MENSA] Assistant run did not complete in time.")
+        raise TimeoutError("Assistant run did not complete in time.")
@@ -0,0 +1,166 @@
+"""Queue of incoming chatbot messages, answered by background workers."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections.abc import Iterable
+from typing import Any
+
+import redis.asyncio as redis
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from redis.exceptions import RedisError, ResponseError
+
+from ....database.models.whatsapp import ReceivedWhatsappMessage
+from ....dbs import AsyncSessionsTuple, create_redis_client
+from ....settings import get_settings
+from .client import WhatsappChatBot
+
+STREAM_KEY = "chatbot:messages"
+GROUP_NAME = "chatbot-workers"
+# Messages read by a worker that has not acknowledged them for this long (e.g. because its
+# process died) are taken over by another worker.
+CLAIM_IDLE_MS = 15 * 60 * 1000
+READ_BLOCK_MS = 5000
+REDIS_RETRY_AFTER_SECONDS = 5
+
+_meter = metrics.get_meter(__name__)
+_wait_duration = _meter.create_histogram(
+    "chatbot.queue.wait.duration",
+    unit="ms",
+    description="Time chatbot messages spend queued before a worker picks them up.",
+)
+_processing_duration = _meter.create_histogram(
+    "chatbot.processing.duration",
+    unit="ms",
+    description="Time taken to answer a queued chatbot message.",
+)
+
+
+class ChatbotMessageQueue:
+    """
+    Redis stream of chatbot messages, consumed by a pool of asyncio workers in each process.
+
+    The webhook only validates and enqueues a message, so Twilio gets its response right
+    away while ``chatbot_queue_workers`` tasks per process hold the conversations with the
+    assistant. Messages are acknowledged once answered; those left unacknowledged by a
+    worker that died are claimed by another one after ``CLAIM_IDLE_MS``.
+    """
+
+    _workers: list[asyncio.Task] = []
+    _redis_client: redis.Redis | None = None
+    _redis_loop: asyncio.AbstractEventLoop | None = None
+    _consumer = f"{socket.gethostname()}-{os.getpid()}"
+    _depth = 0
+
+    @classmethod
+    def _get_redis(cls) -> redis.Redis:
+        """Return the Redis client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._redis_client is None or cls._redis_loop is not loop:
+            cls._redis_client, cls._redis_loop = create_redis_client(), loop
+        return cls._redis_client
+
+    @classmethod
+    def _observe_depth(cls, _options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(cls._depth)
+
+    @classmethod
+    async def enqueue(cls, message: ReceivedWhatsappMessage, registration_id: int) -> None:
+        """Add a validated message to the queue."""
+        await cls._get_redis().xadd(
+            STREAM_KEY,
+            {
+                "message": message.model_dump_json(),
+                "registration_id": registration_id,
+                "enqueued_at": time.time(),
+            },
+            maxlen=get_settings().chatbot_queue_max_length,
+            approximate=True,
+        )
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the workers of this process, unless messages are answered inline."""
+        workers = get_settings().chatbot_queue_workers
+        if cls._workers or workers <= 0:
+            return
+        cls._workers = [
+            asyncio.create_task(cls._work(), name=f"chatbot-worker-{i}") for i in range(workers)
+        ]
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the workers; messages being answered are left for other workers to claim."""
+        for worker in cls._workers:
+            worker.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+        cls._workers = []
+
+    @classmethod
+    async def _next_message(cls) -> tuple[str, dict] | None:
+        """Claim a message abandoned by another worker, or wait for the next one."""
+        redis_client = cls._get_redis()
+        _, claimed, _ = await redis_client.xautoclaim(
+            STREAM_KEY, GROUP_NAME, cls._consumer, min_idle_time=CLAIM_IDLE_MS, count=1
+        )
+        if claimed:
+            return claimed[0]
+        response: Any = await redis_client.xreadgroup(
+            GROUP_NAME, cls._consumer, {STREAM_KEY: ">"}, count=1, block=READ_BLOCK_MS
+        )
+        cls._depth = await redis_client.xlen(STREAM_KEY)
+        if not response:
+            return None
+        _, entries = response[0]
+        return entries[0]
+
+    @classmethod
+    async def _process(cls, fields: dict) -> None:
+        _wait_duration.record((time.time() - float(fields["enqueued_at"])) * 1000)
+        start = time.perf_counter()
+        sessions = AsyncSessionsTuple()
+        try:
+            await WhatsappChatBot.chatbot_message(
+                message=ReceivedWhatsappMessage.model_validate_json(fields["message"]),
+                sessions=sessions,
+                registration_id=int(fields["registration_id"]),
+            )
+        finally:
+            await sessions.close()
+            _processing_duration.record((time.perf_counter() - start) * 1000)
+
+    @classmethod
+    async def _work(cls) -> None:
+        while True:
+            try:
+                try:
+                    await cls._get_redis().xgroup_create(
+                        STREAM_KEY, GROUP_NAME, id="0", mkstream=True
+                    )
+                except ResponseError as e:
+                    if "BUSYGROUP" not in str(e):
+                        raise
+                while True:
+                    entry = await cls._next_message()
+                    if entry is None:
+                        continue
+                    entry_id, fields = entry
+                    try:
+                        await cls._process(fields)
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        logging.error("[CHATBOT-QUEUE] Error answering message %s: %s", entry_id, e)
+                    await cls._get_redis().xack(STREAM_KEY, GROUP_NAME, entry_id)
+                    await cls._get_redis().xdel(STREAM_KEY, entry_id)
+            except RedisError as e:
+                logging.warning("[CHATBOT-QUEUE] Redis unavailable, retrying: %s", e)
+                await asyncio.sleep(REDIS_RETRY_AFTER_SECONDS)
+
+
+_meter.create_observable_gauge(
+    "chatbot.queue.depth",
+    callbacks=[ChatbotMessageQueue._observe_depth],
+    description="Chatbot messages queued or being answered, as last seen by this process.",
+)
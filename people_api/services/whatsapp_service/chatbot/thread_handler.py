@@ -1,20 +1,17 @@
 """Thread handler for managing threads and messages."""
 
 import logging
-from datetime import datetime
 
 from fastapi import HTTPException
+from redis.exceptions import LockError
 
 from .openai_service import openai_client
+from .thread_store import ThreadStore
 from .wpp_client_helpers import get_member_info_by_phone_number
 
 
 class ThreadService:
-    """Service for managing threads and messages."""
-
-    threads_by_phone: dict[str, str] = {}
-    message_counts: dict[str, dict[str, int]] = {}
-    thread_timestamps: dict[str, list[datetime]] = {}
+    """Service for managing threads and messages, whose state is kept in ``ThreadStore``."""
 
     @staticmethod
     def check_message_length(message: str):
@@ -25,25 +22,18 @@ class ThreadService:
             )
 
     @staticmethod
-    def check_thread_creation_limit(phone_number: str):
+    async def check_thread_creation_limit(phone_number: str):
         """Ensure a user does not start more than 5 threads per day."""
-        today = datetime.now().date()
-        timestamps = ThreadService.thread_timestamps.get(phone_number, [])
-        threads_today = [ts for ts in timestamps if ts.date() == today]
-        if len(threads_today) >= 5:
+        if await ThreadStore.threads_created_today(phone_number) >= 5:
             raise ValueError(
                 "O limite máximo de sessões por dia foi ultrapassado. Por favor, tente novamente amanhã."
             )
 
     @staticmethod
-    def record_message(phone_number: str, thread_id: str, message: str):
+    async def record_message(phone_number: str, thread_id: str, message: str):
         """Record a message after checking the message length."""
         ThreadService.check_message_length(message)
-        if phone_number not in ThreadService.message_counts:
-            ThreadService.message_counts[phone_number] = {}
-        if thread_id not in ThreadService.message_counts[phone_number]:
-            ThreadService.message_counts[phone_number][thread_id] = 0
-        ThreadService.message_counts[phone_number][thread_id] += 1
+        await ThreadStore.increment_messages(phone_number, thread_id)
 
     @staticmethod
     async def get_or_create_thread(phone_number: str, session) -> str:
@@ -55,25 +45,30 @@ class ThreadService:
         logging.info(
             "[CHATBOT-MENSA] Retrieving or creating thread for phone number: %s", phone_number
         )
-        existing_thread_id = ThreadService.threads_by_phone.get(phone_number)
-        if existing_thread_id:
-            count = ThreadService.message_counts.get(phone_number, {}).get(existing_thread_id, 0)
-            if count < 15:
-                return existing_thread_id
-            try:
-                ThreadService.check_thread_creation_limit(phone_number)
-            except ValueError as e:
-                raise HTTPException(status_code=429, detail=str(e)) from e
+        existing = await ThreadStore.get_thread(phone_number)
+        if existing and existing[1] < 15:
+            return existing[0]
+
+        # Messages of the same phone may reach different workers at once; only one of them
+        # creates the thread and the others use it.
+        try:
+            async with ThreadStore.creation_lock(phone_number):
+                current = await ThreadStore.get_thread(phone_number)
+                if current and current != existing and current[1] < 15:
+                    return current[0]
+                if existing:
+                    try:
+                        await ThreadService.check_thread_creation_limit(phone_number)
+                    except ValueError as e:
+                        raise HTTPException(status_code=429, detail=str(e)) from e
 
-        thread = await openai_client.beta.threads.create()
-        thread_id = thread.id
-        ThreadService.threads_by_phone[phone_number] = thread_id
-        if phone_number not in ThreadService.thread_timestamps:
-            ThreadService.thread_timestamps[phone_number] = []
-        ThreadService.thread_timestamps[phone_number].append(datetime.now())
-        if phone_number not in ThreadService.message_counts:
-            ThreadService.message_counts[phone_number] = {}
-        ThreadService.message_counts[phone_number][thread_id] = 0
+                thread = await openai_client.beta.threads.create()
+                thread_id = thread.id
+                await ThreadStore.set_thread(phone_number, thread_id)
+        except LockError as e:
+            raise HTTPException(
+                status_code=503, detail="Thread creation is taking too long, try again later."
+            ) from e
 
         user_details = await get_member_info_by_phone_number(phone_number, session)
 
@@ -0,0 +1,123 @@
+"""Chatbot conversation state shared by all API workers through Redis."""
+
+import asyncio
+from datetime import date
+
+import redis.asyncio as redis
+from redis.asyncio.lock import Lock
+
+from ....dbs import create_redis_client
+from ....settings import get_settings
+
+KEY_PREFIX = "chatbot:"
+# Thread creation may wait this long for another worker creating a thread for the same phone
+CREATION_LOCK_TIMEOUT_SECONDS = 30
+CREATION_LOCK_WAIT_SECONDS = 10
+
+
+class ThreadStore:
+    """
+    Assistant thread of each phone number, its message count, the threads created per day
+    and the error notifications sent, stored in Redis.
+
+    All keys expire: a phone's thread and its count after ``chatbot_thread_ttl`` seconds
+    without messages, daily thread counters after two days and error notifications after
+    ``chatbot_error_notification_ttl`` seconds. Counters are incremented atomically, so
+    concurrent messages handled by different workers are all counted.
+    """
+
+    _redis_client: redis.Redis | None = None
+    _redis_loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def _get_redis(cls) -> redis.Redis:
+        """Return the Redis client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._redis_client is None or cls._redis_loop is not loop:
+            cls._redis_client, cls._redis_loop = create_redis_client(), loop
+        return cls._redis_client
+
+    @staticmethod
+    def _thread_key(phone_number: str) -> str:
+        return f"{KEY_PREFIX}thread:{phone_number}"
+
+    @staticmethod
+    def _messages_key(thread_id: str) -> str:
+        return f"{KEY_PREFIX}messages:{thread_id}"
+
+    @staticmethod
+    def _created_key(phone_number: str, day: date) -> str:
+        return f"{KEY_PREFIX}threads_created:{phone_number}:{day.isoformat()}"
+
+    @staticmethod
+    def _error_key(phone_number: str) -> str:
+        return f"{KEY_PREFIX}error_notified:{phone_number}"
+
+    @classmethod
+    async def get_thread(cls, phone_number: str) -> tuple[str, int] | None:
+        """Return the current thread ID of a phone number and its message count, if any."""
+        thread_id = await cls._get_redis().get(cls._thread_key(phone_number))
+        if not isinstance(thread_id, str):
+            return None
+        count = await cls._get_redis().get(cls._messages_key(thread_id))
+        return thread_id, int(count or 0)
+
+    @classmethod
+    async def set_thread(cls, phone_number: str, thread_id: str) -> None:
+        """Make ``thread_id`` the current thread of a phone number and count its creation."""
+        ttl = get_settings().chatbot_thread_ttl
+        created_key = cls._created_key(phone_number, date.today())
+        async with cls._get_redis().pipeline() as pipe:
+            pipe.set(cls._thread_key(phone_number), thread_id, ex=ttl)
+            pipe.set(cls._messages_key(thread_id), 0, ex=ttl)
+            pipe.incr(created_key)
+            pipe.expire(created_key, 2 * 86400)
+            await pipe.execute()
+
+    @classmethod
+    async def delete_thread(cls, phone_number: str) -> None:
+        """Forget the current thread of a phone number, so the next message starts a new one."""
+        await cls._get_redis().delete(cls._thread_key(phone_number))
+
+    @classmethod
+    async def increment_messages(cls, phone_number: str, thread_id: str) -> int:
+        """Count a message sent to a thread and return the thread's new message count."""
+        ttl = get_settings().chatbot_thread_ttl
+        async with cls._get_redis().pipeline() as pipe:
+            pipe.incr(cls._messages_key(thread_id))
+            pipe.expire(cls._messages_key(thread_id), ttl)
+            pipe.expire(cls._thread_key(phone_number), ttl)
+            count, *_ = await pipe.execute()
+        return count
+
+    @classmethod
+    async def threads_created_today(cls, phone_number: str) -> int:
+        """Return the number of threads created today for a phone number."""
+        count = await cls._get_redis().get(cls._created_key(phone_number, date.today()))
+        return int(count or 0)
+
+    @classmethod
+    def creation_lock(cls, phone_number: str) -> Lock:
+        """Return the lock held while creating a thread for a phone number."""
+        return cls._get_redis().lock(
+            f"{KEY_PREFIX}creating:{phone_number}",
+            timeout=CREATION_LOCK_TIMEOUT_SECONDS,
+            blocking_timeout=CREATION_LOCK_WAIT_SECONDS,
+        )
+
+    @classmethod
+    async def mark_error_notified(cls, phone_number: str, error: str) -> bool:
+        """Record an error notification; return False if one is already recorded."""
+        return bool(
+            await cls._get_redis().set(
+                cls._error_key(phone_number),
+                error,
+                nx=True,
+                ex=get_settings().chatbot_error_notification_ttl,
+            )
+        )
+
+    @classmethod
+    async def clear_error_notified(cls, phone_number: str) -> None:
+        """Allow the next error of a phone number to be notified again."""
+        await cls._get_redis().delete(cls._error_key(phone_number))
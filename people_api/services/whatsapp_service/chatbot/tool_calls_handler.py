@@ -1,13 +1,28 @@
 """This module contains the tool calls (functions) for the WhatsApp chatbot."""
 
+import asyncio
+import itertools
 import json
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from enum import StrEnum
+from typing import Any
 
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from openai.types.beta.threads.required_action_function_tool_call import (
+    RequiredActionFunctionToolCall,
+)
 from openai.types.beta.threads.run import Run
 from openai.types.beta.threads.run_submit_tool_outputs_params import ToolOutput
+from opentelemetry import metrics
+from pydantic import ValidationError
 
+from people_api.dbs import AsyncSessionsTuple
 from people_api.services.whatsapp_service.chatbot.openai_service import openai_client
+from people_api.settings import get_settings
 
 from .wpp_client_helpers import (
     add_member_legal_reps,
@@ -25,6 +40,13 @@ from .wpp_client_helpers import (
     update_member_legal_reps,
 )
 
+_meter = metrics.get_meter(__name__)
+_tool_call_duration = _meter.create_histogram(
+    "chatbot.tool_call.duration",
+    unit="ms",
+    description="Duration of chatbot tool calls, by tool and outcome.",
+)
+
 
 class FunctionCall(StrEnum):
     """Enum for function calls used in the WhatsApp chatbot."""
@@ -44,181 +66,232 @@ class FunctionCall(StrEnum):
     GIVE_ZELADOR_FEEDBACK = "give_zelador_feedback"
 
 
+# Each tool is called with the member's registration ID, the call's arguments and the
+# sessions to use. Helpers are looked up when called, so they can be replaced.
+ToolHandler = Callable[[int, dict, AsyncSessionsTuple], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Tool:
+    """A function the assistant can call, and whether it changes data or sends anything."""
+
+    handler: ToolHandler
+    mutates: bool = False
+
+
+TOOLS: dict[FunctionCall, Tool] = {
+    FunctionCall.CREATE_EMAIL: Tool(
+        lambda registration_id, _, sessions: create_email_request(
+            registration_id=registration_id, sessions=sessions
+        ),
+        mutates=True,
+    ),
+    FunctionCall.RECOVER_EMAIL_PASSWORD: Tool(
+        lambda registration_id, _, sessions: recover_email_password_request(
+            registration_id=registration_id, sessions=sessions
+        ),
+        mutates=True,
+    ),
+    FunctionCall.GET_MEMBER_ADDRESSES: Tool(
+        lambda registration_id, _, sessions: get_member_addresses_request(
+            registration_id=registration_id, sessions=sessions
+        )
+    ),
+    FunctionCall.UPDATE_ADDRESS: Tool(
+        lambda registration_id, args, sessions: update_address_request(
+            registration_id=registration_id,
+            address=args.get("updated_address", {}),
+            address_id=args["address_id"],
+            sessions=sessions,
+        ),
+        mutates=True,
+    ),
+    FunctionCall.GET_MEMBER_LEGAL_REPS: Tool(
+        lambda registration_id, _, sessions: get_member_legal_reps(
+            registration_id=registration_id, sessions=sessions
+        )
+    ),
+    FunctionCall.ADD_MEMBER_LEGAL_REPS: Tool(
+        lambda registration_id, args, sessions: add_member_legal_reps(
+            registration_id=registration_id,
+            legal_representative=args.get("legal_representative", {}),
+            sessions=sessions,
+        ),
+        mutates=True,
+    ),
+    FunctionCall.UPDATE_MEMBER_LEGAL_REPS: Tool(
+        lambda registration_id, args, sessions: update_member_legal_reps(
+            registration_id=registration_id,
+            legal_representative_id=args["legal_representative_id"],
+            legal_representative=args.get("legal_representative", {}),
+            sessions=sessions,
+        ),
+        mutates=True,
+    ),
+    FunctionCall.DELETE_MEMBER_LEGAL_REPS: Tool(
+        lambda registration_id, args, sessions: delete_member_legal_reps(
+            registration_id=registration_id,
+            legal_representative_id=args["legal_representative_id"],
+            sessions=sessions,
+        ),
+        mutates=True,
+    ),
+    FunctionCall.GET_ALL_WHATSAPP_GROUPS: Tool(
+        lambda registration_id, _, sessions: get_all_whatsapp_groups(
+            registration_id=registration_id, sessions=sessions
+        )
+    ),
+    FunctionCall.REQUEST_WHATSAPP_GROUP_JOIN: Tool(
+        lambda registration_id, args, sessions: request_whatsapp_group_join(
+            registration_id=registration_id, group_id=args["group_id"], sessions=sessions
+        ),
+        mutates=True,
+    ),
+    FunctionCall.GET_PENDING_WHATSAPP_GROUP_JOIN_REQUESTS: Tool(
+        lambda registration_id, _, sessions: get_pending_whatsapp_group_join_requests(
+            registration_id=registration_id, sessions=sessions
+        )
+    ),
+    FunctionCall.GET_FAILED_WHATSAPP_GROUP_JOIN_REQUESTS: Tool(
+        lambda registration_id, _, sessions: get_failed_whatsapp_group_join_requests(
+            registration_id=registration_id, sessions=sessions
+        )
+    ),
+    FunctionCall.GIVE_ZELADOR_FEEDBACK: Tool(
+        lambda registration_id, args, sessions: send_feedback_to_api(
+            registration_id=registration_id,
+            feedback_text=args["feedback"],
+            feedback_type=args["feedback_type"],
+            feedback_target=args.get("feedback_target", "chatbot"),
+            sessions=sessions,
+        ),
+        mutates=True,
+    ),
+}
+
+
 class ToolCallService:
     """
     This class handles the tool calls for the WhatsApp chatbot.
     """
 
     @staticmethod
-    async def handle_tool_calls(run: Run, registration_id: int) -> Run:
+    def _mutates(tool_call: RequiredActionFunctionToolCall) -> bool:
+        try:
+            return TOOLS[FunctionCall(tool_call.function.name)].mutates
+        except ValueError:
+            return False
+
+    @staticmethod
+    async def call_tool(
+        tool_call: RequiredActionFunctionToolCall,
+        registration_id: int,
+        sessions: AsyncSessionsTuple,
+    ) -> Any:
+        """
+        Run one tool call through the services and return its JSON-compatible output.
+
+        Writes are committed when the tool succeeds. Errors the API would have answered with
+        are returned to the assistant as the body of that response.
+        """
+        name = tool_call.function.name
+        logging.info(
+            "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
+            name,
+            tool_call.function.arguments,
+        )
+        start = time.perf_counter()
+        try:
+            tool = TOOLS[FunctionCall(name)]
+        except ValueError:
+            logging.warning("[CHATBOT-MENSA] Unknown tool call: %s", name)
+            _tool_call_duration.record(
+                (time.perf_counter() - start) * 1000, {"tool": name, "outcome": "unknown"}
+            )
+            return {"detail": f"Unknown function: {name}"}
+
+        outcome = "error"
+        try:
+            output = await tool.handler(
+                registration_id, json.loads(tool_call.function.arguments or "{}"), sessions
+            )
+            if sessions.has_pending_writes():
+                await sessions.rw.commit()
+            outcome = "success"
+        except HTTPException as e:
+            await sessions.rollback()
+            return {"detail": e.detail}
+        except ValidationError as e:
+            await sessions.rollback()
+            return {"detail": json.loads(e.json(include_url=False))}
+        except KeyError as e:
+            await sessions.rollback()
+            return {"detail": f"Missing argument: {e.args[0]}"}
+        except Exception:
+            await sessions.rollback()
+            raise
+        finally:
+            _tool_call_duration.record(
+                (time.perf_counter() - start) * 1000, {"tool": name, "outcome": outcome}
+            )
+        return jsonable_encoder(output)
+
+    @staticmethod
+    async def run_tool_calls(
+        tool_calls: list[RequiredActionFunctionToolCall],
+        registration_id: int,
+        sessions: AsyncSessionsTuple,
+    ) -> list[Any]:
+        """
+        Return the outputs of ``tool_calls``, in the same order.
+
+        Consecutive calls that only read run concurrently, up to
+        ``chatbot_tool_call_concurrency`` at a time, each with sessions of its own. Calls
+        that change data run one at a time with the conversation's sessions, after the calls
+        requested before them and before those requested after them.
+        """
+        semaphore = asyncio.Semaphore(get_settings().chatbot_tool_call_concurrency)
+
+        async def read(tool_call: RequiredActionFunctionToolCall) -> Any:
+            async with semaphore:
+                read_sessions = AsyncSessionsTuple()
+                try:
+                    return await ToolCallService.call_tool(
+                        tool_call, registration_id, read_sessions
+                    )
+                finally:
+                    await read_sessions.close()
+
+        outputs: list[Any] = []
+        for mutates, group in itertools.groupby(tool_calls, key=ToolCallService._mutates):
+            if mutates:
+                for tool_call in group:
+                    outputs.append(
+                        await ToolCallService.call_tool(tool_call, registration_id, sessions)
+                    )
+            else:
+                outputs.extend(await asyncio.gather(*(read(tool_call) for tool_call in group)))
+        return outputs
+
+    @staticmethod
+    async def handle_tool_calls(
+        run: Run, registration_id: int, sessions: AsyncSessionsTuple
+    ) -> Run:
         """
         Handle the tool call response from the assistant.
         This function will be called when the assistant requires action.
         """
 
-        call_responses: dict = {}
-
         if (
             run.required_action is not None
             and getattr(run.required_action, "submit_tool_outputs", None) is not None
         ):
             tool_calls = run.required_action.submit_tool_outputs.tool_calls
-
-            for tool_call in tool_calls:
-                if tool_call.function.name == FunctionCall.CREATE_EMAIL:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[f"{tool_call.id}"] = await create_email_request(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.RECOVER_EMAIL_PASSWORD:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[f"{tool_call.id}"] = await recover_email_password_request(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.GET_MEMBER_ADDRESSES:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[f"{tool_call.id}"] = await get_member_addresses_request(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.UPDATE_ADDRESS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    args = json.loads(tool_call.function.arguments)
-                    address_id = args.get("address_id")
-                    updated_address = args.get("updated_address", {})
-                    call_responses[f"{tool_call.id}"] = await update_address_request(
-                        registration_id=registration_id,
-                        address=updated_address,
-                        address_id=address_id,
-                    )
-                if tool_call.function.name == FunctionCall.GET_MEMBER_LEGAL_REPS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[f"{tool_call.id}"] = await get_member_legal_reps(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.ADD_MEMBER_LEGAL_REPS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    args = json.loads(tool_call.function.arguments)
-                    legal_representative = args.get("legal_representative", {})
-                    call_responses[f"{tool_call.id}"] = await add_member_legal_reps(
-                        registration_id=registration_id,
-                        legal_representative=legal_representative,
-                    )
-                if tool_call.function.name == FunctionCall.UPDATE_MEMBER_LEGAL_REPS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    args = json.loads(tool_call.function.arguments)
-                    legal_representative_id = args.get("legal_representative_id")
-                    legal_representative = args.get("legal_representative", {})
-                    call_responses[f"{tool_call.id}"] = await update_member_legal_reps(
-                        registration_id=registration_id,
-                        legal_representative_id=legal_representative_id,
-                        legal_representative=legal_representative,
-                    )
-                if tool_call.function.name == FunctionCall.DELETE_MEMBER_LEGAL_REPS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    args = json.loads(tool_call.function.arguments)
-                    legal_representative_id = args.get("legal_representative_id")
-                    call_responses[f"{tool_call.id}"] = await delete_member_legal_reps(
-                        registration_id=registration_id,
-                        legal_representative_id=legal_representative_id,
-                    )
-                if tool_call.function.name == FunctionCall.GET_ALL_WHATSAPP_GROUPS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[f"{tool_call.id}"] = await get_all_whatsapp_groups(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.REQUEST_WHATSAPP_GROUP_JOIN:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    args = json.loads(tool_call.function.arguments)
-                    group_id = args.get("group_id")
-                    call_responses[f"{tool_call.id}"] = await request_whatsapp_group_join(
-                        registration_id=registration_id,
-                        group_id=group_id,
-                    )
-                if tool_call.function.name == FunctionCall.GET_PENDING_WHATSAPP_GROUP_JOIN_REQUESTS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[
-                        f"{tool_call.id}"
-                    ] = await get_pending_whatsapp_group_join_requests(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.GET_FAILED_WHATSAPP_GROUP_JOIN_REQUESTS:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    call_responses[
-                        f"{tool_call.id}"
-                    ] = await get_failed_whatsapp_group_join_requests(
-                        registration_id=registration_id
-                    )
-                if tool_call.function.name == FunctionCall.GIVE_ZELADOR_FEEDBACK:
-                    logging.info(
-                        "[CHATBOT-MENSA] Tool call detected: %s with arguments: %s",
-                        tool_call.function.name,
-                        tool_call.function.arguments,
-                    )
-                    args = json.loads(tool_call.function.arguments)
-                    feedback_text = args.get("feedback")
-                    feedback_type = args.get("feedback_type")
-                    feedback_target = args.get("feedback_target")
-                    call_responses[f"{tool_call.id}"] = await send_feedback_to_api(
-                        registration_id=registration_id,
-                        feedback_text=feedback_text,
-                        feedback_type=feedback_type,
-                        feedback_target=feedback_target,
-                    )
+            outputs = await ToolCallService.run_tool_calls(tool_calls, registration_id, sessions)
 
             tool_outputs = [
-                ToolOutput(
-                    tool_call_id=str(tool_call_id),
-                    output=json.dumps(output),
-                )
-                for tool_call_id, output in call_responses.items()
+                ToolOutput(tool_call_id=str(tool_call.id), output=json.dumps(output))
+                for tool_call, output in zip(tool_calls, outputs)
             ]
 
             logging.info("Submitting tool outputs to assistant: %s", tool_outputs)
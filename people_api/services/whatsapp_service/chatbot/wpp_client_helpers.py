@@ -3,16 +3,27 @@
 import logging
 from datetime import date
 
-import httpx
+from fastapi import HTTPException
 from pydantic import BaseModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from people_api.auth import create_token
-from people_api.database.models.models import Emails, Registration
+from people_api.database.models.feedback import FeedbackCreate
+from people_api.database.models.models import (
+    Addresses,
+    Emails,
+    LegalRepresentatives,
+    Registration,
+)
+from people_api.dbs import AsyncSessionsTuple
+from people_api.models.member import GroupJoinRequest
+from people_api.schemas import UserToken
+from people_api.services.address_service import AddressService
+from people_api.services.email_service import EmailService
+from people_api.services.feedback_service import FeedbackService
+from people_api.services.group_service import GroupService
+from people_api.services.legal_representative_service import LegalRepresentativeService
 from people_api.services.membership_payment_service import MembershipPaymentService
 
-from ....settings import get_settings
-
 
 class MemberInfo(BaseModel):
     """Model for member information."""
@@ -54,265 +65,227 @@ async def get_member_info_by_phone_number(phone_number: str, session: AsyncSessi
     )
 
 
-async def create_email_request(registration_id: int) -> dict:
-    """Send a post request to an endpoint for email creation."""
-    logging.info("[CHATBOT-MENSA] Creating email for registration ID: %s", registration_id)
-    token = create_token(registration_id=registration_id)
+async def get_member_token(registration_id: int, session: AsyncSession) -> UserToken:
+    """
+    Return the token data tool calls act with: the member's registration ID and Mensa email,
+    as in the token the member would log in with.
+    """
+    email_result = (await session.exec(Emails.get_emails_for_member(registration_id))).all()
+    for email in email_result:
+        if email.email_address and email.email_address.endswith("@mensa.org.br"):
+            email_mensa = str(email.email_address)
+            break
+    else:
+        email_mensa = None
 
-    logging.info("[CHATBOT-MENSA] Sending request to create email...")
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"http://localhost:{get_settings().api_port}/emailrequest/",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    return UserToken(
+        email=email_mensa,
+        registration_id=registration_id,
+        iss="mensa_api",
+        sub=str(registration_id),
+    )
+
+
+async def create_email_request(registration_id: int, sessions: AsyncSessionsTuple) -> dict:
+    """Create the Mensa email of a member."""
+    logging.info("[CHATBOT-MENSA] Creating email for registration ID: %s", registration_id)
+    return await EmailService.request_email_creation(
+        registration_id=registration_id, session=sessions.rw
+    )
 
 
 async def recover_email_password_request(
-    registration_id: int,
+    registration_id: int, sessions: AsyncSessionsTuple
 ) -> dict:
-    """Send a post request to an endpoint for email password recovery."""
+    """Reset the password of a member's Mensa email."""
     logging.info(
         "[CHATBOT-MENSA] Recovering email password for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"http://localhost:{get_settings().api_port}/emailreset/",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    token_data = await get_member_token(registration_id, sessions.ro)
+    return await EmailService.request_password_reset(
+        email=token_data.email or "", registration_id=registration_id, session=sessions.ro
+    )
 
 
-async def get_member_addresses_request(registration_id: int) -> dict:
-    """Send a GET request to retrieve member addresses."""
+async def get_member_addresses_request(
+    registration_id: int, sessions: AsyncSessionsTuple
+) -> list | dict:
+    """Retrieve the addresses of a member."""
     logging.info("[CHATBOT-MENSA] Getting addresses for registration ID: %s", registration_id)
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"http://localhost:{get_settings().api_port}/address/",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        data = response.json()
-        if data == []:
-            logging.info("[CHATBOT-MENSA] No addresses registered for this member.")
-            return {"message": "No addresses registered for this member."}
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", data)
-        return data
-
-
-async def update_address_request(registration_id: int, address_id: int, address: dict) -> dict:
-    """Send a PUT request to update member address."""
+    token_data = await get_member_token(registration_id, sessions.ro)
+    if not token_data.email:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    data = await AddressService.get_addresses(token_data, sessions.ro)
+    if not data:
+        logging.info("[CHATBOT-MENSA] No addresses registered for this member.")
+        return {"message": "No addresses registered for this member."}
+    return data
+
+
+async def update_address_request(
+    registration_id: int, address_id: int, address: dict, sessions: AsyncSessionsTuple
+) -> dict:
+    """Update an address of a member."""
     logging.info("[CHATBOT-MENSA] Updating address for registration ID: %s", registration_id)
-    token = create_token(registration_id=registration_id)
+    token_data = await get_member_token(registration_id, sessions.ro)
+    if not token_data.email:
+        raise HTTPException(status_code=401, detail="Unauthorized")
 
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"http://localhost:{get_settings().api_port}/address/{registration_id}/{address_id}",
-            headers={"Authorization": f"Bearer {token}"},
-            json=address,
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    updated_address = Addresses.model_validate({**address, "registration_id": registration_id})
+    return await AddressService.update_address(
+        registration_id, address_id, updated_address, token_data.email, sessions.rw
+    )
 
 
-async def get_member_legal_reps(registration_id: int) -> dict:
-    """Send a GET request to retrieve member legal representatives."""
+async def get_member_legal_reps(registration_id: int, sessions: AsyncSessionsTuple) -> list | dict:
+    """Retrieve the legal representatives of a member."""
     logging.info(
         "[CHATBOT-MENSA] Getting legal representatives for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"http://localhost:{get_settings().api_port}/legal_representative/",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        data = response.json()
-        if not data or (isinstance(data, list) and len(data) == 0):
-            logging.info("[CHATBOT-MENSA] No legal representatives registered for this member.")
-            return {"message": "No legal representatives registered for this member."}
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", data)
-        return data
-
-
-async def add_member_legal_reps(registration_id: int, legal_representative: dict) -> dict:
-    """Send a POST request to add a legal representative for a member."""
+    token_data = await get_member_token(registration_id, sessions.ro)
+    data = await LegalRepresentativeService.get_legal_representatives(token_data, sessions.ro)
+    if not data:
+        logging.info("[CHATBOT-MENSA] No legal representatives registered for this member.")
+        return {"message": "No legal representatives registered for this member."}
+    return data
+
+
+async def add_member_legal_reps(
+    registration_id: int, legal_representative: dict, sessions: AsyncSessionsTuple
+) -> dict:
+    """Add a legal representative to a member."""
     logging.info(
         "[CHATBOT-MENSA] Adding legal representative for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"http://localhost:{get_settings().api_port}/legal_representative/{registration_id}",
-            headers={"Authorization": f"Bearer {token}"},
-            json=legal_representative,
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    token_data = await get_member_token(registration_id, sessions.ro)
+    new_legal_rep = LegalRepresentatives.model_validate(
+        {**legal_representative, "registration_id": registration_id}
+    )
+    return await LegalRepresentativeService.add_legal_representative(
+        registration_id, new_legal_rep, token_data, sessions.rw
+    )
 
 
 async def update_member_legal_reps(
-    registration_id: int, legal_representative_id: int, legal_representative: dict
+    registration_id: int,
+    legal_representative_id: int,
+    legal_representative: dict,
+    sessions: AsyncSessionsTuple,
 ) -> dict:
-    """Send a PUT request to update member legal representative."""
+    """Update a legal representative of a member."""
     logging.info(
         "[CHATBOT-MENSA] Updating legal representative for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"http://localhost:{get_settings().api_port}/legal_representative/{registration_id}/{legal_representative_id}",
-            headers={"Authorization": f"Bearer {token}"},
-            json=legal_representative,
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    token_data = await get_member_token(registration_id, sessions.ro)
+    updated_legal_rep = LegalRepresentatives.model_validate(
+        {**legal_representative, "registration_id": registration_id}
+    )
+    return await LegalRepresentativeService.update_legal_representative(
+        registration_id, legal_representative_id, updated_legal_rep, token_data, sessions.rw
+    )
 
 
-async def delete_member_legal_reps(registration_id: int, legal_representative_id: int) -> dict:
-    """Send a DELETE request to remove a legal representative from a member."""
+async def delete_member_legal_reps(
+    registration_id: int, legal_representative_id: int, sessions: AsyncSessionsTuple
+) -> dict:
+    """Remove a legal representative from a member."""
     logging.info(
         "[CHATBOT-MENSA] Deleting legal representative %s for registration ID: %s",
         legal_representative_id,
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"http://localhost:{get_settings().api_port}/legal_representative/{registration_id}/{legal_representative_id}",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    token_data = await get_member_token(registration_id, sessions.ro)
+    return await LegalRepresentativeService.delete_legal_representative(
+        registration_id, legal_representative_id, token_data, sessions.rw
+    )
 
 
-async def get_all_whatsapp_groups(registration_id: int) -> dict:
-    """Send a GET request to retrieve all WhatsApp groups a member can join."""
+async def get_all_whatsapp_groups(
+    registration_id: int, sessions: AsyncSessionsTuple
+) -> list | dict:
+    """Retrieve all WhatsApp groups a member can join."""
     logging.info(
         "[CHATBOT-MENSA] Getting all WhatsApp groups for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"http://localhost:{get_settings().api_port}/get_can_participate",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        data = response.json()
-        if not data or (isinstance(data, list) and len(data) == 0):
-            logging.info("[CHATBOT-MENSA] No WhatsApp groups found.")
-            return {"message": "No WhatsApp groups found."}
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", data)
-        return data
-
-
-async def request_whatsapp_group_join(registration_id: int, group_id: str) -> dict:
-    """Send a POST request to request joining a WhatsApp group using GroupJoinRequest model."""
+    token_data = await get_member_token(registration_id, sessions.ro)
+    data = await GroupService.get_can_participate(token_data, sessions.ro)
+    if not data:
+        logging.info("[CHATBOT-MENSA] No WhatsApp groups found.")
+        return {"message": "No WhatsApp groups found."}
+    return data
+
+
+async def request_whatsapp_group_join(
+    registration_id: int, group_id: str, sessions: AsyncSessionsTuple
+) -> dict:
+    """Request to join a WhatsApp group for a member."""
     logging.info(
         "[CHATBOT-MENSA] Requesting to join WhatsApp group %s for registration ID: %s",
         group_id,
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    payload = {"group_id": group_id}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"http://localhost:{get_settings().api_port}/request_join_group",
-            headers={"Authorization": f"Bearer {token}"},
-            json=payload,
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    token_data = await get_member_token(registration_id, sessions.ro)
+    return await GroupService.request_join_group(
+        GroupJoinRequest(group_id=group_id), token_data, sessions.rw
+    )
 
 
-async def get_pending_whatsapp_group_join_requests(registration_id: int) -> dict:
-    """Send a GET request to retrieve pending WhatsApp group join requests."""
+async def get_pending_whatsapp_group_join_requests(
+    registration_id: int, sessions: AsyncSessionsTuple
+) -> list | dict:
+    """Retrieve the pending WhatsApp group join requests of a member."""
     logging.info(
         "[CHATBOT-MENSA] Getting pending WhatsApp group join requests for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"http://localhost:{get_settings().api_port}/get_pending_requests",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        data = response.json()
-        if not data or (isinstance(data, list) and len(data) == 0):
-            logging.info("[CHATBOT-MENSA] No pending WhatsApp group join requests found.")
-            return {"message": "No pending WhatsApp group join requests found."}
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", data)
-        return data
-
-
-async def get_failed_whatsapp_group_join_requests(registration_id: int) -> dict:
-    """Send a GET request to retrieve failed WhatsApp group join requests."""
+    token_data = await get_member_token(registration_id, sessions.ro)
+    data = await GroupService.get_pending_requests(token_data, sessions.ro)
+    if not data:
+        logging.info("[CHATBOT-MENSA] No pending WhatsApp group join requests found.")
+        return {"message": "No pending WhatsApp group join requests found."}
+    return data
+
+
+async def get_failed_whatsapp_group_join_requests(
+    registration_id: int, sessions: AsyncSessionsTuple
+) -> list | dict:
+    """Retrieve the failed WhatsApp group join requests of a member."""
     logging.info(
         "[CHATBOT-MENSA] Getting failed WhatsApp group join requests for registration ID: %s",
         registration_id,
     )
-    token = create_token(registration_id=registration_id)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"http://localhost:{get_settings().api_port}/get_failed_requests",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        data = response.json()
-        if not data or (isinstance(data, list) and len(data) == 0):
-            logging.info("[CHATBOT-MENSA] No failed WhatsApp group join requests found.")
-            return {"message": "No failed WhatsApp group join requests found."}
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", data)
-        return data
+    token_data = await get_member_token(registration_id, sessions.ro)
+    data = await GroupService.get_failed_requests(token_data, sessions.ro)
+    if not data:
+        logging.info("[CHATBOT-MENSA] No failed WhatsApp group join requests found.")
+        return {"message": "No failed WhatsApp group join requests found."}
+    return data
 
 
 async def send_feedback_to_api(
-    registration_id: int, feedback_text: str, feedback_type: str, feedback_target: str = "chatbot"
+    registration_id: int,
+    feedback_text: str,
+    feedback_type: str,
+    sessions: AsyncSessionsTuple,
+    feedback_target: str = "chatbot",
 ) -> dict:
-    """Send feedback to the API endpoint."""
+    """Record feedback given by a member."""
     logging.info("[CHATBOT-MENSA] Sending feedback to API for registration ID: %s", registration_id)
-    token = create_token(registration_id=registration_id)
-    payload = {
-        "registration_id": registration_id,
-        "feedback_text": feedback_text,
-        "feedback_type": feedback_type,
-        "feedback_target": feedback_target,
-    }
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"http://localhost:{get_settings().api_port}/feedback/",
-            headers={"Authorization": f"Bearer {token}"},
-            json=payload,
-        )
-        logging.info("[CHATBOT-MENSA] Response status code: %s", response.status_code)
-        logging.info("[CHATBOT-MENSA] Response content: %s", response.json())
-        return response.json()
+    token_data = await get_member_token(registration_id, sessions.ro)
+    feedback_data = FeedbackCreate.model_validate(
+        {
+            "registration_id": registration_id,
+            "feedback_text": feedback_text,
+            "feedback_type": feedback_type,
+            "feedback_target": feedback_target,
+        }
+    )
+    return await FeedbackService.process_feedback(
+        feedback_data=feedback_data, token_data=token_data, session=sessions.rw
+    )
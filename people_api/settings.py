@@ -27,6 +27,32 @@ class Settings(BaseSettings):
     postgres_ro_user: str
     postgres_ro_password: str
 
+    # Async connection pools, one per process for each of the read-write and read-only roles
+    db_pool_size: int = 5
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_statement_cache_size: int = 100
+    # Connections idle for at least this long are pinged before being handed out
+    db_pre_ping_idle_seconds: float = 30
+
+    # OTLP gRPC endpoint receiving the API metrics, e.g. "http://otel-collector:4317"
+    otel_metrics_endpoint: str | None = None
+
+    # Payload capture by OtelLoggingMiddleware: size of the copied head of text bodies, and
+    # share of requests (per route template, and for 5xx responses) that attach it to spans
+    otel_payload_max_bytes: int = 4096
+    otel_payload_sample_rate: float = 0.1
+    otel_payload_error_sample_rate: float = 1.0
+    otel_payload_route_sample_rates: dict[str, float] = {}
+
+    # /data/query safeguards: most rows a request returns, rows fetched per round trip from
+    # the server-side cursor, and the default and maximum statement timeout
+    data_query_max_rows: int = 100_000
+    data_query_batch_size: int = 1000
+    data_query_timeout_ms: int = 30_000
+    data_query_max_timeout_ms: int = 300_000
+
     data_route_api_key: str
     whatsapp_route_api_key: str
 
@@ -34,6 +60,16 @@ class Settings(BaseSettings):
 
     openai_api_key: str
     chatgpt_assistant_id: str
+    # Seconds a chatbot thread is kept without messages, and an error notification is
+    # remembered so the user is not notified of the same failure again
+    chatbot_thread_ttl: int = 86400
+    chatbot_error_notification_ttl: int = 3600
+    # Workers answering queued chatbot messages in each process; 0 answers them inline in
+    # the webhook request
+    chatbot_queue_workers: int = 4
+    chatbot_queue_max_length: int = 10000
+    # Read-only tool calls of one assistant run executed at the same time
+    chatbot_tool_call_concurrency: int = 4
 
     twilio_account_sid: str
     twilio_auth_token: str
@@ -42,6 +78,20 @@ class Settings(BaseSettings):
     redis_host: str = "redis"
     redis_port: int = 6379
 
+    auth_cache_ttl: int = 300
+    auth_cache_local_ttl: int = 5
+    auth_cache_max_entries: int = 1024
+
+    authorization_status_cache_ttl: int = 300
+    authorization_status_cache_max_entries: int = 4096
+
+    # Certificates are rendered in this many worker processes (0 renders in a thread) and
+    # cached in Redis by content for a day, as they carry the issue date
+    certificate_render_workers: int = 2
+    certificate_cache_ttl: int = 86400
+    # Stored certificate tokens older than this are read again from Firestore
+    certificate_token_max_age: int = 86400
+
     discord_client_id: str
     discord_client_secret: str
     discord_redirect_uri: str
@@ -87,6 +137,12 @@ class SMTPSettings(BaseSettings):
     smtp_port: int
     smtp_username: str
     smtp_password: str
+    smtp_starttls: bool = True
+    smtp_timeout: float = 30
+    smtp_pool_size: int = 4
+    smtp_max_idle_seconds: float = 60
+    smtp_max_retries: int = 3
+    smtp_retry_backoff: float = 1.0
 
 
 class WhatsAppGroupsSettings(BaseSettings):
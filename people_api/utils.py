@@ -17,18 +17,39 @@ from babel.dates import Locale, format_date
 from botocore.exceptions import ClientError
 from PIL import Image, ImageDraw, ImageFont
 
+from .resources import lazy_resource
 from .settings import get_settings
 
 __all__ = ("get_time", "get_uuid")
 
-# Cache static resources if they don't change
-CERT_TEMPLATE = Image.open("certificado.png")
-FONT_LARGE = ImageFont.truetype("arialbd.ttf", 130)
-FONT_MEDIUM = ImageFont.truetype("arialbd.ttf", 90)
-FONT_SMALL = ImageFont.truetype("arialbd.ttf", 60)
 LOCALE = Locale("pt_BR")
 
 
+# Text positions and font sizes below are given for a template of this size, and scaled
+CERTIFICATE_BASE_SIZE = (5000, 3462)
+
+# Output formats of ``create_certificate``: Pillow format, media type and save options
+CERTIFICATE_FORMATS = {
+    "png": ("PNG", "image/png", {}),
+    "webp": ("WEBP", "image/webp", {"quality": 90}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 90}),
+}
+
+
+@lazy_resource("certificate_assets")
+def get_certificate_assets():
+    """Load the certificate template and its fonts, scaled to its resolution, once."""
+    template = Image.open("certificado.png")
+    template.load()
+    scale_y = template.height / CERTIFICATE_BASE_SIZE[1]
+    return (
+        template,
+        ImageFont.truetype("arialbd.ttf", int(130 * scale_y)),
+        ImageFont.truetype("arialbd.ttf", int(90 * scale_y)),
+        ImageFont.truetype("arialbd.ttf", int(60 * scale_y)),
+    )
+
+
 def get_time(seconds_precision: bool = True) -> int | float:
     return time() if not seconds_precision else int(time())
 
@@ -37,17 +58,27 @@ def get_uuid() -> str:
     return str(uuid4())
 
 
-def create_certificate(nome: str, MB: int, expiration: datetime) -> io.BytesIO:
-    img = CERT_TEMPLATE.copy()
-    draw = ImageDraw.Draw(img)
-    orig_w, orig_h = 5000, 3462
-    scale_x, scale_y = img.width / orig_w, img.height / orig_h
+def create_certificate(
+    nome: str,
+    MB: int,
+    expiration: datetime,
+    issued_on: date | None = None,
+    image_format: str = "png",
+    width: int | None = None,
+) -> bytes:
+    """
+    Render a membership certificate issued on ``issued_on`` (today by default).
 
-    font_large = FONT_LARGE.font_variant(size=int(FONT_LARGE.size * scale_y))
-    font_medium = FONT_MEDIUM.font_variant(size=int(FONT_MEDIUM.size * scale_y))
-    font_small = FONT_SMALL.font_variant(size=int(FONT_SMALL.size * scale_y))
+    ``image_format`` is a key of ``CERTIFICATE_FORMATS``; with ``width`` the image is
+    downscaled to that width, e.g. for previews.
+    """
+    cert_template, font_large, font_medium, font_small = get_certificate_assets()
+    img = cert_template.copy()
+    draw = ImageDraw.Draw(img)
+    scale_x = img.width / CERTIFICATE_BASE_SIZE[0]
+    scale_y = img.height / CERTIFICATE_BASE_SIZE[1]
 
-    today = format_date(datetime.now(), format="long", locale=LOCALE)
+    today = format_date(issued_on or datetime.now(), format="long", locale=LOCALE)
     expiration_text = (
         f"Certificado válido até {format_date(expiration, format='dd/MM/yyyy', locale=LOCALE)}"
     )
@@ -63,10 +94,15 @@ def create_certificate(nome: str, MB: int, expiration: datetime) -> io.BytesIO:
     draw.text((datax, 2100 * scale_y), today, font=font_medium, fill=(0, 0, 0))
     draw.text((expiration_x, 3250 * scale_y), expiration_text, font=font_small, fill=(0, 0, 0))
 
+    if width and width < img.width:
+        img = img.resize((width, round(img.height * width / img.width)), Image.Resampling.LANCZOS)
+    pil_format, _, save_options = CERTIFICATE_FORMATS[image_format]
+    if pil_format == "JPEG":
+        img = img.convert("RGB")
+
     buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return buf
+    img.save(buf, format=pil_format, **save_options)
+    return buf.getvalue()
 
 
 class CustomJSONEncoder(json.JSONEncoder):
@@ -20,7 +20,7 @@ from twilio.request_validator import RequestValidator
 
 from people_api.app import app  # type: ignore
 from people_api.auth import create_token, verify_firebase_token
-from people_api.dbs import engine
+from people_api.dbs import get_engine
 from people_api.schemas import UserToken
 from people_api.settings import get_settings
 from tests.router_config import test_router
@@ -176,6 +176,10 @@ def test_client():
     app.include_router(test_router)
 
     wait_for_db()
+    # Answer chatbot messages in the webhook request, also with settings reloaded by a test;
+    # tests that queue them start the workers.
+    os.environ["CHATBOT_QUEUE_WORKERS"] = "0"
+    get_settings().chatbot_queue_workers = 0
     with TestClient(app, base_url="http://localhost:5000") as c:
         yield c
 
@@ -332,7 +336,7 @@ def disable_otel_middleware():
     app.user_middleware = [
         middleware
         for middleware in app.user_middleware
-        if "otel_logging_middleware" not in str(middleware)
+        if "OtelLoggingMiddleware" not in str(middleware)
     ]
 
     yield
@@ -344,7 +348,7 @@ def disable_otel_middleware():
 def sync_rw_session():
     """Yield a valid sync SQLModel session for tests."""
 
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
@@ -388,3 +392,34 @@ async def reset_async_db_engines():
     dbs.async_engine_ro = None
     dbs.rw_sessionmaker = None
     dbs.ro_sessionmaker = None
+
+
+@pytest.fixture(autouse=True)
+def reset_identity_cache():
+    """Reset the identity cache after each test to avoid leaking identities and event loops."""
+    yield
+    from people_api.services.identity_cache import IdentityCache
+
+    IdentityCache._local.clear()
+    IdentityCache._local_generation = 0
+    IdentityCache._redis_client = None
+    IdentityCache._redis_unavailable_until = 0.0
+
+
+@pytest.fixture(autouse=True)
+def reset_thread_store():
+    """Drop the chatbot Redis client after each test, as it is bound to the test's loop."""
+    yield
+    from people_api.services.whatsapp_service.chatbot.thread_store import ThreadStore
+
+    ThreadStore._redis_client = None
+    ThreadStore._redis_loop = None
+
+
+@pytest.fixture(autouse=True)
+def reset_authorization_status_cache():
+    """Drop cached authorization statuses after each test, as the database is reset."""
+    yield
+    from people_api.services.authorization_status_cache import AuthorizationStatusCache
+
+    AuthorizationStatusCache._entries.clear()
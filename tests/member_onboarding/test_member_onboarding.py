@@ -378,7 +378,7 @@ class TestMemberOnboardingEndpoints:
             ),
         )
 
-        mock_email_service = Mock()
+        mock_email_service = Mock(send_many=AsyncMock())
         mock_template_emails = [
             {
                 "recipient_email": "joao.souza@example.com",
@@ -497,7 +497,7 @@ class TestMemberOnboardingEmails:
         with patch(
             "people_api.services.member_onboarding.EmailSendingService"
         ) as mock_email_svc_cls:
-            email_svc_mock = Mock()
+            email_svc_mock = Mock(send_many=AsyncMock())
             mock_email_svc_cls.return_value = email_svc_mock
 
             with patch(
@@ -512,22 +512,21 @@ class TestMemberOnboardingEmails:
 
                 await send_initial_payment_email(mock_session, pending_registration_model)
 
-                # Verify emails were sent to both member and legal rep
-                assert email_svc_mock.send_email.call_count == 2
+                # Verify emails were sent to both member and legal rep in one batch
+                email_svc_mock.send_many.assert_awaited_once()
+                messages = email_svc_mock.send_many.await_args.args[0]
+                assert len(messages) == 2
 
-                # Check the calls to send_email
-                calls = email_svc_mock.send_email.call_args_list
-
-                # First call should be to the member
-                member_call = calls[0].kwargs
+                # First message should be to the member
+                member_call = vars(messages[0])
                 assert member_call["to_email"] == pending_registration_model.data["email"]
                 assert member_call["subject"] == "Parabéns! Você foi aprovado na Mensa Brasil"
                 assert member_call["sender_email"] == mock_smtp_settings.smtp_username
                 assert member_call["html_content"] == "member email content"
                 assert member_call["reply_to"] == "secretaria@mensa.org.br"
 
-                # Second call should be to the legal representative
-                legal_rep_call = calls[1].kwargs
+                # Second message should be to the legal representative
+                legal_rep_call = vars(messages[1])
                 legal_rep = pending_registration_model.data["legal_representatives"][0]
                 assert legal_rep_call["to_email"] == legal_rep["email"]
                 assert (
@@ -589,7 +588,7 @@ class TestMemberOnboardingEmails:
         run_db_query(
             f"INSERT INTO pending_registration (data, token) VALUES ('{json.dumps(data)}'::json, '{token}')"
         )
-        dummy_email_svc = SimpleNamespace(send_email=Mock())
+        dummy_email_svc = SimpleNamespace(send_many=AsyncMock())
 
         monkeypatch.setattr(
             "people_api.services.member_onboarding.EmailSendingService",
@@ -603,8 +602,9 @@ class TestMemberOnboardingEmails:
             for pending in result.all():
                 await send_initial_payment_email(sessions.rw, pending)
 
-        dummy_email_svc.send_email.assert_called_once()
-        kwargs = dummy_email_svc.send_email.call_args.kwargs
+        dummy_email_svc.send_many.assert_awaited_once()
+        [message] = dummy_email_svc.send_many.await_args.args[0]
+        kwargs = vars(message)
         assert kwargs["to_email"] == data["email"]
         assert kwargs["subject"] == "Parabéns! Você foi aprovado na Mensa Brasil"
         assert kwargs["sender_email"] == mock_smtp_settings.smtp_username
@@ -635,7 +635,7 @@ class TestMemberOnboardingEmails:
         with patch(
             "people_api.services.member_onboarding.EmailSendingService"
         ) as mock_email_svc_cls:
-            email_svc_mock = Mock()
+            email_svc_mock = Mock(send_many=AsyncMock())
             mock_email_svc_cls.return_value = email_svc_mock
 
             with patch(
@@ -650,22 +650,19 @@ class TestMemberOnboardingEmails:
 
                 await send_initial_payment_email(mock_session, pending_registration_model)  # type: ignore
 
-                # Verify email sent to member
-                assert (
-                    email_svc_mock.send_email.call_count == 2
-                )  # One for member, one for legal rep
-
-                # Check the calls to send_email
-                calls = email_svc_mock.send_email.call_args_list
+                # Verify emails sent in one batch: one for member, one for legal rep
+                email_svc_mock.send_many.assert_awaited_once()
+                messages = email_svc_mock.send_many.await_args.args[0]
+                assert len(messages) == 2
 
-                # First call should be to the member
-                member_call = calls[0].kwargs
+                # First message should be to the member
+                member_call = vars(messages[0])
                 assert member_call["to_email"] == pending_registration_model.data["email"]
                 assert member_call["subject"] == "Parabéns! Você foi aprovado na Mensa Brasil"
                 assert member_call["sender_email"] == mock_smtp_settings.smtp_username
 
-                # Second call should be to the legal representative
-                legal_rep_call = calls[1].kwargs
+                # Second message should be to the legal representative
+                legal_rep_call = vars(messages[1])
                 legal_rep = pending_registration_model.data["legal_representatives"][0]
                 assert legal_rep_call["to_email"] == legal_rep["email"]
                 assert (
@@ -719,7 +716,7 @@ class TestMemberOnboardingEmails:
         with patch(
             "people_api.services.member_onboarding.EmailSendingService"
         ) as mock_email_svc_cls:
-            email_svc_mock = Mock()
+            email_svc_mock = Mock(send_many=AsyncMock())
             mock_email_svc_cls.return_value = email_svc_mock
 
             with patch(
@@ -732,10 +729,10 @@ class TestMemberOnboardingEmails:
                 await send_initial_payment_email(mock_session, pending_reg)  # type: ignore
 
                 # Verify only one email is sent (to the member, not to any legal representative)
-                assert email_svc_mock.send_email.call_count == 1
+                [message] = email_svc_mock.send_many.await_args.args[0]
 
-                # Check the call to send_email
-                call_args = email_svc_mock.send_email.call_args.kwargs
+                # Check the message sent
+                call_args = vars(message)
                 assert call_args["to_email"] == pending_data["email"]
                 assert call_args["subject"] == "Parabéns! Você foi aprovado na Mensa Brasil"
 
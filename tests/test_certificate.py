@@ -0,0 +1,178 @@
+"""Tests for certificate rendering and caching."""
+
+from datetime import date, datetime
+
+import pytest
+
+from people_api.database.models.models import CertificateTokens
+from people_api.models.member import FirebaseMemberRead
+from people_api.repositories import MemberRepository
+from people_api.scripts.import_certificate_tokens import import_certificate_tokens
+from people_api.services import certificate_renderer
+from people_api.services.certificate_renderer import CertificateRenderer
+from people_api.settings import get_settings
+from people_api.utils import create_certificate
+
+MAGIC_BYTES = {"png": b"\x89PNG", "jpeg": b"\xff\xd8\xff", "webp": b"RIFF"}
+
+
+@pytest.mark.parametrize("image_format", ["png", "jpeg", "webp"])
+def test_create_certificate_formats(image_format):
+    """Certificates can be encoded as PNG, JPEG or WebP."""
+    image = create_certificate(
+        "Maria da Silva", 1234, datetime(2030, 1, 1), date(2026, 1, 2), image_format
+    )
+    assert image.startswith(MAGIC_BYTES[image_format])
+
+
+def test_create_certificate_preview_is_downscaled():
+    """A preview width renders a smaller image than the full-resolution certificate."""
+    full = create_certificate("Maria da Silva", 1234, datetime(2030, 1, 1), date(2026, 1, 2))
+    preview = create_certificate(
+        "Maria da Silva", 1234, datetime(2030, 1, 1), date(2026, 1, 2), "png", 256
+    )
+    assert len(preview) < len(full) / 4
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+@pytest.mark.asyncio
+async def test_rendered_certificates_are_cached_by_content(monkeypatch, mocker):
+    """The same certificate is rendered once per day; any drawn field changes the key."""
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(get_settings(), "certificate_render_workers", 0)
+    monkeypatch.setattr(CertificateRenderer, "_get_redis", classmethod(lambda cls: fake_redis))
+    render = mocker.patch.object(certificate_renderer, "create_certificate", return_value=b"img")
+
+    expiration = datetime(2030, 1, 1)
+    assert await CertificateRenderer.render("Maria", 1234, expiration) == b"img"
+    assert await CertificateRenderer.render("Maria", 1234, expiration) == b"img"
+    assert render.call_count == 1
+
+    await CertificateRenderer.render("Maria", 1234, expiration, "webp")
+    await CertificateRenderer.render("Maria", 1235, expiration)
+    assert render.call_count == 3
+    assert len(fake_redis.values) == 3
+
+
+def _firebase_member(**fields) -> FirebaseMemberRead:
+    """Return a Firestore member document with the fields not given set to None."""
+    return FirebaseMemberRead(
+        **{
+            name: None
+            for name in FirebaseMemberRead.model_fields
+            if name not in ("MB", "fcm_token")
+        }
+        | fields
+    )
+
+
+def test_download_certificate_reads_token_from_postgres(test_client, mocker):
+    """The certificate token is checked against Postgres without reading Firestore."""
+    render = mocker.patch.object(CertificateRenderer, "render", return_value=b"img")
+    firebase = mocker.patch.object(MemberRepository, "getFromFirebase")
+
+    response = test_client.get("/download_certificate.png?MB=5&key=certificate-token-5")
+    assert response.status_code == 200
+    assert response.content == b"img"
+    render.assert_called_once_with("Fernando Filho", 5, date(2030, 12, 31), "png", None)
+
+    response = test_client.get("/download_certificate.png?MB=5&key=wrong-token")
+    assert response.json() == {"error": "Chave inválida"}
+    firebase.assert_not_called()
+
+
+def test_download_certificate_stores_token_read_from_firestore(test_client, mocker, run_db_query):
+    """A member missing from Postgres is read from Firestore once and stored."""
+    mocker.patch.object(CertificateRenderer, "render", return_value=b"img")
+    firebase = mocker.patch.object(
+        MemberRepository,
+        "getFromFirebase",
+        return_value=_firebase_member(
+            MB=6, CertificateToken="firestore-token", display_name="Inimigos da HP"
+        ),
+    )
+
+    for _ in range(2):
+        response = test_client.get("/download_certificate.png?MB=6&key=firestore-token")
+        assert response.content == b"img"
+    firebase.assert_called_once_with(6)
+    assert run_db_query(
+        "SELECT token, display_name FROM certificate_tokens WHERE registration_id = 6"
+    ) == [("firestore-token", "Inimigos da HP")]
+
+
+def test_download_certificate_refreshes_stale_token(test_client, mocker, run_db_query):
+    """A stored token older than the maximum age is read again from Firestore and updated."""
+    mocker.patch.object(CertificateRenderer, "render", return_value=b"img")
+    firebase = mocker.patch.object(
+        MemberRepository,
+        "getFromFirebase",
+        return_value=_firebase_member(
+            MB=5, CertificateToken="rotated-token-5", display_name="Fernando Filho"
+        ),
+    )
+    run_db_query(
+        "UPDATE certificate_tokens SET updated_at = now() - interval '2 days' "
+        "WHERE registration_id = 5"
+    )
+
+    response = test_client.get("/download_certificate.png?MB=5&key=certificate-token-5")
+    assert response.json() == {"error": "Chave inválida"}
+    response = test_client.get("/download_certificate.png?MB=5&key=rotated-token-5")
+    assert response.content == b"img"
+    firebase.assert_called_once_with(5)
+    assert run_db_query(
+        "SELECT token, updated_at > now() - interval '1 hour' FROM certificate_tokens "
+        "WHERE registration_id = 5"
+    ) == [("rotated-token-5", True)]
+
+
+@pytest.mark.parametrize("failing_step", ["firestore", "upsert"])
+def test_download_certificate_serves_stale_token_when_refresh_fails(
+    test_client, mocker, run_db_query, failing_step
+):
+    """A stale token is still served when reading Firestore or storing its token fails."""
+    mocker.patch.object(CertificateRenderer, "render", return_value=b"img")
+    if failing_step == "firestore":
+        mocker.patch.object(MemberRepository, "getFromFirebase", side_effect=RuntimeError("down"))
+    else:
+        mocker.patch.object(
+            MemberRepository,
+            "getFromFirebase",
+            return_value=_firebase_member(MB=5, CertificateToken="rotated-token-5"),
+        )
+        mocker.patch.object(CertificateTokens, "upsert_stmt", side_effect=RuntimeError("failed"))
+    run_db_query(
+        "UPDATE certificate_tokens SET updated_at = now() - interval '2 days' "
+        "WHERE registration_id = 5"
+    )
+
+    response = test_client.get("/download_certificate.png?MB=5&key=certificate-token-5")
+    assert response.content == b"img"
+
+
+def test_import_certificate_tokens(run_db_query):
+    """Tokens are upserted in batches; members without a token or registration are skipped."""
+    members: list[dict] = [
+        {"MB": 5, "CertificateToken": "new-token-5", "display_name": "Fernando"},
+        {"MB": 6, "CertificateToken": "token-6", "expiration_date": datetime(2031, 1, 1)},
+        {"MB": 7, "CertificateToken": None},
+        {"MB": 999999, "CertificateToken": "token-999999"},
+    ]
+    stats = import_certificate_tokens(members, batch_size=3)
+    assert (stats.read, stats.imported, stats.skipped) == (4, 2, 2)
+
+    assert run_db_query(
+        "SELECT registration_id, token, display_name, expiration_date FROM certificate_tokens "
+        "ORDER BY registration_id"
+    ) == [(5, "new-token-5", "Fernando", None), (6, "token-6", None, date(2031, 1, 1))]
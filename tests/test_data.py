@@ -1,8 +1,23 @@
+import json
 import time
+from decimal import Decimal
 from unittest.mock import patch
 
+import asyncpg
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
 from fastapi.testclient import TestClient
 
+from people_api.database.models.data import _encode_columnar, _translate_errors
+from people_api.exceptions import (
+    InsufficientPrivilegeError,
+    QueryExecutionError,
+    QuerySyntaxError,
+    QueryTimeoutError,
+)
+from people_api.settings import get_settings
+
 MOCK_API_KEY = "bia"
 
 
@@ -15,7 +30,7 @@ def test_valid_query(test_client: TestClient):
         "/data/query",
         json={"query": "SELECT * FROM registration LIMIT 1;"},
         headers={"data_endpoint_token": MOCK_API_KEY},
-    )  # noqa: F821
+    )
     assert response.status_code == 200
     assert "results" in response.json()
 
@@ -89,3 +104,173 @@ def test_failed_authentication_no_api_key(test_client: TestClient):
     )
     assert response.status_code == 403  # Forbidden
     assert response.json()["detail"] == "API Key is not set"
+
+
+@patch("people_api.services.data_service.API_KEY", MOCK_API_KEY)
+def test_keyset_pagination(test_client: TestClient):
+    """Pages follow the next_cursor of the previous page until the last one."""
+    body = {
+        "query": "SELECT registration_id, name FROM registration;",
+        "order_by": "registration_id",
+        "limit": 3,
+    }
+    headers = {"data_endpoint_token": MOCK_API_KEY}
+
+    response = test_client.post("/data/query", headers=headers, json=body)
+    assert [row["registration_id"] for row in response.json()["results"]] == [5, 6, 7]
+    assert response.json()["next_cursor"] == 7
+
+    response = test_client.post("/data/query", headers=headers, json={**body, "after": 7})
+    assert [row["registration_id"] for row in response.json()["results"]] == [8, 9, 10]
+
+    response = test_client.post("/data/query", headers=headers, json={**body, "after": 10})
+    assert [row["registration_id"] for row in response.json()["results"]] == [11, 1805]
+    assert response.json()["next_cursor"] is None
+
+
+@patch("people_api.services.data_service.API_KEY", MOCK_API_KEY)
+def test_streaming_formats(test_client: TestClient):
+    """NDJSON and CSV results are streamed and capped at the requested number of rows."""
+    query = "SELECT registration_id, name FROM registration ORDER BY registration_id"
+    headers = {"data_endpoint_token": MOCK_API_KEY}
+
+    response = test_client.post(
+        "/data/query", headers=headers, json={"query": query, "format": "ndjson", "limit": 2}
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["registration_id"] for line in response.iter_lines()] == [5, 6]
+
+    response = test_client.post(
+        "/data/query", headers=headers, json={"query": query, "format": "csv", "limit": 1}
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text == "registration_id,name\r\n5,Fernando Diniz Souza Filho\r\n"
+
+
+@patch("people_api.services.data_service.API_KEY", MOCK_API_KEY)
+def test_streams_results_larger_than_a_batch(test_client: TestClient, monkeypatch):
+    """Streams keep fetching batches from the cursor after the response has started."""
+    monkeypatch.setattr(get_settings(), "data_query_batch_size", 2)
+    query = "SELECT registration_id FROM registration ORDER BY registration_id"
+    headers = {"data_endpoint_token": MOCK_API_KEY}
+    expected = [5, 6, 7, 8, 9, 10, 11, 1805]
+
+    response = test_client.post(
+        "/data/query", headers=headers, json={"query": query, "format": "ndjson"}
+    )
+    assert [json.loads(line)["registration_id"] for line in response.iter_lines()] == expected
+
+    response = test_client.post(
+        "/data/query", headers=headers, json={"query": query, "format": "csv"}
+    )
+    assert response.text.split() == ["registration_id", *map(str, expected)]
+
+    response = test_client.post(
+        "/data/query", headers=headers, json={"query": query, "format": "arrow"}
+    )
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("registration_id").to_pylist() == expected
+
+
+@patch("people_api.services.data_service.API_KEY", MOCK_API_KEY)
+def test_json_results_over_the_row_cap(test_client: TestClient, monkeypatch):
+    """JSON results past the cap are refused unless a limit or pagination is requested."""
+    monkeypatch.setattr(get_settings(), "data_query_max_rows", 3)
+    query = "SELECT registration_id FROM registration ORDER BY registration_id"
+    headers = {"data_endpoint_token": MOCK_API_KEY}
+
+    response = test_client.post("/data/query", headers=headers, json={"query": query})
+    assert response.status_code == 413
+
+    response = test_client.post("/data/query", headers=headers, json={"query": query, "limit": 10})
+    assert [row["registration_id"] for row in response.json()["results"]] == [5, 6, 7]
+
+    response = test_client.post(
+        "/data/query", headers=headers, json={"query": query, "format": "ndjson"}
+    )
+    assert len(list(response.iter_lines())) == 8
+
+
+@patch("people_api.services.data_service.API_KEY", MOCK_API_KEY)
+def test_statement_timeout(test_client: TestClient):
+    """Queries running past their statement timeout are cancelled."""
+    response = test_client.post(
+        "/data/query",
+        headers={"data_endpoint_token": MOCK_API_KEY},
+        json={"query": "SELECT pg_sleep(5);", "timeout_ms": 100},
+    )
+    assert response.status_code == 504
+
+
+@patch("people_api.services.data_service.API_KEY", MOCK_API_KEY)
+def test_arrow_stream_negotiated_by_accept(test_client: TestClient):
+    """An Accept header asking for Arrow streams the rows as an Arrow IPC stream."""
+    response = test_client.post(
+        "/data/query",
+        headers={
+            "data_endpoint_token": MOCK_API_KEY,
+            "accept": "application/vnd.apache.arrow.stream, application/json;q=0.5",
+        },
+        json={"query": "SELECT registration_id, name FROM registration ORDER BY registration_id"},
+    )
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["registration_id", "name"]
+    assert table.column("registration_id").to_pylist() == [5, 6, 7, 8, 9, 10, 11, 1805]
+
+
+async def _encode(batches: list[list[dict]], file_format: str) -> bytes:
+    async def partitions():
+        for rows in batches:
+            yield rows
+
+    columns = list(batches[0][0])
+    return b"".join([chunk async for chunk in _encode_columnar(partitions(), columns, file_format)])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_format", ["arrow", "parquet"])
+async def test_columnar_batches_follow_the_first_schema(file_format):
+    """Later batches with other decimal scales, JSON shapes or late values keep one schema."""
+    batches = [
+        [{"amount": Decimal("1.50"), "data": {"a": 1}, "note": None}],
+        [{"amount": Decimal("123456.125"), "data": [1, 2], "note": "late"}],
+    ]
+    payload = await _encode(batches, file_format)
+
+    if file_format == "arrow":
+        table = pa.ipc.open_stream(payload).read_all()
+    else:
+        table = pq.read_table(pa.BufferReader(payload))
+    assert table.schema.field("amount").type == pa.string()
+    assert table.to_pylist() == [
+        {"amount": "1.50", "data": '{"a":1}', "note": None},
+        {"amount": "123456.125", "data": "[1,2]", "note": "late"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_columnar_batch_that_cannot_be_cast_fails():
+    """A later batch that does not fit the first batch's types raises a query error."""
+    batches: list[list[dict]] = [[{"count": 1}], [{"count": "many"}]]
+    with pytest.raises(QueryExecutionError):
+        await _encode(batches, "arrow")
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (
+            asyncpg.exceptions.InsufficientPrivilegeError("must be owner"),
+            InsufficientPrivilegeError,
+        ),
+        (asyncpg.exceptions.QueryCanceledError("statement timeout"), QueryTimeoutError),
+        (asyncpg.exceptions.UndefinedTableError("no such table"), QuerySyntaxError),
+    ],
+)
+def test_asyncpg_errors_are_classified_by_sqlstate(error, expected):
+    """Errors raised unwrapped by a server-side cursor map to the matching query error."""
+    with pytest.raises(expected):
+        with _translate_errors():
+            raise error
@@ -110,6 +110,11 @@ VALUES
     (5, 10, '34567890100', 'Marcos Costa', 'marcos.costa@example.com', '+5521955555556', NULL, 'Father of Lucas Costa (registration 10)', '2023-08-24 00:03:53.332', '2023-08-24 00:03:53.332'),
     (6, 10, '34567890101', 'Mariana Costa', 'mariana.costa@example.com', '+5521955555557', NULL, 'Mother of Lucas Costa (registration 10)', '2023-08-24 00:03:53.332', '2023-08-24 00:03:53.332');
 
+-- Certificate Tokens table
+INSERT INTO certificate_tokens (registration_id, token, display_name, expiration_date, created_at, updated_at)
+VALUES
+    (5, 'certificate-token-5', 'Fernando Filho', '2030-12-31', now(), now());
+
 -- WhatsApp Workers table
 INSERT INTO whatsapp_workers (id, worker_phone, created_at, updated_at)
 VALUES
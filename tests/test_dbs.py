@@ -0,0 +1,94 @@
+"""Tests for the request-scoped async session provider."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.exc import DisconnectionError
+from sqlmodel import select
+
+from people_api import dbs
+from people_api.database.models.models import WhatsappWorkers
+
+
+@pytest.mark.asyncio
+async def test_get_async_sessions_opens_sessions_on_first_use():
+    """No session is created until it is accessed, and an unused request commits nothing."""
+    async for sessions in dbs.get_async_sessions():
+        assert sessions.pool_wait == {}
+        assert not sessions.has_pending_writes()
+        await sessions.ro.exec(select(WhatsappWorkers))
+        assert set(sessions.pool_wait) == {"ro"}
+    assert dbs.ro_sessionmaker is not None
+
+
+@pytest.mark.asyncio
+async def test_get_async_sessions_commits_only_writes(run_db_query):
+    """Reads through the read-write session skip the commit; added rows are committed."""
+    async for sessions in dbs.get_async_sessions():
+        await sessions.rw.exec(select(WhatsappWorkers))
+        assert not sessions.has_pending_writes()
+
+    async for sessions in dbs.get_async_sessions():
+        sessions.rw.add(WhatsappWorkers(worker_phone="+5521999000222"))
+        assert sessions.has_pending_writes()
+
+    result = run_db_query(
+        "SELECT COUNT(*) FROM whatsapp_workers WHERE worker_phone = '+5521999000222'"
+    )
+    assert result[0][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_async_sessions_commits_writes_made_in_a_savepoint(run_db_query):
+    """Releasing a savepoint does not hide the writes made in it from the final commit."""
+    async for sessions in dbs.get_async_sessions():
+        async with sessions.rw.begin_nested():
+            sessions.rw.add(WhatsappWorkers(worker_phone="+5521999000333"))
+        assert sessions.has_pending_writes()
+
+    result = run_db_query(
+        "SELECT COUNT(*) FROM whatsapp_workers WHERE worker_phone = '+5521999000333'"
+    )
+    assert result[0][0] == 1
+
+
+def test_async_pools_are_configured_from_settings(monkeypatch):
+    """Pool sizing comes from the ``db_*`` settings and pre-ping is left to the idle check."""
+    monkeypatch.setattr(dbs.settings, "db_pool_size", 3)
+    monkeypatch.setattr(dbs.settings, "db_max_overflow", 7)
+    monkeypatch.setattr(dbs.settings, "db_pool_recycle", 600)
+    dbs._get_sessionmakers()
+
+    for name, async_engine in (("rw", dbs.async_engine_rw), ("ro", dbs.async_engine_ro)):
+        assert async_engine is not None
+        pool = async_engine.sync_engine.pool
+        assert isinstance(pool, dbs.InstrumentedAsyncPool)
+        assert pool.logging_name == name
+        assert pool.size() == 3
+        assert pool._max_overflow == 7
+        assert pool._recycle == 600
+        assert not pool._pre_ping
+
+
+def test_only_idle_connections_are_pinged_on_checkout(monkeypatch):
+    """A connection is pinged when it sat idle too long, and discarded if the ping fails."""
+    monkeypatch.setattr(dbs.settings, "db_pre_ping_idle_seconds", 30)
+    dbs._get_sessionmakers()
+    assert dbs.async_engine_rw is not None
+    pool = dbs.async_engine_rw.sync_engine.pool
+    dbapi_connection = Mock()
+
+    recent = SimpleNamespace(info={"checked_in_at": time.monotonic() - 1})
+    pool.dispatch.checkout(dbapi_connection, recent, None)
+    dbapi_connection.ping.assert_not_called()
+
+    idle = SimpleNamespace(info={"checked_in_at": time.monotonic() - 60})
+    pool.dispatch.checkout(dbapi_connection, idle, None)
+    dbapi_connection.ping.assert_called_once()
+
+    dbapi_connection.ping.side_effect = OSError("connection reset")
+    idle = SimpleNamespace(info={"checked_in_at": time.monotonic() - 60})
+    with pytest.raises(DisconnectionError):
+        pool.dispatch.checkout(dbapi_connection, idle, None)
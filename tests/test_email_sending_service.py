@@ -0,0 +1,132 @@
+"""Test the pooled SMTP sender against a local aiosmtpd server."""
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from people_api.services import email_sending_service
+from people_api.services.email_sending_service import (
+    EmailDeliveryError,
+    EmailMessage,
+    EmailSendingService,
+)
+from people_api.settings import SMTPSettings
+
+SMTP_PORT = 8025
+
+
+class RecordingHandler:
+    """Accept every message, except recipients listed in ``reject`` with their reply."""
+
+    def __init__(self):
+        self.delivered: list[str] = []
+        self.reject: dict[str, list[str]] = {}
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        replies = self.reject.get(address)
+        if replies:
+            return replies.pop(0)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+
+class CountingAuthenticator:
+    """Accept any credentials and count the logins."""
+
+    def __init__(self):
+        self.logins = 0
+
+    def __call__(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        return AuthResult(success=True)
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    """Run a local SMTP server and point the sender at it with a fresh pool."""
+    handler = RecordingHandler()
+    authenticator = CountingAuthenticator()
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=SMTP_PORT,
+        authenticator=authenticator,
+        auth_require_tls=False,
+    )
+    controller.start()
+    settings = SMTPSettings(
+        smtp_server="127.0.0.1",
+        smtp_port=SMTP_PORT,
+        smtp_username="sender@example.com",
+        smtp_password="secret",
+        smtp_starttls=False,
+        smtp_pool_size=2,
+        smtp_retry_backoff=0.01,
+    )
+    monkeypatch.setattr(email_sending_service, "get_smtp_settings", lambda: settings)
+    EmailSendingService.close_pool()
+    yield handler, authenticator
+    EmailSendingService.close_pool()
+    controller.stop()
+
+
+def _message(to_email: str) -> EmailMessage:
+    return EmailMessage(
+        to_email=to_email,
+        subject="Olá",
+        html_content="<p>Olá</p>",
+        sender_email="sender@example.com",
+        reply_to="secretaria@mensa.org.br",
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_many_reuses_authenticated_sessions(smtp_server):
+    """A batch is delivered over at most ``smtp_pool_size`` sessions, and they are reused."""
+    handler, authenticator = smtp_server
+    recipients = [f"member{i}@example.com" for i in range(10)]
+
+    await EmailSendingService().send_many([_message(to) for to in recipients])
+    await EmailSendingService().send_email(
+        to_email="last@example.com",
+        subject="Olá",
+        html_content="<p>Olá</p>",
+        sender_email="sender@example.com",
+    )
+
+    assert sorted(handler.delivered) == sorted([*recipients, "last@example.com"])
+    assert 1 <= authenticator.logins <= 2
+
+
+@pytest.mark.asyncio
+async def test_send_many_retries_transient_failures(smtp_server):
+    """A 4xx reply is retried with backoff until the message goes through."""
+    handler, _ = smtp_server
+    handler.reject["busy@example.com"] = ["451 Try again later", "451 Try again later"]
+
+    await EmailSendingService().send_many(
+        [_message("busy@example.com"), _message("ok@example.com")]
+    )
+
+    assert sorted(handler.delivered) == ["busy@example.com", "ok@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_send_many_reports_permanent_failures_after_sending_the_rest(smtp_server):
+    """A 5xx reply is not retried; the other messages are still delivered."""
+    handler, _ = smtp_server
+    handler.reject["unknown@example.com"] = ["550 No such user"] * 5
+
+    with pytest.raises(EmailDeliveryError) as exc_info:
+        await EmailSendingService().send_many(
+            [_message("unknown@example.com"), _message("ok@example.com")]
+        )
+
+    assert handler.delivered == ["ok@example.com"]
+    [failure] = exc_info.value.failures
+    assert failure.message.to_email == "unknown@example.com"
+    assert failure.attempts == 1
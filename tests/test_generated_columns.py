@@ -0,0 +1,33 @@
+"""Generated columns created by migrations must match the expressions of the models."""
+
+import importlib
+
+from sqlmodel import SQLModel
+
+import people_api.database.models.models  # noqa: F401  # registers the tables
+
+
+def _migration(name: str):
+    return importlib.import_module(f"people_api.database.alembic.versions.{name}")
+
+
+def _computed_expression(table: str, column: str) -> str:
+    computed = SQLModel.metadata.tables[table].c[column].computed
+    assert computed is not None
+    return str(computed.sqltext)
+
+
+def test_phone_suffix_expression_matches_migration():
+    """The phone_suffix columns are computed with the expression their migration created."""
+    migration = _migration("3f2d8c1a9b47_add_phone_suffix_columns")
+    for table in ("phones", "whatsapp_authorization"):
+        assert _computed_expression(table, "phone_suffix") == migration.PHONE_SUFFIX_EXPRESSION
+
+
+def test_group_classification_expression_matches_migration():
+    """group_list.classification is computed with the expression its migration created."""
+    migration = _migration("8b1e4f7c2d90_add_group_list_classification")
+    assert (
+        _computed_expression("group_list", "classification")
+        == migration.GROUP_CLASSIFICATION_EXPRESSION
+    )
@@ -1,5 +1,6 @@
 """This module contains tests for the group endpoints."""
 
+import time
 from typing import Any
 
 import pytest
@@ -30,6 +31,65 @@ def test_get_can_participate_include_mulheres_for_female(
     assert all(item.get("group_name") == "MB | Mulheres" for item in response_data)
 
 
+def test_get_can_participate_uses_group_classification(
+    test_client: Any, get_valid_internal_token, run_db_query
+) -> None:
+    """Groups are classified by name prefix in the database and returned sorted by name."""
+    run_db_query(
+        "INSERT INTO group_list (group_name, group_id) VALUES "
+        "('jb - São Paulo', 'jb1@g.us'), ('JB | Rio', 'jb2@g.us'), ('R.JB Pais', 'rjb@g.us'), "
+        "('M JB Kids', 'mjb@g.us'), ('OrgMB Staff', 'org@g.us')"
+    )
+    classifications = dict(
+        run_db_query(
+            "SELECT group_name, classification FROM group_list "
+            "WHERE group_id IN ('jb1@g.us', 'rjb@g.us', 'mjb@g.us', 'org@g.us', "
+            "'120363150360123420@g.us', '120363115167512889@g.us')"
+        )
+    )
+    assert classifications == {
+        "jb - São Paulo": "JB",
+        "R.JB Pais": "RJB",
+        "M JB Kids": "MJB",
+        "OrgMB Staff": "OrgMB",
+        "Grupos Regionais Mensa Brasil": "NotMensa",
+        "Mensa Bahia Regional": "MB",
+    }
+
+    # Registration 7 is a JB whose legal representatives are not members, so RJB groups show.
+    headers = {"Authorization": f"Bearer {get_valid_internal_token(7)}"}
+    response = test_client.get("/get_can_participate", headers=headers)
+    assert response.status_code == 200
+    assert [item["group_name"] for item in response.json()] == [
+        "JB | Rio",
+        "R.JB Pais",
+        "jb - São Paulo",
+    ]
+
+
+def test_get_can_participate_shows_rjb_groups_to_adult_legal_representatives(
+    test_client: Any, get_valid_internal_token, run_db_query
+) -> None:
+    """An adult whose phone matches a legal representative's (by last 8 digits) sees RJB groups."""
+    run_db_query("INSERT INTO group_list (group_name, group_id) VALUES ('R.JB Pais', 'rjb@g.us')")
+    headers = {"Authorization": f"Bearer {get_valid_internal_token(9)}"}
+
+    response = test_client.get("/get_can_participate", headers=headers)
+    assert response.status_code == 200
+    assert "R.JB Pais" not in [item["group_name"] for item in response.json()]
+
+    # Registration 9's phone is +552192345678, written here in another format.
+    run_db_query(
+        "INSERT INTO legal_representatives (registration_id, full_name, phone) "
+        "VALUES (7, 'Maria Oliveira', '(21) 9234-5678')"
+    )
+    response = test_client.get("/get_can_participate", headers=headers)
+    assert response.status_code == 200
+    group_names = [item["group_name"] for item in response.json()]
+    assert "R.JB Pais" in group_names
+    assert "Mensa Bahia Regional" in group_names
+
+
 def test_get_can_participate_invalid_token(test_client: Any) -> None:
     """Test retrieving groups that the member can participate in with an invalid token"""
     headers = {"Authorization": "Bearer invalid-token"}
@@ -379,6 +439,65 @@ def test_get_authorization_none_authorized(
         assert len(data["pending_authorization"]) == 3
 
 
+def test_get_authorization_status_cache_is_invalidated_on_changes(
+    test_client: Any, get_valid_internal_token: Any, run_db_query: Any
+) -> None:
+    """Test that a cached authorization status is dropped once an authorization is revoked."""
+    from people_api.services.authorization_status_cache import AuthorizationStatusCache
+
+    token = get_valid_internal_token(7)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # The app starts listening for changes in the background.
+    for _ in range(50):
+        if AuthorizationStatusCache._is_listening():
+            break
+        time.sleep(0.1)
+    response = test_client.get("/get_authorization_status", headers=headers)
+    assert response.status_code == 200
+    assert 7 in AuthorizationStatusCache._entries
+    worker_phone, worker_status = next(
+        (worker_phone, data)
+        for worker_phone, data in response.json()["authorizations"].items()
+        if "+552199876543" in data["authorized_numbers"]
+    )
+    assert test_client.get("/get_authorization_status", headers=headers).json() == response.json()
+
+    run_db_query(
+        "DELETE FROM whatsapp_authorization WHERE phone_number = '+552199876543' "
+        f"AND worker_id = (SELECT id FROM whatsapp_workers WHERE worker_phone = '{worker_phone}')"
+    )
+
+    # The notification is delivered asynchronously to the API's event loop.
+    for _ in range(50):
+        if 7 not in AuthorizationStatusCache._entries:
+            break
+        time.sleep(0.1)
+    response = test_client.get("/get_authorization_status", headers=headers)
+    assert response.status_code == 200
+    worker_status = response.json()["authorizations"][worker_phone]
+    assert "+552199876543" not in worker_status["authorized_numbers"]
+    assert worker_status["pending_authorization"]["+552199876543"] == "member"
+
+
+@pytest.mark.asyncio
+async def test_authorization_status_cache_is_bypassed_without_listener(mocker: Any) -> None:
+    """Without a LISTEN connection the cache is bypassed, and requests never open one."""
+    from people_api.services import authorization_status_cache
+    from people_api.services.authorization_status_cache import AuthorizationStatusCache
+
+    connect = mocker.patch.object(authorization_status_cache.asyncpg, "connect")
+    mocker.patch.object(AuthorizationStatusCache, "_listener", None)
+    generation = AuthorizationStatusCache.current_generation()
+
+    await AuthorizationStatusCache.set(7, {"authorizations": {}}, generation)
+    assert 7 not in AuthorizationStatusCache._entries
+    AuthorizationStatusCache._entries[7] = ({"authorizations": {}}, time.monotonic() + 60)
+
+    assert await AuthorizationStatusCache.get(7) is None
+    connect.assert_not_called()
+
+
 @pytest.mark.parametrize("registration_id", [5, 6, 7, 8, 9, 10, 11])
 def test_get_authorization_status_with_legal_rep_phone(
     test_client: Any, get_valid_internal_token: Any, registration_id: int, run_db_query
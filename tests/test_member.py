@@ -298,3 +298,28 @@ def test_update_fb_profession_unauthorized_member(test_client: Any, mock_valid_t
     # Expecting an unauthorized error since the token does not match the member ID
     assert response.status_code == 401
     assert response.json() == {"detail": "Unauthorized"}
+
+
+def test_get_member_returns_full_profile(
+    test_client: Any, mock_valid_token: Any, run_db_query: Any
+) -> None:
+    """Test that get_member returns the member with all related records"""
+    headers = {"Authorization": "Bearer mock-valid-token"}
+    response = test_client.get("/get_member/5", headers=headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["member"]["registration_id"] == 5
+    phone_ids = sorted(
+        row[0] for row in run_db_query("SELECT phone_id FROM phones WHERE registration_id = 5")
+    )
+    email_ids = sorted(
+        row[0] for row in run_db_query("SELECT email_id FROM emails WHERE registration_id = 5")
+    )
+    address_ids = sorted(
+        row[0] for row in run_db_query("SELECT address_id FROM addresses WHERE registration_id = 5")
+    )
+    assert [phone["phone_id"] for phone in data["phones"]] == phone_ids
+    assert [email["email_id"] for email in data["emails"]] == email_ids
+    assert [address["address_id"] for address in data["addresses"]] == address_ids
+    assert all(email["registration_id"] == 5 for email in data["emails"])
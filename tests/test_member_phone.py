@@ -81,6 +81,24 @@ def test_add_phone_number_e164_format_invalid(test_client, mock_valid_token, run
     assert len(rows) == 0, "No valid phone should have been stored."
 
 
+def test_phone_suffix_is_kept_in_sync(test_client, mock_valid_token, run_db_query):
+    """Test that the generated phone_suffix column follows inserts and updates."""
+    run_db_query("DELETE FROM phones WHERE registration_id = 5")
+    run_db_query(
+        "INSERT INTO phones (phone_id, registration_id, phone_number) "
+        "VALUES (11772, 5, '(11) 98765-4321')"
+    )
+    rows = run_db_query("SELECT phone_suffix FROM phones WHERE phone_id = 11772")
+    assert rows[0][0] == "87654321"
+
+    payload = {"phone": "+5511912345678"}
+    headers = {"Authorization": f"Bearer {mock_valid_token}"}
+    response = test_client.put("/phone/5/11772", json=payload, headers=headers)
+    assert response.status_code == 200
+    rows = run_db_query("SELECT phone_suffix FROM phones WHERE phone_id = 11772")
+    assert rows[0][0] == "12345678"
+
+
 # Endpoint PUT
 def test_update_phone_number_invalid_token(test_client, mock_valid_token):
     """Test updating a phone number with an invalid token for this user email"""
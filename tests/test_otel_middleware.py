@@ -0,0 +1,77 @@
+"""Tests for the streaming OpenTelemetry middleware."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from people_api import otel_middleware
+from people_api.otel_middleware import OtelLoggingMiddleware
+from people_api.settings import get_settings
+
+
+@pytest.fixture
+def traced_client(monkeypatch):
+    """Yield a client for a small app behind the middleware, and the exporter of its spans."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(otel_middleware, "get_tracer", lambda: provider.get_tracer(__name__))
+    monkeypatch.setattr(get_settings(), "otel_payload_max_bytes", 16)
+    monkeypatch.setattr(get_settings(), "otel_payload_sample_rate", 1.0)
+
+    app = FastAPI()
+    app.add_middleware(OtelLoggingMiddleware)
+
+    @app.post("/echo/{name}")
+    async def echo(name: str, body: dict):
+        return {"name": name, **body}
+
+    @app.get("/image.png")
+    async def image():
+        chunks = (b"\x89PNG" + bytes(1024) for _ in range(64))
+        return StreamingResponse(chunks, media_type="image/png")
+
+    with TestClient(app) as client:
+        yield client, exporter
+
+
+def test_text_payloads_are_truncated_and_attached(traced_client):
+    """JSON bodies are passed through intact while only their head is attached to the span."""
+    client, exporter = traced_client
+    response = client.post("/echo/ana", json={"message": "x" * 100})
+    assert response.json() == {"name": "ana", "message": "x" * 100}
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["http.route"] == "/echo/{name}"
+    assert span.attributes["http.status_code"] == 200
+    assert span.attributes["request.payload"] == '{"message":"xxxx'
+    assert span.attributes["request.payload.truncated"] is True
+    assert span.attributes["response.payload"] == '{"name":"ana","m'
+    assert span.attributes["response.payload.size"] == len(response.content)
+
+
+def test_binary_responses_are_streamed_without_capture(traced_client):
+    """Binary downloads reach the client unchanged and are never copied into the span."""
+    client, exporter = traced_client
+    response = client.get("/image.png")
+    assert len(response.content) == 64 * 1028
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["http.status_code"] == 200
+    assert "response.payload" not in span.attributes
+
+
+def test_payload_capture_is_sampled_by_route(traced_client, monkeypatch):
+    """A route sampled at zero keeps tracing the request but attaches no payloads."""
+    client, exporter = traced_client
+    monkeypatch.setattr(get_settings(), "otel_payload_route_sample_rates", {"/echo/{name}": 0.0})
+    client.post("/echo/ana", json={"message": "hi"})
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["http.route"] == "/echo/{name}"
+    assert "request.payload" not in span.attributes
+    assert "response.payload" not in span.attributes
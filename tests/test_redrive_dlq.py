@@ -0,0 +1,81 @@
+"""Test the batched DLQ redrive using Moto server."""
+
+import json
+import os
+
+import boto3
+import pytest
+
+from people_api.scripts.redrive_dlq import redrive_dlq_to_sqs
+
+os.environ.setdefault("QUEUE_NAME", "pending_member_first_payment")
+os.environ.setdefault("DLQ_NAME", "dlq")
+
+os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+
+@pytest.fixture
+def queues(moto_server):
+    """Create an empty main queue and a DLQ holding 25 messages, 5 of them tagged."""
+    sqs = boto3.client("sqs", endpoint_url=moto_server)
+    for queue_url in sqs.list_queues().get("QueueUrls", []):
+        sqs.delete_queue(QueueUrl=queue_url)
+
+    dlq_url = sqs.create_queue(QueueName=os.environ["DLQ_NAME"])["QueueUrl"]
+    main_url = sqs.create_queue(QueueName=os.environ["QUEUE_NAME"])["QueueUrl"]
+    for i in range(25):
+        body = json.dumps({"id": i, "tag": "retry" if i % 5 == 0 else "other"})
+        sqs.send_message(QueueUrl=dlq_url, MessageBody=body)
+    return sqs, dlq_url, main_url
+
+
+def _drain(sqs, queue_url: str) -> list[dict]:
+    bodies: list[dict] = []
+    while messages := sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10).get(
+        "Messages", []
+    ):
+        bodies.extend(json.loads(m["Body"]) for m in messages)
+    return bodies
+
+
+@pytest.mark.asyncio
+async def test_redrive_moves_all_messages_in_batches(queues, mocker):
+    """Every DLQ message is moved to the main queue using the batch APIs only."""
+    sqs, dlq_url, main_url = queues
+    send_batch = mocker.spy(sqs, "send_message_batch")
+    send_one = mocker.spy(sqs, "send_message")
+
+    stats = await redrive_dlq_to_sqs(receivers=3, wait_time_seconds=0, sqs_client=sqs)
+
+    assert stats.received == stats.redriven == 25
+    assert stats.failed == stats.skipped == 0
+    assert send_batch.call_count >= 3
+    assert send_one.call_count == 0
+    assert sorted(body["id"] for body in _drain(sqs, main_url)) == list(range(25))
+    assert _drain(sqs, dlq_url) == []
+
+
+@pytest.mark.asyncio
+async def test_redrive_dry_run_with_filter_moves_nothing(queues):
+    """A filtered dry run only counts matching messages and leaves the DLQ untouched."""
+    sqs, dlq_url, main_url = queues
+
+    stats = await redrive_dlq_to_sqs(
+        receivers=2,
+        dry_run=True,
+        match='"tag": "retry"',
+        wait_time_seconds=0,
+        visibility_timeout=1,
+        sqs_client=sqs,
+    )
+
+    assert stats.received == 25
+    assert stats.redriven == 5
+    assert stats.skipped == 20
+    assert _drain(sqs, main_url) == []
+    attrs = sqs.get_queue_attributes(
+        QueueUrl=dlq_url, AttributeNames=["ApproximateNumberOfMessagesNotVisible"]
+    )
+    assert attrs["Attributes"]["ApproximateNumberOfMessagesNotVisible"] == "25"
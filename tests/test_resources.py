@@ -0,0 +1,51 @@
+"""Tests for the lazy resource registry and lightweight entrypoint imports."""
+
+import subprocess
+import sys
+
+from people_api.resources import get_resource_timings, lazy_resource
+
+
+def test_lazy_resource_is_built_once_and_timed():
+    """A resource is built on first use only, and its init time is recorded."""
+    calls = []
+
+    @lazy_resource("test_resource")
+    def get_test_resource():
+        calls.append(1)
+        return object()
+
+    assert not calls
+    assert "test_resource" not in get_resource_timings()
+
+    first = get_test_resource()
+    assert get_test_resource() is first
+    assert len(calls) == 1
+    assert get_resource_timings()["test_resource"] >= 0
+
+    get_test_resource.cache_clear()
+    assert get_test_resource() is not first
+    assert len(calls) == 2
+
+
+def test_startup_resources_are_initialized_by_lifespan(test_client):
+    """Starting the app warms up the resources it needs to serve requests."""
+    assert test_client is not None
+    timings = get_resource_timings()
+    for name in ("postgres_engine", "postgres_ro_engine", "internal_token_keys"):
+        assert name in timings
+
+
+def test_cli_entrypoints_do_not_load_the_api():
+    """Importing the CLI and a worker entrypoint does not import the API or its resources."""
+    code = (
+        "import sys\n"
+        "import people_api.entrypoints\n"
+        "import people_api.scripts.redrive_dlq\n"
+        "from people_api.resources import get_resource_timings\n"
+        "assert 'people_api.app' not in sys.modules\n"
+        "assert 'people_api.services.whatsapp_service.chatbot.openai_service' not in sys.modules\n"
+        "assert 'firebase_admin' not in sys.modules\n"
+        "assert get_resource_timings() == {}\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -10,8 +10,10 @@ import pytest
 
 from people_api.database.models.pending_registration import PendingRegistration
 from people_api.database.models.types import CPFNumber, PhoneNumber, ZipNumber
+from people_api.services import sqs_handler
 from people_api.services.sqs_handler import (
     consume_and_store_messages,
+    get_sqs_settings,
 )
 
 os.environ.setdefault("TOPIC_NAME", "member_onboarding")
@@ -558,3 +560,83 @@ async def test_invalid_message_goes_to_dlq(aws_clients, sync_rw_session):
     body = json.loads(dlq_response["Messages"][0]["Body"])
     payload = json.loads(body["Message"])
     assert payload["token"] == "invalid-token"
+
+
+def _adult_payload(index: int) -> str:
+    return json.dumps(
+        {
+            "full_name": f"Membro Teste {index}",
+            "social_name": f"Membro {index}",
+            "email": f"membro.{index}@example.com",
+            "birth_date": "1990-05-20",
+            "cpf": "123.456.789-09",
+            "profession": "Engenheira de Software",
+            "gender": "Feminino",
+            "admission_type": "test",
+            "phone_number": "+55 (11) 987654321",
+            "address": {
+                "street": "Rua das Flores",
+                "neighborhood": "Jardim Primavera",
+                "city": "São Paulo",
+                "state": "SP",
+                "zip_code": "01234-567",
+                "country": "Brasil",
+            },
+            "legal_representatives": [],
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_consume_stores_batches_and_acks_with_delete_batch(
+    set_policy, sync_rw_session, mocker, monkeypatch
+):
+    """Messages are stored concurrently and acked with DeleteMessageBatch, not one by one."""
+    sns, sqs, topic_arn, queue_url = set_policy
+    monkeypatch.setattr(get_sqs_settings(), "wait_time_seconds", 1)
+    mocker.patch("people_api.services.sqs_handler.send_initial_payment_email")
+    delete_batch = mocker.spy(sqs, "delete_message_batch")
+    delete_one = mocker.spy(sqs, "delete_message")
+
+    for i in range(12):
+        sns.publish(TopicArn=topic_arn, Message=_adult_payload(i))
+
+    await consume_and_store_messages(sqs_client=sqs, queue_url=queue_url, max_polls=4, workers=2)
+
+    assert len(sync_rw_session.query(PendingRegistration).all()) == 12
+    assert delete_batch.call_count >= 2
+    assert delete_one.call_count == 0
+    response = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10)
+    assert "Messages" not in response
+
+
+@pytest.mark.asyncio
+async def test_slow_message_visibility_is_extended(
+    set_policy, sync_rw_session, mocker, monkeypatch
+):
+    """A message that takes longer than the visibility timeout is kept invisible until acked."""
+    sns, sqs, topic_arn, queue_url = set_policy
+    settings = get_sqs_settings()
+    monkeypatch.setattr(settings, "wait_time_seconds", 1)
+    monkeypatch.setattr(settings, "visibility_timeout", 1)
+    monkeypatch.setattr(settings, "heartbeat_interval", 0.3)
+    mocker.patch("people_api.services.sqs_handler.send_initial_payment_email")
+    heartbeat = mocker.spy(sqs, "change_message_visibility_batch")
+
+    original_process_message = sqs_handler.process_message
+
+    async def slow_process_message(raw_message):
+        await asyncio.sleep(2)
+        return await original_process_message(raw_message)
+
+    mocker.patch.object(sqs_handler, "process_message", slow_process_message)
+
+    sns.publish(TopicArn=topic_arn, Message=_adult_payload(0))
+    await asyncio.sleep(0.5)
+
+    await consume_and_store_messages(sqs_client=sqs, queue_url=queue_url, max_polls=2, workers=2)
+
+    assert heartbeat.call_count >= 1
+    assert len(sync_rw_session.query(PendingRegistration).all()) == 1
+    response = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10)
+    assert "Messages" not in response
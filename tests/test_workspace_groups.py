@@ -0,0 +1,108 @@
+"""Tests for the workspace groups sync helpers."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from people_api.cronjobs.workspace_groups import update_workspace_groups
+from people_api.cronjobs.workspace_groups.helpers import core
+from people_api.cronjobs.workspace_groups.helpers.core import (
+    GroupDiff,
+    apply_group_diff,
+    diff_group_members,
+)
+
+
+def _member(email: str, role: str = "MEMBER") -> dict:
+    return {"id": email, "email": email, "role": role, "type": "USER", "status": "ACTIVE"}
+
+
+def test_diff_group_members_is_case_insensitive_and_keeps_managers():
+    """Only real changes are returned, ignoring case, duplicates and the managers."""
+    workspace = [
+        _member("stays@mensa.org.br"),
+        _member("Leaves@mensa.org.br"),
+        _member("manager@mensa.org.br", role="MANAGER"),
+    ]
+    db_emails = ["STAYS@mensa.org.br", "new@mensa.org.br", "new@mensa.org.br"]
+
+    diff = diff_group_members(db_emails, workspace, keep=["manager@mensa.org.br"])
+
+    assert diff.to_add == ["new@mensa.org.br"]
+    assert diff.to_remove == ["Leaves@mensa.org.br"]
+
+
+class FakeBatch:
+    """Stand-in for ``BatchHttpRequest`` that answers each request with a canned error."""
+
+    def __init__(self, callback, errors: dict[str, int]):
+        self.callback = callback
+        self.errors = errors
+        self.requests: list[tuple[str, str]] = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, email in self.requests:
+            status = self.errors.get(email)
+            error = HttpError(SimpleNamespace(status=status, reason=""), b"") if status else None
+            self.callback(request_id, None, error)
+
+
+def test_apply_group_diff_batches_changes(monkeypatch):
+    """Changes go out in batches, and already-applied changes do not count as failures."""
+    monkeypatch.setattr(core, "BATCH_SIZE", 2)
+    errors = {"exists@x.com": 409, "gone@x.com": 404, "broken@x.com": 500}
+    batches: list[FakeBatch] = []
+
+    def new_batch_http_request(callback):
+        batches.append(FakeBatch(callback, errors))
+        return batches[-1]
+
+    members = Mock()
+    members.insert.side_effect = lambda groupKey, body: body["email"]
+    members.delete.side_effect = lambda groupKey, memberKey: memberKey
+    service = Mock(members=Mock(return_value=members))
+    service.new_batch_http_request.side_effect = new_batch_http_request
+
+    result = apply_group_diff(
+        service,
+        "group",
+        GroupDiff(
+            to_add=["a@x.com", "exists@x.com", "broken@x.com"],
+            to_remove=["b@x.com", "gone@x.com"],
+        ),
+    )
+
+    assert [len(batch.requests) for batch in batches] == [2, 2, 1]
+    assert (result.added, result.removed, result.failed) == (2, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_load_group_emails_classifies_members_in_one_pass(run_db_query):
+    """Members land in the group matching their payments and age; JBs bring their reps."""
+    # Keep the minors of the dump under 18 whatever the date the suite runs on.
+    run_db_query(
+        "UPDATE registration SET birth_date = current_date - interval '17 years' "
+        "WHERE registration_id IN (7, 8)"
+    )
+    groups = update_workspace_groups.GROUPS
+    emails = await update_workspace_groups.load_group_emails(admin_emails=["calvin@mensa.org.br"])
+
+    active_adults = set(emails[groups[(True, True)]])
+    inactive_adults = set(emails[groups[(False, True)]])
+    active_jb = set(emails[groups[(True, False)]])
+    inactive_jb = set(emails[groups[(False, False)]])
+
+    assert {"fernando.filho@mensa.org.br", "maria.oliveira@mensa.org.br"} <= active_adults
+    assert "carla.ferreira@mensa.org.br" in inactive_adults
+    assert "calvin@mensa.org.br" not in inactive_adults
+    assert {"ana.junior@mensa.org.br", "carlos.silva@example.com", "ana.silva@example.com"} <= (
+        active_jb
+    )
+    assert {"pedro.santos@mensa.org.br", "fernanda.oliveira@example.com"} <= inactive_jb
+    assert "ana.junior@mensa.org.br" not in inactive_jb
+    assert "jessica.santanna@mensa.org.br" not in active_adults | inactive_adults
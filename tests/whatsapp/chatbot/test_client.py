@@ -1,7 +1,19 @@
 """Integration tests for the WhatsApp chatbot message Client."""
 
+import time
 from unittest.mock import AsyncMock, patch
 
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from people_api.database.models.whatsapp import ReceivedWhatsappMessage
+from people_api.dbs import AsyncSessionsTuple
+from people_api.services.whatsapp_service.chatbot.client import WhatsappChatBot
+from people_api.services.whatsapp_service.chatbot.message_queue import (
+    ChatbotMessageQueue,
+)
+from people_api.settings import get_settings
+
 valid_payload = {
     "SmsMessageSid": "SM123",
     "NumMedia": "0",
@@ -44,3 +56,100 @@ def test_chatbot_reset_command_success(test_client, sign_twilio_request):
         mock_send.assert_awaited_once_with(
             to_=reset_payload["From"], message="Thread reset successfully!"
         )
+
+
+def test_chatbot_message_queued_and_answered_by_worker(
+    test_client, sign_twilio_request, monkeypatch
+):
+    """
+    Queued messages get an empty TwiML response right away and are answered by a worker.
+    """
+    monkeypatch.setattr(get_settings(), "chatbot_queue_workers", 4)
+    reset_payload = valid_payload.copy()
+    reset_payload["Body"] = "!reset"
+
+    url = "http://localhost:5000/whatsapp/chatbot-message"
+    headers = sign_twilio_request(url, reset_payload)
+
+    with patch(
+        "people_api.services.whatsapp_service.chatbot.client.TwilioService.send_whatsapp_message",
+        new_callable=AsyncMock,
+    ) as mock_send:
+        test_client.portal.call(ChatbotMessageQueue.start)
+        try:
+            response = test_client.post(
+                "/whatsapp/chatbot-message", data=reset_payload, headers=headers
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/xml")
+            assert response.text == "<Response/>"
+
+            deadline = time.monotonic() + 10
+            while not mock_send.await_count and time.monotonic() < deadline:
+                time.sleep(0.1)
+        finally:
+            test_client.portal.call(ChatbotMessageQueue.stop)
+        mock_send.assert_awaited_once_with(
+            to_=reset_payload["From"], message="Thread reset successfully!"
+        )
+
+
+def test_chatbot_message_answered_inline_when_queue_unavailable(
+    test_client, sign_twilio_request, monkeypatch
+):
+    """
+    Messages are answered in the request when they cannot be queued.
+    """
+    monkeypatch.setattr(get_settings(), "chatbot_queue_workers", 4)
+    reset_payload = valid_payload.copy()
+    reset_payload["Body"] = "!reset"
+
+    url = "http://localhost:5000/whatsapp/chatbot-message"
+    headers = sign_twilio_request(url, reset_payload)
+
+    with (
+        patch(
+            "people_api.endpoints.whatsapp.ChatbotMessageQueue.enqueue",
+            new_callable=AsyncMock,
+            side_effect=RedisConnectionError("Redis is down"),
+        ),
+        patch(
+            "people_api.services.whatsapp_service.chatbot.client.TwilioService.send_whatsapp_message",
+            new_callable=AsyncMock,
+        ) as mock_send,
+    ):
+        response = test_client.post(
+            "/whatsapp/chatbot-message", data=reset_payload, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json() == "Thread reset successfully!"
+        mock_send.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_chatbot_error_notified_when_redis_unavailable():
+    """Members are told about an error when Redis cannot say whether they already were."""
+    client_module = "people_api.services.whatsapp_service.chatbot.client"
+    with (
+        patch(
+            f"{client_module}.ThreadService.get_or_create_thread",
+            new_callable=AsyncMock,
+            side_effect=ValueError("No thread"),
+        ),
+        patch(
+            f"{client_module}.ThreadStore.mark_error_notified",
+            new_callable=AsyncMock,
+            side_effect=RedisConnectionError("Redis is down"),
+        ),
+        patch(
+            f"{client_module}.TwilioService.send_whatsapp_message", new_callable=AsyncMock
+        ) as mock_send,
+    ):
+        response = await WhatsappChatBot.chatbot_message(
+            message=ReceivedWhatsappMessage(**valid_payload),
+            sessions=AsyncSessionsTuple(),
+            registration_id=7,
+        )
+
+    assert response == "No thread"
+    mock_send.assert_awaited_once()
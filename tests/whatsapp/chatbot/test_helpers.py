@@ -4,8 +4,26 @@ from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
 
 import people_api.services.whatsapp_service.chatbot.wpp_client_helpers as helpers
+from people_api.dbs import AsyncSessionsTuple
+from people_api.schemas import UserToken
+
+
+@pytest.fixture
+def sessions():
+    """Read-only and read-write sessions that are never used, as services are mocked."""
+    return AsyncSessionsTuple(ro=MagicMock(name="ro"), rw=MagicMock(name="rw"))
+
+
+@pytest.fixture
+def member_token(monkeypatch):
+    """Make tool helpers act as a member with a Mensa email."""
+    token_data = UserToken(email="joao@mensa.org.br", registration_id=1)
+    monkeypatch.setattr(helpers, "get_member_token", AsyncMock(return_value=token_data))
+    return token_data
 
 
 @pytest.mark.asyncio
@@ -55,374 +73,250 @@ async def test_get_member_info_by_phone_number_not_found(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_create_email_request(monkeypatch):
-    """Test the create_email_request function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "ok"}
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.post = AsyncMock(return_value=mock_response)
+async def test_get_member_token():
+    """Test that get_member_token carries the member's Mensa email."""
+    session = MagicMock()
+    emails = [MagicMock(email_address="joao@gmail.com"), MagicMock(email_address="j@mensa.org.br")]
+    session.exec = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=emails)))
+
+    token_data = await helpers.get_member_token(7, session)
+    assert token_data.registration_id == 7
+    assert token_data.email == "j@mensa.org.br"
 
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.create_email_request(1)
+@pytest.mark.asyncio
+async def test_create_email_request(monkeypatch, sessions):
+    """Test that create_email_request creates the email with the read-write session."""
+    create = AsyncMock(return_value={"message": "ok"})
+    monkeypatch.setattr(helpers.EmailService, "request_email_creation", create)
+
+    result = await helpers.create_email_request(1, sessions)
     assert result == {"message": "ok"}
+    create.assert_awaited_once_with(registration_id=1, session=sessions.rw)
 
 
 @pytest.mark.asyncio
-async def test_recover_email_password_request(monkeypatch):
-    """Test the recover_email_password_request function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "reset"}
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.post = AsyncMock(return_value=mock_response)
+async def test_recover_email_password_request(monkeypatch, sessions, member_token):
+    """Test that recover_email_password_request resets the member's Mensa email."""
+    reset = AsyncMock(return_value={"message": "reset"})
+    monkeypatch.setattr(helpers.EmailService, "request_password_reset", reset)
 
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
-
-    result = await helpers.recover_email_password_request(2)
+    result = await helpers.recover_email_password_request(1, sessions)
     assert result == {"message": "reset"}
+    reset.assert_awaited_once_with(email=member_token.email, registration_id=1, session=sessions.ro)
 
 
 @pytest.mark.asyncio
-async def test_get_member_addresses_request_empty(monkeypatch):
+async def test_get_member_addresses_request_empty(monkeypatch, sessions, member_token):
     """Test the get_member_addresses_request function when no addresses are registered."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.status_code = 200
+    monkeypatch.setattr(helpers.AddressService, "get_addresses", AsyncMock(return_value=[]))
+
+    result = await helpers.get_member_addresses_request(3, sessions)
+    assert result == {"message": "No addresses registered for this member."}
 
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
 
+@pytest.mark.asyncio
+async def test_get_member_addresses_request_without_mensa_email(monkeypatch, sessions):
+    """Test that members without a Mensa email are refused, like by the address endpoint."""
     monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+        helpers,
+        "get_member_token",
+        AsyncMock(return_value=UserToken(email=None, registration_id=3)),
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.get_member_addresses_request(3)
-    assert result == {"message": "No addresses registered for this member."}
+    with pytest.raises(HTTPException) as exc_info:
+        await helpers.get_member_addresses_request(3, sessions)
+    assert exc_info.value.status_code == 401
 
 
 @pytest.mark.asyncio
-async def test_update_address_request(monkeypatch):
+async def test_update_address_request(monkeypatch, sessions, member_token):
     """Test the update_address_request function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "updated"}
-    mock_response.status_code = 200
+    update = AsyncMock(return_value={"message": "Address updated successfully"})
+    monkeypatch.setattr(helpers.AddressService, "update_address", update)
 
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.put = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+    result = await helpers.update_address_request(
+        4, 10, {"state": "RJ", "city": "Rio", "address": "Rua 1", "neighborhood": "X"}, sessions
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
-
-    result = await helpers.update_address_request(4, 10, {"address": "new address"})
-    assert result == {"message": "updated"}
+    assert result == {"message": "Address updated successfully"}
+    assert update.await_args is not None
+    mb, address_id, address, email, session = update.await_args.args
+    assert (mb, address_id, email, session) == (4, 10, member_token.email, sessions.rw)
+    assert address.registration_id == 4
+    assert address.city == "Rio"
 
 
 @pytest.mark.asyncio
-async def test_get_member_legal_reps_empty(monkeypatch):
-    """Test get_member_legal_reps when no legal representatives are registered."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
+async def test_get_member_legal_reps_empty(monkeypatch, sessions, member_token):
+    """Test the get_member_legal_reps function when no legal reps are registered."""
     monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+        helpers.LegalRepresentativeService,
+        "get_legal_representatives",
+        AsyncMock(return_value=[]),
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.get_member_legal_reps(5)
+    result = await helpers.get_member_legal_reps(5, sessions)
     assert result == {"message": "No legal representatives registered for this member."}
 
 
 @pytest.mark.asyncio
-async def test_get_member_legal_reps_found(monkeypatch):
-    """Test get_member_legal_reps when legal representatives are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = [{"id": 1, "name": "Rep"}]
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
+async def test_get_member_legal_reps_found(monkeypatch, sessions, member_token):
+    """Test the get_member_legal_reps function when legal reps are found."""
     monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+        helpers.LegalRepresentativeService,
+        "get_legal_representatives",
+        AsyncMock(return_value=[{"name": "Rep"}]),
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.get_member_legal_reps(6)
-    assert result == [{"id": 1, "name": "Rep"}]
+    result = await helpers.get_member_legal_reps(6, sessions)
+    assert result == [{"name": "Rep"}]
 
 
 @pytest.mark.asyncio
-async def test_add_member_legal_reps(monkeypatch):
-    """Test add_member_legal_reps function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "added"}
-    mock_response.status_code = 201
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.post = AsyncMock(return_value=mock_response)
+async def test_add_member_legal_reps(monkeypatch, sessions, member_token):
+    """Test the add_member_legal_reps function."""
+    add = AsyncMock(return_value={"message": "Legal representative added successfully"})
+    monkeypatch.setattr(helpers.LegalRepresentativeService, "add_legal_representative", add)
+    legal_representative = {
+        "full_name": "Rep",
+        "email": "rep@example.com",
+        "phone": "5521999999999",
+        "alternative_phone": None,
+    }
+
+    result = await helpers.add_member_legal_reps(7, legal_representative, sessions)
+    assert result == {"message": "Legal representative added successfully"}
+    assert add.await_args is not None
+    mb, legal_rep, token_data, session = add.await_args.args
+    assert (mb, token_data, session) == (7, member_token, sessions.rw)
+    assert legal_rep.full_name == "Rep"
 
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.add_member_legal_reps(7, {"name": "Rep"})
-    assert result == {"message": "added"}
+@pytest.mark.asyncio
+async def test_add_member_legal_reps_invalid(monkeypatch, sessions, member_token):
+    """Test that an incomplete legal representative is rejected before reaching the service."""
+    add = AsyncMock()
+    monkeypatch.setattr(helpers.LegalRepresentativeService, "add_legal_representative", add)
 
+    with pytest.raises(ValidationError):
+        await helpers.add_member_legal_reps(7, {"full_name": "Rep"}, sessions)
+    add.assert_not_awaited()
 
-@pytest.mark.asyncio
-async def test_update_member_legal_reps(monkeypatch):
-    """Test update_member_legal_reps function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "updated"}
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.put = AsyncMock(return_value=mock_response)
 
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
+@pytest.mark.asyncio
+async def test_update_member_legal_reps(monkeypatch, sessions, member_token):
+    """Test the update_member_legal_reps function."""
+    update = AsyncMock(return_value={"message": "Legal representative updated successfully"})
+    monkeypatch.setattr(helpers.LegalRepresentativeService, "update_legal_representative", update)
+    legal_representative = {"full_name": "Rep", "phone": "5521999999999", "alternative_phone": None}
 
-    result = await helpers.update_member_legal_reps(8, 2, {"name": "Rep"})
-    assert result == {"message": "updated"}
+    result = await helpers.update_member_legal_reps(8, 2, legal_representative, sessions)
+    assert result == {"message": "Legal representative updated successfully"}
+    assert update.await_args is not None
+    mb, legal_rep_id, _, token_data, session = update.await_args.args
+    assert (mb, legal_rep_id, token_data, session) == (8, 2, member_token, sessions.rw)
 
 
 @pytest.mark.asyncio
-async def test_delete_member_legal_reps(monkeypatch):
-    """Test delete_member_legal_reps function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "deleted"}
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.delete = AsyncMock(return_value=mock_response)
+async def test_delete_member_legal_reps(monkeypatch, sessions, member_token):
+    """Test the delete_member_legal_reps function."""
+    delete = AsyncMock(return_value={"message": "Legal representative deleted successfully"})
+    monkeypatch.setattr(helpers.LegalRepresentativeService, "delete_legal_representative", delete)
 
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
-
-    result = await helpers.delete_member_legal_reps(9, 3)
-    assert result == {"message": "deleted"}
+    result = await helpers.delete_member_legal_reps(9, 3, sessions)
+    assert result == {"message": "Legal representative deleted successfully"}
+    delete.assert_awaited_once_with(9, 3, member_token, sessions.rw)
 
 
 @pytest.mark.asyncio
-async def test_get_all_whatsapp_groups_empty(monkeypatch):
+async def test_get_all_whatsapp_groups_empty(monkeypatch, sessions, member_token):
     """Test get_all_whatsapp_groups when no groups are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
+    monkeypatch.setattr(helpers.GroupService, "get_can_participate", AsyncMock(return_value=[]))
 
-    result = await helpers.get_all_whatsapp_groups(10)
+    result = await helpers.get_all_whatsapp_groups(10, sessions)
     assert result == {"message": "No WhatsApp groups found."}
 
 
 @pytest.mark.asyncio
-async def test_get_all_whatsapp_groups_found(monkeypatch):
+async def test_get_all_whatsapp_groups_found(monkeypatch, sessions, member_token):
     """Test get_all_whatsapp_groups when groups are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = [{"id": "g1", "name": "Group 1"}]
-    mock_response.status_code = 200
+    get_can_participate = AsyncMock(return_value=[{"group_id": "g1"}])
+    monkeypatch.setattr(helpers.GroupService, "get_can_participate", get_can_participate)
 
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
-
-    result = await helpers.get_all_whatsapp_groups(11)
-    assert result == [{"id": "g1", "name": "Group 1"}]
+    result = await helpers.get_all_whatsapp_groups(11, sessions)
+    assert result == [{"group_id": "g1"}]
+    get_can_participate.assert_awaited_once_with(member_token, sessions.ro)
 
 
 @pytest.mark.asyncio
-async def test_request_whatsapp_group_join(monkeypatch):
+async def test_request_whatsapp_group_join(monkeypatch, sessions, member_token):
     """Test request_whatsapp_group_join function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "requested"}
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.post = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
+    request_join = AsyncMock(return_value={"message": "Request to join group sent successfully"})
+    monkeypatch.setattr(helpers.GroupService, "request_join_group", request_join)
 
-    result = await helpers.request_whatsapp_group_join(12, "g2")
-    assert result == {"message": "requested"}
+    result = await helpers.request_whatsapp_group_join(12, "g2", sessions)
+    assert result == {"message": "Request to join group sent successfully"}
+    assert request_join.await_args is not None
+    join_request, token_data, session = request_join.await_args.args
+    assert (join_request.group_id, token_data, session) == ("g2", member_token, sessions.rw)
 
 
 @pytest.mark.asyncio
-async def test_get_pending_whatsapp_group_join_requests_empty(monkeypatch):
-    """Test get_pending_whatsapp_group_join_requests when no requests are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
+async def test_get_pending_whatsapp_group_join_requests_empty(monkeypatch, sessions, member_token):
+    """Test get_pending_whatsapp_group_join_requests when none are found."""
+    monkeypatch.setattr(helpers.GroupService, "get_pending_requests", AsyncMock(return_value=[]))
 
-    result = await helpers.get_pending_whatsapp_group_join_requests(13)
+    result = await helpers.get_pending_whatsapp_group_join_requests(13, sessions)
     assert result == {"message": "No pending WhatsApp group join requests found."}
 
 
 @pytest.mark.asyncio
-async def test_get_pending_whatsapp_group_join_requests_found(monkeypatch):
+async def test_get_pending_whatsapp_group_join_requests_found(monkeypatch, sessions, member_token):
     """Test get_pending_whatsapp_group_join_requests when requests are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = [{"group_id": "g3", "status": "pending"}]
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
     monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+        helpers.GroupService,
+        "get_pending_requests",
+        AsyncMock(return_value=[{"group_id": "g3", "status": "pending"}]),
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.get_pending_whatsapp_group_join_requests(14)
+    result = await helpers.get_pending_whatsapp_group_join_requests(14, sessions)
     assert result == [{"group_id": "g3", "status": "pending"}]
 
 
 @pytest.mark.asyncio
-async def test_get_failed_whatsapp_group_join_requests_empty(monkeypatch):
-    """Test get_failed_whatsapp_group_join_requests when no requests are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
-    )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
+async def test_get_failed_whatsapp_group_join_requests_empty(monkeypatch, sessions, member_token):
+    """Test get_failed_whatsapp_group_join_requests when none are found."""
+    monkeypatch.setattr(helpers.GroupService, "get_failed_requests", AsyncMock(return_value=[]))
 
-    result = await helpers.get_failed_whatsapp_group_join_requests(15)
+    result = await helpers.get_failed_whatsapp_group_join_requests(15, sessions)
     assert result == {"message": "No failed WhatsApp group join requests found."}
 
 
 @pytest.mark.asyncio
-async def test_get_failed_whatsapp_group_join_requests_found(monkeypatch):
+async def test_get_failed_whatsapp_group_join_requests_found(monkeypatch, sessions, member_token):
     """Test get_failed_whatsapp_group_join_requests when requests are found."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = [{"group_id": "g4", "status": "failed"}]
-    mock_response.status_code = 200
-
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-
     monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+        helpers.GroupService,
+        "get_failed_requests",
+        AsyncMock(return_value=[{"group_id": "g4", "status": "failed"}]),
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
 
-    result = await helpers.get_failed_whatsapp_group_join_requests(16)
+    result = await helpers.get_failed_whatsapp_group_join_requests(16, sessions)
     assert result == [{"group_id": "g4", "status": "failed"}]
 
 
 @pytest.mark.asyncio
-async def test_send_feedback_to_api(monkeypatch):
+async def test_send_feedback_to_api(monkeypatch, sessions, member_token):
     """Test send_feedback_to_api function."""
-    monkeypatch.setattr(helpers, "create_token", lambda registration_id: "token")
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"message": "feedback received"}
-    mock_response.status_code = 200
+    process = AsyncMock(return_value={"message": "Feedback submitted successfully"})
+    monkeypatch.setattr(helpers.FeedbackService, "process_feedback", process)
 
-    mock_client = MagicMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock()
-    mock_client.post = AsyncMock(return_value=mock_response)
-
-    monkeypatch.setattr(
-        helpers, "httpx", MagicMock(AsyncClient=MagicMock(return_value=mock_client))
+    result = await helpers.send_feedback_to_api(
+        17, "Great bot, very helpful!", "POSITIVE", sessions, "CHATBOT"
     )
-    monkeypatch.setattr(helpers, "get_settings", lambda: MagicMock(api_port=8000))
-
-    result = await helpers.send_feedback_to_api(17, "Great bot!", "positive", "chatbot")
-    assert result == {"message": "feedback received"}
+    assert result == {"message": "Feedback submitted successfully"}
+    assert process.await_args is not None
+    feedback_data = process.await_args.kwargs["feedback_data"]
+    assert feedback_data.registration_id == 17
+    assert feedback_data.feedback_text == "Great bot, very helpful!"
+    assert process.await_args.kwargs["session"] is sessions.rw
@@ -1,12 +1,93 @@
 """Integration tests for the WhatsApp chatbot message handler endpoint."""
 
+import asyncio
+import itertools
+from collections import Counter
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from people_api.dbs import AsyncSessionsTuple
+from people_api.services.whatsapp_service.chatbot import message_handler
 from people_api.services.whatsapp_service.chatbot.message_handler import MessageHandler
 
 
+class FakeAssistantsAPI:
+    """
+    Local stand-in for the OpenAI Assistants API used by MessageHandler.
+
+    Each run stays in progress for ``run_seconds`` and then completes, adding an assistant
+    message that echoes the last user message. Calls are counted by method.
+    """
+
+    def __init__(self, run_seconds: float):
+        self.run_seconds = run_seconds
+        self.calls: Counter[str] = Counter()
+        self.runs: dict[str, SimpleNamespace] = {}
+        self.messages: list[SimpleNamespace] = []
+        self.max_active_runs = 0
+        self._ids = itertools.count(1)
+        runs = SimpleNamespace(list=self.list_runs, create=self.create_run, retrieve=self.retrieve)
+        messages = SimpleNamespace(create=self.create_message, list=self.list_messages)
+        self.beta = SimpleNamespace(threads=SimpleNamespace(runs=runs, messages=messages))
+
+    def _refresh(self, run: SimpleNamespace) -> SimpleNamespace:
+        if run.status == "in_progress" and asyncio.get_running_loop().time() >= run.ends_at:
+            run.status = "completed"
+            reply = f"Reply to {self.messages[-1].content[0].text.value}"
+            self._add_message("assistant", reply)
+        return run
+
+    def _add_message(self, role: str, text: str) -> None:
+        content = [SimpleNamespace(text=SimpleNamespace(value=text))]
+        self.messages.append(
+            SimpleNamespace(role=role, content=content, created_at=next(self._ids))
+        )
+
+    async def list_runs(self, thread_id):
+        self.calls["runs.list"] += 1
+        return SimpleNamespace(data=[self._refresh(run) for run in self.runs.values()])
+
+    async def create_run(self, thread_id, assistant_id):
+        self.calls["runs.create"] += 1
+        run = SimpleNamespace(
+            id=f"run_{next(self._ids)}",
+            thread_id=thread_id,
+            status="in_progress",
+            required_action=None,
+            ends_at=asyncio.get_running_loop().time() + self.run_seconds,
+        )
+        self.runs[run.id] = run
+        active = [r for r in self.runs.values() if self._refresh(r).status == "in_progress"]
+        self.max_active_runs = max(self.max_active_runs, len(active))
+        return run
+
+    async def retrieve(self, thread_id, run_id):
+        self.calls["runs.retrieve"] += 1
+        return self._refresh(self.runs[run_id])
+
+    async def create_message(self, thread_id, role, content):
+        self.calls["messages.create"] += 1
+        self._add_message(role, content)
+
+    async def list_messages(self, thread_id):
+        self.calls["messages.list"] += 1
+        return SimpleNamespace(data=list(reversed(self.messages)))
+
+
+@pytest.fixture
+def fake_assistants_api(monkeypatch):
+    """Replace the OpenAI client of the message handler with a local stand-in."""
+
+    def install(run_seconds: float) -> FakeAssistantsAPI:
+        api = FakeAssistantsAPI(run_seconds)
+        monkeypatch.setattr(message_handler, "openai_client", api)
+        return api
+
+    return install
+
+
 @pytest.mark.asyncio
 async def test_process_message_success(monkeypatch):
     """Test process_message returns assistant response on success."""
@@ -31,7 +112,7 @@ async def test_process_message_success(monkeypatch):
     run_mock.required_action = None
     run_mock.id = "run_id"
     monkeypatch.setattr(
-        "people_api.services.whatsapp_service.chatbot.message_handler.openai_client.beta.threads.runs.create_and_poll",
+        "people_api.services.whatsapp_service.chatbot.message_handler.openai_client.beta.threads.runs.create",
         AsyncMock(return_value=run_mock),
     )
 
@@ -65,7 +146,9 @@ async def test_process_message_success(monkeypatch):
         AsyncMock(return_value=run_mock),
     )
 
-    response = await MessageHandler.process_message(thread_id, message, registration_id)
+    response = await MessageHandler.process_message(
+        thread_id, message, registration_id, AsyncSessionsTuple()
+    )
     assert response == "Hello, how can I help you?"
 
 
@@ -98,7 +181,7 @@ async def test_process_message_requires_action(monkeypatch):
     run_completed.id = "run_id"
 
     monkeypatch.setattr(
-        "people_api.services.whatsapp_service.chatbot.message_handler.openai_client.beta.threads.runs.create_and_poll",
+        "people_api.services.whatsapp_service.chatbot.message_handler.openai_client.beta.threads.runs.create",
         AsyncMock(return_value=run_requires_action),
     )
 
@@ -132,7 +215,9 @@ async def test_process_message_requires_action(monkeypatch):
         AsyncMock(return_value=messages_response_mock),
     )
 
-    response = await MessageHandler.process_message(thread_id, message, registration_id)
+    response = await MessageHandler.process_message(
+        thread_id, message, registration_id, AsyncSessionsTuple()
+    )
     assert response == "Tool action reply"
 
 
@@ -152,7 +237,7 @@ async def test_process_message_no_assistant_response(monkeypatch):
     run_mock.status = "completed"
     run_mock.required_action = None
     monkeypatch.setattr(
-        "people_api.services.whatsapp_service.chatbot.message_handler.openai_client.beta.threads.runs.create_and_poll",
+        "people_api.services.whatsapp_service.chatbot.message_handler.openai_client.beta.threads.runs.create",
         AsyncMock(return_value=run_mock),
     )
 
@@ -178,7 +263,9 @@ async def test_process_message_no_assistant_response(monkeypatch):
         AsyncMock(return_value=messages_response_mock),
     )
 
-    response = await MessageHandler.process_message(thread_id, message, registration_id)
+    response = await MessageHandler.process_message(
+        thread_id, message, registration_id, AsyncSessionsTuple()
+    )
     assert response == "Erro ao processar mensagem, tente novamente mais tarde..."
 
 
@@ -195,5 +282,31 @@ async def test_process_message_exception(monkeypatch):
         AsyncMock(side_effect=Exception("Some error")),
     )
 
-    response = await MessageHandler.process_message(thread_id, message, registration_id)
+    response = await MessageHandler.process_message(
+        thread_id, message, registration_id, AsyncSessionsTuple()
+    )
     assert response == "Erro ao processar mensagem, tente novamente mais tarde..."
+
+
+@pytest.mark.asyncio
+async def test_process_message_polls_runs_with_backoff(fake_assistants_api):
+    """A run is polled at growing intervals rather than every second."""
+    api = fake_assistants_api(run_seconds=2)
+
+    response = await MessageHandler.process_message("thread_backoff", "hi", 7, AsyncSessionsTuple())
+    assert response == "Reply to hi"
+    assert api.calls["runs.retrieve"] <= 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_to_a_thread_run_one_at_a_time(fake_assistants_api):
+    """Messages to the same thread wait for the worker's lock instead of polling remotely."""
+    api = fake_assistants_api(run_seconds=0.5)
+
+    responses = await asyncio.gather(
+        MessageHandler.process_message("thread_lock", "first", 7, AsyncSessionsTuple()),
+        MessageHandler.process_message("thread_lock", "second", 7, AsyncSessionsTuple()),
+    )
+    assert responses == ["Reply to first", "Reply to second"]
+    assert api.max_active_runs == 1
+    assert api.calls["runs.list"] == 2
@@ -1,12 +1,17 @@
 """Integration tests for the WhatsApp chatbot thread handler."""
 
-from datetime import datetime
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
+import pytest_asyncio
 from fastapi import HTTPException
 
 from people_api.services.whatsapp_service.chatbot.thread_handler import ThreadService
+from people_api.services.whatsapp_service.chatbot.thread_store import (
+    KEY_PREFIX,
+    ThreadStore,
+)
 
 valid_payload = {
     "SmsMessageSid": "SM123",
@@ -28,6 +33,25 @@ valid_payload = {
 }
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def clear_thread_store():
+    """Remove the chatbot state stored in Redis by each test."""
+    yield
+    redis_client = ThreadStore._get_redis()
+    keys = [key async for key in redis_client.scan_iter(f"{KEY_PREFIX}*")]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+async def create_threads(phone_number: str, count: int, messages: int = 0) -> str:
+    """Store ``count`` threads created today for a phone number, the last with ``messages``."""
+    for i in range(count):
+        await ThreadStore.set_thread(phone_number, f"thread_{phone_number}_{i}")
+    for _ in range(messages):
+        await ThreadStore.increment_messages(phone_number, f"thread_{phone_number}_{count - 1}")
+    return f"thread_{phone_number}_{count - 1}"
+
+
 @pytest.mark.asyncio
 async def test_chatbot_create_new_thread_when_no_thread_exists(test_client, sign_twilio_request):
     """
@@ -95,8 +119,7 @@ async def test_chatbot_resume_already_existent_thread(test_client, sign_twilio_r
 
     # Simulate an existing thread and message count
     phone_number = existing_thread_payload["WaId"]
-    ThreadService.threads_by_phone[phone_number] = "existing_thread_id"
-    ThreadService.message_counts[phone_number] = {"existing_thread_id": 1}
+    await create_threads(phone_number, 1, messages=1)
 
     # Prepare Twilio signature headers
     url = "http://localhost:5000/whatsapp/chatbot-message"
@@ -127,9 +150,6 @@ async def test_chatbot_resume_already_existent_thread(test_client, sign_twilio_r
             message="Hello, user! I'm the mensa chatbot. How can I assist you today?",
         )
 
-    ThreadService.threads_by_phone.pop(phone_number, None)
-    ThreadService.message_counts.pop(phone_number, None)
-
 
 @pytest.mark.asyncio
 async def test_check_message_length_raises_on_long_message():
@@ -148,38 +168,35 @@ async def test_check_message_length_allows_short_message():
     ThreadService.check_message_length(short_message)
 
 
-def test_check_thread_creation_limit_raises_when_limit_exceeded():
+@pytest.mark.asyncio
+async def test_check_thread_creation_limit_raises_when_limit_exceeded():
     """Test that check_thread_creation_limit raises ValueError when the limit is exceeded."""
     phone_number = "123"
-    today = datetime.now()
-    ThreadService.thread_timestamps[phone_number] = [today] * 5
+    await create_threads(phone_number, 5)
     with pytest.raises(ValueError) as exc:
-        ThreadService.check_thread_creation_limit(phone_number)
+        await ThreadService.check_thread_creation_limit(phone_number)
     assert "O limite máximo de sessões por dia" in str(exc.value)
-    ThreadService.thread_timestamps.pop(phone_number, None)
 
 
-def test_check_thread_creation_limit_allows_within_limit():
+@pytest.mark.asyncio
+async def test_check_thread_creation_limit_allows_within_limit():
     """Test that check_thread_creation_limit does not raise when within limit."""
     phone_number = "123"
-    today = datetime.now()
-    ThreadService.thread_timestamps[phone_number] = [today] * 4
+    await create_threads(phone_number, 4)
     # Should not raise
-    ThreadService.check_thread_creation_limit(phone_number)
-    ThreadService.thread_timestamps.pop(phone_number, None)
+    await ThreadService.check_thread_creation_limit(phone_number)
 
 
-def test_record_message_increments_count():
+@pytest.mark.asyncio
+async def test_record_message_increments_count():
     """Test that record_message increments the message count for a thread."""
     phone_number = "555"
-    thread_id = "thread1"
+    thread_id = await create_threads(phone_number, 1)
     message = "hello"
-    ThreadService.message_counts.pop(phone_number, None)
-    ThreadService.record_message(phone_number, thread_id, message)
-    assert ThreadService.message_counts[phone_number][thread_id] == 1
-    ThreadService.record_message(phone_number, thread_id, message)
-    assert ThreadService.message_counts[phone_number][thread_id] == 2
-    ThreadService.message_counts.pop(phone_number, None)
+    await ThreadService.record_message(phone_number, thread_id, message)
+    assert await ThreadStore.get_thread(phone_number) == (thread_id, 1)
+    await ThreadService.record_message(phone_number, thread_id, message)
+    assert await ThreadStore.get_thread(phone_number) == (thread_id, 2)
 
 
 @pytest.mark.asyncio
@@ -189,9 +206,6 @@ async def test_get_or_create_thread_creates_new_thread_when_limit_not_reached(
     """Test that get_or_create_thread creates a new thread when the limit is not reached."""
     phone_number = "999"
     session = AsyncMock()
-    ThreadService.threads_by_phone.pop(phone_number, None)
-    ThreadService.message_counts.pop(phone_number, None)
-    ThreadService.thread_timestamps.pop(phone_number, None)
 
     mock_thread = AsyncMock()
     mock_thread.id = "new_thread_id"
@@ -210,13 +224,8 @@ async def test_get_or_create_thread_creates_new_thread_when_limit_not_reached(
 
     thread_id = await ThreadService.get_or_create_thread(phone_number, session)
     assert thread_id == "new_thread_id"
-    assert ThreadService.threads_by_phone[phone_number] == "new_thread_id"
-    assert ThreadService.message_counts[phone_number]["new_thread_id"] == 0
-    assert len(ThreadService.thread_timestamps[phone_number]) == 1
-
-    ThreadService.threads_by_phone.pop(phone_number, None)
-    ThreadService.message_counts.pop(phone_number, None)
-    ThreadService.thread_timestamps.pop(phone_number, None)
+    assert await ThreadStore.get_thread(phone_number) == ("new_thread_id", 0)
+    assert await ThreadStore.threads_created_today(phone_number) == 1
 
 
 @pytest.mark.asyncio
@@ -224,14 +233,10 @@ async def test_get_or_create_thread_returns_existing_if_under_15():
     """Test that get_or_create_thread returns existing thread if under 15 messages."""
     phone_number = "888"
     session = AsyncMock()
-    ThreadService.threads_by_phone[phone_number] = "existing_thread"
-    ThreadService.message_counts[phone_number] = {"existing_thread": 10}
+    existing_thread = await create_threads(phone_number, 1, messages=10)
 
     thread_id = await ThreadService.get_or_create_thread(phone_number, session)
-    assert thread_id == "existing_thread"
-
-    ThreadService.threads_by_phone.pop(phone_number, None)
-    ThreadService.message_counts.pop(phone_number, None)
+    assert thread_id == existing_thread
 
 
 @pytest.mark.asyncio
@@ -239,9 +244,7 @@ async def test_get_or_create_thread_raises_http_exception_on_thread_limit(monkey
     """Test that get_or_create_thread raises HTTPException when the thread limit is reached."""
     phone_number = "777"
     session = AsyncMock()
-    ThreadService.threads_by_phone[phone_number] = "existing_thread"
-    ThreadService.message_counts[phone_number] = {"existing_thread": 15}
-    ThreadService.thread_timestamps[phone_number] = [datetime.now()] * 5
+    await create_threads(phone_number, 5, messages=15)
 
     monkeypatch.setattr(
         "people_api.services.whatsapp_service.chatbot.thread_handler.openai_client.beta.threads.create",
@@ -251,6 +254,28 @@ async def test_get_or_create_thread_raises_http_exception_on_thread_limit(monkey
         await ThreadService.get_or_create_thread(phone_number, session)
     assert exc.value.status_code == 429
 
-    ThreadService.threads_by_phone.pop(phone_number, None)
-    ThreadService.message_counts.pop(phone_number, None)
-    ThreadService.thread_timestamps.pop(phone_number, None)
+
+@pytest.mark.asyncio
+async def test_get_or_create_thread_creates_one_thread_for_concurrent_messages(monkeypatch):
+    """Concurrent first messages of a phone number share the single thread created."""
+    phone_number = "666"
+    create_thread = AsyncMock(side_effect=[AsyncMock(id="thread_a"), AsyncMock(id="thread_b")])
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.thread_handler.openai_client.beta.threads.create",
+        create_thread,
+    )
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.thread_handler.get_member_info_by_phone_number",
+        AsyncMock(return_value=None),
+    )
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.thread_handler.openai_client.beta.threads.messages.create",
+        AsyncMock(),
+    )
+
+    thread_ids = await asyncio.gather(
+        ThreadService.get_or_create_thread(phone_number, AsyncMock()),
+        ThreadService.get_or_create_thread(phone_number, AsyncMock()),
+    )
+    assert thread_ids == ["thread_a", "thread_a"]
+    create_thread.assert_awaited_once()
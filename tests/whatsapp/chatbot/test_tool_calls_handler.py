@@ -1,14 +1,19 @@
 """Tests for the tool_calls_handler module"""
 
+import asyncio
 import json
 from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastapi import HTTPException
 
+from people_api.dbs import AsyncSessionsTuple
 from people_api.services.whatsapp_service.chatbot.tool_calls_handler import (
     FunctionCall,
     ToolCallService,
 )
+from people_api.settings import get_settings
 
 
 @pytest.mark.asyncio
@@ -29,7 +34,7 @@ async def test_handle_create_email(monkeypatch):
 
     registration_id = 99
 
-    async def fake_create_email_request(registration_id: int):
+    async def fake_create_email_request(registration_id: int, sessions: AsyncSessionsTuple):
         return {
             "message": "Mensa email created successfully",
             "user_data": {"email": "x@dominio", "password": "senha123"},
@@ -55,6 +60,7 @@ async def test_handle_create_email(monkeypatch):
     result = await ToolCallService.handle_tool_calls(
         run,  # type: ignore
         registration_id,
+        AsyncSessionsTuple(),
     )
 
     assert result is run
@@ -91,7 +97,9 @@ async def test_handle_recover_email_password(monkeypatch):
 
     registration_id = 123
 
-    async def fake_recover_email_password_request(registration_id: int):
+    async def fake_recover_email_password_request(
+        registration_id: int, sessions: AsyncSessionsTuple
+    ):
         return {
             "message": "Password reset successfully",
             "user_data": {"email": "x@dominio", "password": "nova_senha"},
@@ -117,6 +125,7 @@ async def test_handle_recover_email_password(monkeypatch):
     result = await ToolCallService.handle_tool_calls(
         run,  # type: ignore
         registration_id,
+        AsyncSessionsTuple(),
     )
 
     assert result is run
@@ -153,7 +162,7 @@ async def test_handle_get_member_addresses(monkeypatch):
 
     registration_id = 5
 
-    async def fake_get_member_addresses_request(registration_id: int):
+    async def fake_get_member_addresses_request(registration_id: int, sessions: AsyncSessionsTuple):
         return [
             {
                 "registration_id": 5,
@@ -186,6 +195,7 @@ async def test_handle_get_member_addresses(monkeypatch):
     result = await ToolCallService.handle_tool_calls(
         run,  # type: ignore
         registration_id,
+        AsyncSessionsTuple(),
     )
 
     assert result is run
@@ -242,7 +252,9 @@ async def test_handle_update_address(monkeypatch):
 
     registration_id = 5
 
-    async def fake_update_address_request(registration_id: int, address: dict, address_id: int):
+    async def fake_update_address_request(
+        registration_id: int, address: dict, address_id: int, sessions: AsyncSessionsTuple
+    ):
         return {
             "message": "Address updated successfully",
             "address_id": address_id,
@@ -268,6 +280,7 @@ async def test_handle_update_address(monkeypatch):
     result = await ToolCallService.handle_tool_calls(
         run,  # type: ignore
         registration_id,
+        AsyncSessionsTuple(),
     )
 
     assert result is run
@@ -304,7 +317,7 @@ async def test_handle_get_member_legal_reps(monkeypatch):
 
     registration_id = 7  # Ana Silva Junior (menor de idade)
 
-    async def fake_get_member_legal_reps(registration_id: int):
+    async def fake_get_member_legal_reps(registration_id: int, sessions: AsyncSessionsTuple):
         return [
             {
                 "id": 1,
@@ -333,7 +346,7 @@ async def test_handle_get_member_legal_reps(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t5"
@@ -385,7 +398,9 @@ async def test_handle_add_member_legal_reps(monkeypatch):
 
     registration_id = 7
 
-    async def fake_add_member_legal_reps(registration_id: int, legal_representative: dict):
+    async def fake_add_member_legal_reps(
+        registration_id: int, legal_representative: dict, sessions: AsyncSessionsTuple
+    ):
         return {
             "message": "Legal representative added successfully",
             "registration_id": registration_id,
@@ -408,7 +423,7 @@ async def test_handle_add_member_legal_reps(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t6"
@@ -460,7 +475,10 @@ async def test_handle_update_member_legal_reps(monkeypatch):
     registration_id = 7
 
     async def fake_update_member_legal_reps(
-        registration_id: int, legal_representative_id: int, legal_representative: dict
+        registration_id: int,
+        legal_representative_id: int,
+        legal_representative: dict,
+        sessions: AsyncSessionsTuple,
     ):
         return {
             "message": "Legal representative updated successfully",
@@ -485,7 +503,7 @@ async def test_handle_update_member_legal_reps(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t7"
@@ -525,7 +543,9 @@ async def test_handle_delete_member_legal_reps(monkeypatch):
 
     registration_id = 7
 
-    async def fake_delete_member_legal_reps(registration_id: int, legal_representative_id: int):
+    async def fake_delete_member_legal_reps(
+        registration_id: int, legal_representative_id: int, sessions: AsyncSessionsTuple
+    ):
         return {
             "message": "Legal representative deleted successfully",
             "registration_id": registration_id,
@@ -548,7 +568,7 @@ async def test_handle_delete_member_legal_reps(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t8"
@@ -584,7 +604,7 @@ async def test_handle_get_all_whatsapp_groups(monkeypatch):
     )
     registration_id = 5
 
-    async def fake_get_all_whatsapp_groups(registration_id: int):
+    async def fake_get_all_whatsapp_groups(registration_id: int, sessions: AsyncSessionsTuple):
         return [
             {
                 "group_id": "120363045725875023@g.us",
@@ -616,7 +636,7 @@ async def test_handle_get_all_whatsapp_groups(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t9"
@@ -660,7 +680,9 @@ async def test_handle_request_whatsapp_group_join(monkeypatch):
     )
     registration_id = 11
 
-    async def fake_request_whatsapp_group_join(registration_id: int, group_id: str):
+    async def fake_request_whatsapp_group_join(
+        registration_id: int, group_id: str, sessions: AsyncSessionsTuple
+    ):
         return {
             "message": "Request to join group sent successfully",
             "registration_id": registration_id,
@@ -683,7 +705,7 @@ async def test_handle_request_whatsapp_group_join(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t10"
@@ -718,7 +740,9 @@ async def test_handle_get_pending_whatsapp_group_join_requests(monkeypatch):
     )
     registration_id = 5
 
-    async def fake_get_pending_whatsapp_group_join_requests(registration_id: int):
+    async def fake_get_pending_whatsapp_group_join_requests(
+        registration_id: int, sessions: AsyncSessionsTuple
+    ):
         return [
             {
                 "group_id": "120363150360123420@g.us",
@@ -745,7 +769,7 @@ async def test_handle_get_pending_whatsapp_group_join_requests(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t11"
@@ -784,7 +808,9 @@ async def test_handle_get_failed_whatsapp_group_join_requests(monkeypatch):
     )
     registration_id = 5
 
-    async def fake_get_failed_whatsapp_group_join_requests(registration_id: int):
+    async def fake_get_failed_whatsapp_group_join_requests(
+        registration_id: int, sessions: AsyncSessionsTuple
+    ):
         return [
             {
                 "group_id": "120363150360123420@g.us",
@@ -812,7 +838,7 @@ async def test_handle_get_failed_whatsapp_group_join_requests(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t12"
@@ -859,7 +885,11 @@ async def test_handle_give_zelador_feedback(monkeypatch):
     registration_id = 15
 
     async def fake_send_feedback_to_api(
-        registration_id: int, feedback_text: str, feedback_type: str, feedback_target: str
+        registration_id: int,
+        feedback_text: str,
+        feedback_type: str,
+        feedback_target: str,
+        sessions: AsyncSessionsTuple,
     ):
         return {
             "message": "Feedback sent successfully",
@@ -885,7 +915,7 @@ async def test_handle_give_zelador_feedback(monkeypatch):
         fake_submit,
     )
 
-    result = await ToolCallService.handle_tool_calls(run, registration_id)  # type: ignore
+    result = await ToolCallService.handle_tool_calls(run, registration_id, AsyncSessionsTuple())  # type: ignore
     assert result is run
     thread_id, run_id, tool_outputs = called["args"]
     assert thread_id == "t13"
@@ -901,3 +931,201 @@ async def test_handle_give_zelador_feedback(monkeypatch):
         "feedback_type": "positive",
         "feedback_target": "zelador",
     }
+
+
+@pytest.mark.asyncio
+async def test_handle_tool_call_errors_are_returned_to_the_assistant(monkeypatch):
+    """Test that service errors and unknown functions become outputs instead of failing the run."""
+    tool_calls = [
+        SimpleNamespace(
+            id="14",
+            function=SimpleNamespace(name=FunctionCall.GET_MEMBER_ADDRESSES, arguments="{}"),
+        ),
+        SimpleNamespace(
+            id="15",
+            function=SimpleNamespace(name=FunctionCall.REQUEST_WHATSAPP_GROUP_JOIN, arguments="{}"),
+        ),
+        SimpleNamespace(id="16", function=SimpleNamespace(name="unknown_function", arguments="{}")),
+    ]
+    run = SimpleNamespace(
+        id="r14",
+        thread_id="t14",
+        required_action=SimpleNamespace(submit_tool_outputs=SimpleNamespace(tool_calls=tool_calls)),
+    )
+
+    async def fake_get_member_addresses_request(registration_id: int, sessions: AsyncSessionsTuple):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.tool_calls_handler.get_member_addresses_request",
+        fake_get_member_addresses_request,
+    )
+
+    called = {}
+
+    async def fake_submit(thread_id: str, run_id: str, tool_outputs: list):
+        called["args"] = (thread_id, run_id, tool_outputs)
+        return run
+
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.tool_calls_handler.openai_client.beta.threads.runs.submit_tool_outputs",
+        fake_submit,
+    )
+
+    result = await ToolCallService.handle_tool_calls(run, 5, AsyncSessionsTuple())  # type: ignore
+    assert result is run
+    _, _, tool_outputs = called["args"]
+    assert [to["tool_call_id"] for to in tool_outputs] == ["14", "15", "16"]
+    assert [json.loads(to["output"]) for to in tool_outputs] == [
+        {"detail": "Unauthorized"},
+        {"detail": "Missing argument: group_id"},
+        {"detail": "Unknown function: unknown_function"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_call_tool_records_unknown_functions(monkeypatch):
+    """Test that calls to unknown functions are recorded in the tool call duration."""
+    duration = MagicMock()
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.tool_calls_handler._tool_call_duration",
+        duration,
+    )
+    tool_call = SimpleNamespace(
+        id="16", function=SimpleNamespace(name="unknown_function", arguments="{}")
+    )
+
+    output = await ToolCallService.call_tool(tool_call, 5, AsyncSessionsTuple())  # type: ignore
+
+    assert output == {"detail": "Unknown function: unknown_function"}
+    duration.record.assert_called_once()
+    assert duration.record.call_args.args[1] == {"tool": "unknown_function", "outcome": "unknown"}
+
+
+@pytest.mark.asyncio
+async def test_call_tool_commits_writes(monkeypatch):
+    """Test that the writes of a tool are committed once it succeeds."""
+    tool_call = SimpleNamespace(
+        id="17",
+        function=SimpleNamespace(
+            name=FunctionCall.REQUEST_WHATSAPP_GROUP_JOIN, arguments=json.dumps({"group_id": "g"})
+        ),
+    )
+    rw = MagicMock(info={"wrote": True}, new=[], dirty=[], deleted=[], commit=AsyncMock())
+    sessions = AsyncSessionsTuple(ro=MagicMock(), rw=rw)
+
+    async def fake_request_whatsapp_group_join(
+        registration_id: int, group_id: str, sessions: AsyncSessionsTuple
+    ):
+        return {"message": "Request to join group sent successfully"}
+
+    monkeypatch.setattr(
+        "people_api.services.whatsapp_service.chatbot.tool_calls_handler.request_whatsapp_group_join",
+        fake_request_whatsapp_group_join,
+    )
+
+    output = await ToolCallService.call_tool(tool_call, 5, sessions)  # type: ignore
+    assert output == {"message": "Request to join group sent successfully"}
+    rw.commit.assert_awaited_once()
+
+
+@pytest.fixture
+def tracked_tools(monkeypatch):
+    """Replace three read-only tools and one write with helpers recording when they run."""
+    events: list[tuple[str, str]] = []
+    in_flight = {"now": 0, "max": 0}
+
+    def fake_tool(name: str):
+        async def fake(registration_id: int, sessions: AsyncSessionsTuple, **kwargs):
+            events.append(("start", name))
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+            events.append(("end", name))
+            return {"tool": name}
+
+        return fake
+
+    for name in (
+        "get_member_addresses_request",
+        "get_member_legal_reps",
+        "get_pending_whatsapp_group_join_requests",
+        "request_whatsapp_group_join",
+    ):
+        monkeypatch.setattr(
+            f"people_api.services.whatsapp_service.chatbot.tool_calls_handler.{name}",
+            fake_tool(name),
+        )
+    return events, in_flight
+
+
+def tool_call_named(tool_call_id: str, name: FunctionCall, arguments: dict | None = None):
+    """Return a tool call of the assistant."""
+    return SimpleNamespace(
+        id=tool_call_id,
+        function=SimpleNamespace(name=name, arguments=json.dumps(arguments or {})),
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_tool_calls_reads_concurrently_and_writes_in_order(tracked_tools):
+    """Test that reads run together, while a write waits for the calls before it."""
+    events, in_flight = tracked_tools
+    tool_calls = [
+        tool_call_named("1", FunctionCall.GET_MEMBER_ADDRESSES),
+        tool_call_named("2", FunctionCall.GET_MEMBER_LEGAL_REPS),
+        tool_call_named("3", FunctionCall.REQUEST_WHATSAPP_GROUP_JOIN, {"group_id": "g"}),
+        tool_call_named("4", FunctionCall.GET_PENDING_WHATSAPP_GROUP_JOIN_REQUESTS),
+    ]
+
+    outputs = await ToolCallService.run_tool_calls(
+        tool_calls,  # type: ignore
+        7,
+        AsyncSessionsTuple(),
+    )
+
+    assert outputs == [
+        {"tool": "get_member_addresses_request"},
+        {"tool": "get_member_legal_reps"},
+        {"tool": "request_whatsapp_group_join"},
+        {"tool": "get_pending_whatsapp_group_join_requests"},
+    ]
+    assert in_flight["max"] == 2
+    assert set(events[:2]) == {
+        ("start", "get_member_addresses_request"),
+        ("start", "get_member_legal_reps"),
+    }
+    assert events[4:] == [
+        ("start", "request_whatsapp_group_join"),
+        ("end", "request_whatsapp_group_join"),
+        ("start", "get_pending_whatsapp_group_join_requests"),
+        ("end", "get_pending_whatsapp_group_join_requests"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_tool_calls_concurrency_limit(tracked_tools, monkeypatch):
+    """Test that no more reads than chatbot_tool_call_concurrency run at the same time."""
+    _, in_flight = tracked_tools
+    monkeypatch.setattr(get_settings(), "chatbot_tool_call_concurrency", 2)
+    tool_calls = [
+        tool_call_named(str(i), name)
+        for i, name in enumerate(
+            [
+                FunctionCall.GET_MEMBER_ADDRESSES,
+                FunctionCall.GET_MEMBER_LEGAL_REPS,
+                FunctionCall.GET_PENDING_WHATSAPP_GROUP_JOIN_REQUESTS,
+            ]
+            * 2
+        )
+    ]
+
+    outputs = await ToolCallService.run_tool_calls(
+        tool_calls,  # type: ignore
+        7,
+        AsyncSessionsTuple(),
+    )
+
+    assert len(outputs) == 6
+    assert in_flight["max"] == 2
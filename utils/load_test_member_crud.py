@@ -0,0 +1,149 @@
+"""Load test for the member CRUD endpoints (address, missing fields, member profile).
+
+Fires concurrent authenticated requests at one or more running deployments and prints
+throughput and latency percentiles for each. To compare before and after a change, run
+the old and the new code side by side, each with 4 uvicorn workers, e.g.:
+
+    git worktree add /tmp/before <old-commit>
+    (cd /tmp/before && uv run uvicorn people_api.app:app --workers 4 --port 5001) &
+    uv run uvicorn people_api.app:app --workers 4 --port 5000 &
+    uv run utils/load_test_member_crud.py \\
+        --target before=http://localhost:5001 --target after=http://localhost:5000
+
+Or let the script start a 4-worker server from the current checkout with ``--spawn``.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = ("/address/", "/missing_fields", "/get_member/{mb}")
+
+
+async def worker(
+    client: httpx.AsyncClient, paths: list[str], deadline: float, latencies: list[float]
+) -> int:
+    """Issue requests round-robin over ``paths`` until ``deadline``; return the error count."""
+    errors = 0
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(paths[i % len(paths)])
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors += 1
+        i += 1
+    return errors
+
+
+async def run_target(
+    base_url: str, token: str, mb: int, concurrency: int, duration: float
+) -> tuple[int, int, list[float]]:
+    """Load a single deployment and return (requests, errors, latencies)."""
+    paths = [endpoint.format(mb=mb) for endpoint in ENDPOINTS]
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=30,
+    ) as client:
+        await client.get(paths[0])  # warm up pools and caches
+        deadline = time.perf_counter() + duration
+        errors = await asyncio.gather(
+            *(worker(client, paths, deadline, latencies) for _ in range(concurrency))
+        )
+    return len(latencies), sum(errors), latencies
+
+
+def wait_until_up(base_url: str, timeout: float = 60) -> None:
+    """Wait for a spawned server to accept connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(base_url + "/api/vtW6qodxYLQ/openapi.json", timeout=5)
+            return
+        except httpx.TransportError:
+            time.sleep(0.5)
+    raise TimeoutError(f"{base_url} did not start within {timeout}s")
+
+
+def main() -> None:
+    """Run the load test and print a summary per target."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        help="label=base_url of a running deployment (repeatable)",
+    )
+    parser.add_argument("--spawn", action="store_true", help="start a server from this checkout")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--mb", type=int, default=5, help="registration ID to load")
+    parser.add_argument("--token", help="bearer token; defaults to an internal token for --mb")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    targets = dict(target.split("=", 1) for target in args.target)
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "people_api.app:app",
+                "--workers",
+                str(args.workers),
+                "--port",
+                str(args.port),
+                "--log-level",
+                "warning",
+            ]
+        )
+        targets.setdefault("local", f"http://localhost:{args.port}")
+    if not targets:
+        parser.error("pass at least one --target or --spawn")
+
+    token = args.token
+    if token is None:
+        # pylint: disable-next=import-outside-toplevel
+        from people_api.auth import create_token
+
+        token = create_token(registration_id=args.mb, ttl=int(args.duration) * 10 + 600)
+
+    try:
+        if server is not None:
+            wait_until_up(targets["local"])
+        print(f"{args.concurrency} concurrent clients, {args.duration:.0f}s per target")
+        for label, base_url in targets.items():
+            total, errors, latencies = asyncio.run(
+                run_target(base_url, token, args.mb, args.concurrency, args.duration)
+            )
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{label:>10}: {total / args.duration:8.1f} req/s  "
+                f"p50={quantiles[49] * 1000:.1f}ms  p95={quantiles[94] * 1000:.1f}ms  "
+                f"p99={quantiles[98] * 1000:.1f}ms  errors={errors}/{total}"
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()